@@ -0,0 +1,130 @@
+"""
+탄약 카탈로그
+무기 상세 페이지의 탄약 목록(ammunition)을 구경 -> 탄종 -> 무기로 묶은 중복 없는 색인을 만듭니다.
+크롤링이 끝난 뒤 한 번만 만들어 app/data/ammo_catalog.json으로 저장하고, 구경 기반 호환(compat_index.py)에서도 씁니다.
+
+구경 표기 예:
+    7.62x39mm AP / 9x19mm RIP      (미터법)
+    12 Gauge Slug                  (산탄)
+    .45 ACP FMJ / .338 Lapua Magnum AP
+
+사용법:
+    python ammo_catalog.py
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from catalog_store import APP_WEAPONS_PATH
+from publish_data import publish_json
+
+OUTPUT_PATH = Path("app/data/ammo_catalog.json")
+
+# 탄종 이름 (예: AP, M855A1, RIP, FMJ). 줄을 넘어가면 다른 항목이므로 가로 공백만 허용
+_VARIANT = r"(?:[ \t]+([A-Za-z0-9][\w+-]*))?"
+AMMO_PATTERNS = [
+    # 미터법: 5.56x45mm M855 / 9x19 mm RIP
+    (re.compile(r"(?<![\d.])(\d{1,2}(?:\.\d{1,2})?)\s*[x×]\s*(\d{2,3})\s*(?:mm)?" + _VARIANT, re.I), "{0}x{1}mm"),
+    # 산탄: 12 Gauge Buckshot / 12GA Slug
+    (re.compile(r"(?<![\d.])(\d{1,2})\s*(?:gauge|ga)\b" + _VARIANT, re.I), "{0} Gauge"),
+    # 인치: .45 ACP / .338 Lapua Magnum / .300 Blackout
+    (
+        re.compile(
+            r"(?<![\w.])(\.\d{2,3})\s+(ACP|AE|Lapua Magnum|Norma Magnum|Win(?:chester)? Mag(?:num)?|Magnum|Blackout)"
+            + _VARIANT,
+            re.I,
+        ),
+        "{0} {1}",
+    ),
+]
+
+
+class Ammo(NamedTuple):
+    caliber: str
+    variant: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.caliber} {self.variant}".strip()
+
+
+def find_ammo(text: str) -> list[Ammo]:
+    """문자열 안의 탄약 표기를 모두 찾는다 (여러 구경 패턴, 나온 순서대로, 중복 제외)."""
+    found: dict[Ammo, int] = {}
+    for pattern, caliber_format in AMMO_PATTERNS:
+        for match in pattern.finditer(text):
+            *caliber_parts, variant = match.groups()
+            ammo = Ammo(caliber_format.format(*caliber_parts), variant or "")
+            found.setdefault(ammo, match.start())
+    return sorted(found, key=found.get)
+
+
+def parse_ammo(name: str) -> Ammo | None:
+    """탄약 이름 하나 -> (구경, 탄종). 알 수 없으면 None."""
+    ammo = find_ammo(name)
+    return ammo[0] if ammo else None
+
+
+def build_catalog(weapons: Iterable[dict]) -> dict:
+    """
+    {"calibers": {구경: {"ammo": [탄종...], "weapons": [무기...]}},
+     "ammo": {탄약 이름: {"caliber", "variant", "weapons"}}}
+    """
+    calibers: dict[str, dict[str, dict]] = {}
+    ammo_index: dict[str, dict] = {}
+    for weapon in weapons:
+        for entry in weapon.get("ammunition", []):
+            ammo = parse_ammo(entry)
+            if ammo is None:
+                continue
+            caliber = calibers.setdefault(ammo.caliber, {"ammo": {}, "weapons": {}})
+            caliber["weapons"][weapon["name"]] = None
+            if ammo.variant:
+                caliber["ammo"][ammo.variant] = None
+            record = ammo_index.setdefault(
+                ammo.name, {"caliber": ammo.caliber, "variant": ammo.variant, "weapons": {}}
+            )
+            record["weapons"][weapon["name"]] = None
+
+    # 순서를 유지한 집합(dict) -> 정렬된 목록
+    return {
+        "calibers": {
+            name: {"ammo": sorted(info["ammo"]), "weapons": sorted(info["weapons"])}
+            for name, info in sorted(calibers.items())
+        },
+        "ammo": {
+            name: {**info, "weapons": sorted(info["weapons"])} for name, info in sorted(ammo_index.items())
+        },
+    }
+
+
+def weapon_calibers(catalog: dict) -> dict[str, list[str]]:
+    """무기 이름 -> 구경 목록 (카탈로그 역방향)."""
+    result: dict[str, list[str]] = {}
+    for caliber, info in catalog["calibers"].items():
+        for weapon in info["weapons"]:
+            result.setdefault(weapon, []).append(caliber)
+    return result
+
+
+def write_catalog(weapons: Iterable[dict], path: Path = OUTPUT_PATH) -> dict:
+    catalog = build_catalog(weapons)
+    publish_json(path, catalog)
+    print(f"[INFO] 구경 {len(catalog['calibers'])}개 / 탄약 {len(catalog['ammo'])}개를 {path.resolve()}에 저장했습니다.")
+    return catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description="탄약 카탈로그 생성")
+    parser.add_argument("--weapons", type=Path, default=APP_WEAPONS_PATH)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    write_catalog(json.loads(args.weapons.read_text(encoding="utf-8")), args.output)
+
+
+if __name__ == "__main__":
+    main()
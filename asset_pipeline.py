@@ -0,0 +1,205 @@
+"""
+무기 / 부착물 이미지 에셋 파이프라인
+스크래퍼가 상세 페이지에서 찾은 이미지 주소(image)를 내려받아 사이트에서 쓸 작은 WebP 썸네일로 만듭니다.
+- 여러 이미지를 동시에 내려받되 AIMD 제어기로 속도 조절, 일시적인 오류는 재시도
+- 원본은 내용 해시(sha256) 이름으로 캐시 폴더에 저장하고, 다음 실행에서는 캐시를 쓰거나(--refresh면 ETag로 조건부 요청)
+- 내용이 같은 이미지는 썸네일을 한 번만 만든다
+- 아이템 이름 -> 썸네일 경로 manifest 저장
+- 내려받기에 실패하면 캐시된 원본(없으면 이전 manifest 항목)을 쓰고, 실패가 있었던 실행에서는 썸네일을 정리하지 않는다
+
+사용법:
+    python asset_pipeline.py
+    python asset_pipeline.py --refresh   # 원격 이미지가 바뀌었는지 다시 확인
+"""
+
+import argparse
+import hashlib
+import io
+import json
+from pathlib import Path
+
+from PIL import Image
+
+from catalog_store import APP_ATTACHMENTS_PATH, APP_WEAPONS_PATH
+from http_session import get_session
+from publish_data import publish_json
+from rate_control import AIMDController
+from retry_policy import CircuitBreaker, RetryPolicy
+
+CACHE_DIR = Path(".asset_cache")
+CACHE_INDEX_PATH = CACHE_DIR / "index.json"
+OUTPUT_DIR = Path("public/assets")
+THUMB_DIR = OUTPUT_DIR / "thumbs"
+MANIFEST_PATH = OUTPUT_DIR / "manifest.json"
+# 사이트에서 요청할 때 쓰는 경로 접두사 (public/ 기준)
+URL_PREFIX = "/assets/thumbs"
+
+# 썸네일 한 변 최대 크기(px)
+THUMB_SIZES = (96, 256)
+WEBP_QUALITY = 80
+HASH_LENGTH = 16
+
+# 이미지 서버(정적 CDN)는 페이지보다 조금 빠르게 받아도 된다
+MAX_REQUEST_RATE = 8.0
+MAX_CONCURRENCY = 8
+
+
+class AssetCache:
+    """이미지 URL -> 원본 해시 / ETag. 원본 파일은 해시 이름으로 한 번만 저장."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.dir = cache_dir
+        self.index_path = cache_dir / CACHE_INDEX_PATH.name
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.entries: dict[str, dict] = {}
+        if self.index_path.exists():
+            self.entries = json.loads(self.index_path.read_text(encoding="utf-8"))
+
+    def path_for(self, digest: str) -> Path:
+        return self.dir / digest
+
+    def get(self, url: str) -> dict | None:
+        entry = self.entries.get(url)
+        if entry is not None and self.path_for(entry["sha256"]).exists():
+            return entry
+        return None
+
+    def put(self, url: str, content: bytes, etag: str | None, last_modified: str | None) -> dict:
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.path_for(digest)
+        if not path.exists():
+            path.write_bytes(content)
+        entry = {"sha256": digest, "etag": etag, "last_modified": last_modified}
+        self.entries[url] = entry
+        return entry
+
+    def save(self) -> None:
+        self.index_path.write_text(json.dumps(self.entries, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def download(url: str, cache: AssetCache, refresh: bool = False) -> dict:
+    """캐시에 있으면 그대로, refresh면 조건부 요청(304면 캐시 사용)."""
+    cached = cache.get(url)
+    if cached is not None and not refresh:
+        return cached
+
+    headers = {}
+    if cached is not None:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    response = get_session().get(url, headers=headers, timeout=20)
+    if response.status_code == 304 and cached is not None:
+        return cached
+    response.raise_for_status()
+    return cache.put(url, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+
+def make_thumbnails(source: Path, digest: str, thumb_dir: Path = THUMB_DIR) -> dict:
+    """크기별 WebP 썸네일 생성 (이미 있으면 건너뜀). {크기: 경로}와 원본 크기 반환."""
+    thumb_dir.mkdir(parents=True, exist_ok=True)
+    name = digest[:HASH_LENGTH]
+    with Image.open(io.BytesIO(source.read_bytes())) as image:
+        width, height = image.size
+        # 아이콘 배경 투명도를 유지
+        image = image.convert("RGBA")
+        thumbs = {}
+        for size in THUMB_SIZES:
+            path = thumb_dir / f"{name}-{size}.webp"
+            if not path.exists():
+                thumb = image.copy()
+                thumb.thumbnail((size, size), Image.LANCZOS)
+                thumb.save(path, "WEBP", quality=WEBP_QUALITY, method=6)
+            thumbs[str(size)] = f"{URL_PREFIX}/{path.name}"
+    return {"width": width, "height": height, "thumbs": thumbs}
+
+
+def collect_images(weapons: list[dict], attachments: list[dict]) -> dict[str, dict[str, str]]:
+    """{"weapons": {이름: 이미지 URL}, "attachments": {...}}."""
+    return {
+        "weapons": {w["name"]: w["image"] for w in weapons if w.get("image")},
+        "attachments": {a["name"]: a["image"] for a in attachments if a.get("image")},
+    }
+
+
+def run(refresh: bool = False) -> dict:
+    def read(path: Path) -> list[dict]:
+        return json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+
+    images = collect_images(read(APP_WEAPONS_PATH), read(APP_ATTACHMENTS_PATH))
+    urls = sorted({url for group in images.values() for url in group.values()})
+    print(f"[INFO] 이미지 {len(urls)}개 처리 시작")
+
+    cache = AssetCache()
+    policy = RetryPolicy()
+    breaker = CircuitBreaker()
+    controller = AIMDController(max_rate=MAX_REQUEST_RATE, max_concurrency=MAX_CONCURRENCY)
+    fetch = controller.wrap(download)
+
+    downloaded: dict[str, dict] = {}
+    failures = 0
+    for url, entry, error in controller.map(
+        lambda u: policy.call(lambda: fetch(u, cache, refresh), u, breaker), urls
+    ):
+        if error is not None:
+            failures += 1
+            # CDN 장애 / 차단 중에도 전에 받아 둔 원본으로 계속 진행
+            entry = cache.get(url)
+            if entry is None:
+                print(f"  -> [FAILED] {url}: {error}")
+                continue
+            print(f"  -> [WARN] {url}: {error} (캐시된 원본 사용)")
+        downloaded[url] = entry
+    cache.save()
+
+    # 같은 내용의 이미지는 썸네일을 한 번만 만든다
+    thumbnails: dict[str, dict] = {}
+    for digest in sorted({entry["sha256"] for entry in downloaded.values()}):
+        try:
+            thumbnails[digest] = make_thumbnails(cache.path_for(digest), digest)
+        except OSError as exc:
+            print(f"  -> [WARN] 이미지를 읽을 수 없습니다 ({digest[:HASH_LENGTH]}): {exc}")
+
+    previous = json.loads(MANIFEST_PATH.read_text(encoding="utf-8")) if MANIFEST_PATH.exists() else {}
+    manifest = {"sizes": list(THUMB_SIZES)}
+    for group, items in images.items():
+        manifest[group] = {}
+        for name, url in sorted(items.items()):
+            entry = downloaded.get(url)
+            if entry is not None and entry["sha256"] in thumbnails:
+                manifest[group][name] = {
+                    "source": url, "hash": entry["sha256"][:HASH_LENGTH], **thumbnails[entry["sha256"]]
+                }
+                continue
+            # 이번에 처리하지 못했으면 같은 주소의 이전 항목을 유지
+            old = previous.get(group, {}).get(name)
+            if old is not None and old.get("source") == url:
+                manifest[group][name] = old
+
+    # 지금 아이템 주소 어느 것도 가리키지 않는 썸네일만 정리. 실패가 있었으면 정리하지 않는다
+    if failures:
+        print(f"[WARN] 이미지 {failures}개를 내려받지 못해 썸네일 정리를 건너뜁니다.")
+    else:
+        referenced = {info["hash"] for group in images for info in manifest[group].values()}
+        for path in THUMB_DIR.glob("*.webp"):
+            if path.name.split("-")[0] not in referenced:
+                path.unlink()
+
+    publish_json(MANIFEST_PATH, manifest, minified=True)
+    print(
+        f"[INFO] 이미지 {len(downloaded)}개 (고유 {len(thumbnails)}개) 썸네일을 {THUMB_DIR.resolve()}에 저장했습니다. "
+        f"요청 속도: {controller.snapshot()}"
+    )
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="무기 / 부착물 이미지 썸네일 생성")
+    parser.add_argument("--refresh", action="store_true", help="캐시된 이미지도 ETag로 변경 여부 확인")
+    args = parser.parse_args()
+    run(refresh=args.refresh)
+
+
+if __name__ == "__main__":
+    main()
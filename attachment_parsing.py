@@ -0,0 +1,44 @@
+"""
+부착물 상세 페이지 파싱 도우미
+scrape_data.py(두 스크래퍼)가 함께 쓰는 부착물 종류 / 호환 무기 파싱.
+"""
+
+import re
+from typing import List
+
+from bs4 import BeautifulSoup
+
+# 호환 무기 섹션 제목 (예: "Compatible Weapons", "Suitable for")
+COMPATIBLE_PATTERN = re.compile(r"^\s*(compatible|suitable)\b", re.I)
+
+
+def parse_type_from_lines(lines: List[str]) -> str | None:
+    """'Type' 다음 줄의 부착물 종류 (예: Mag). 없으면 None."""
+    cleaned = [ln.strip() for ln in lines if ln.strip()]
+    for i, line in enumerate(cleaned[:-1]):
+        if line == "Type":
+            return cleaned[i + 1]
+    return None
+
+
+def parse_compatible_weapons(soup: BeautifulSoup) -> List[str]:
+    """호환 무기 섹션 안의 무기 링크 이름 목록. 섹션이 없으면 빈 목록."""
+    heading = soup.find(string=COMPATIBLE_PATTERN)
+    if heading is None:
+        return []
+
+    # 제목에서 위로 올라가며 무기 링크가 들어 있는 가장 가까운 컨테이너를 찾는다
+    container = heading.parent
+    for _ in range(3):
+        if container is None:
+            break
+        anchors = container.find_all("a", href=re.compile(r"/wiki/weapon/"))
+        if anchors:
+            names: List[str] = []
+            for a in anchors:
+                weapon = a.get_text(strip=True)
+                if weapon and weapon not in names:
+                    names.append(weapon)
+            return names
+        container = container.parent
+    return []
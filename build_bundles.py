@@ -0,0 +1,215 @@
+"""
+사이트용 데이터 번들 생성 (스크래핑 후 빌드 단계)
+페이지가 전체 JSON을 import하는 대신 필요한 조각만 불러올 수 있도록
+카테고리별 / 무기별 / 게시글별로 나눈 공백 없는 JSON 조각(shard)과 작은 manifest를 public/data/에 만듭니다.
+- 파일 이름에 내용 해시를 넣어 내용이 같으면 이름도 같다 (CDN / 브라우저에서 오래 캐시 가능)
+- manifest.json에는 조각 이름 -> 경로 / 해시 / 크기 / 레코드 수
+- 바뀐 조각만 다시 쓰고, 이전 manifest에 있었지만 이번에 빠진 조각만 지운다 (출력 폴더의 다른 파일은 건드리지 않는다)
+
+사용법:
+    python build_bundles.py
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from pathlib import Path, PurePosixPath
+
+from catalog_store import APP_ATTACHMENTS_PATH, APP_WEAPONS_PATH
+from publish_data import atomic_write, publish_json
+
+MODS_PATH = Path("app/data/mods.json")
+POSTS_PATH = Path("app/data/posts.json")
+BUILD_STATS_PATH = Path("app/data/build_stats.json")
+BEST_BUILDS_PATH = Path("app/data/best_builds.json")
+COMPAT_INDEX_PATH = Path("app/data/compat_index.json")
+SEARCH_INDEX_PATH = Path("app/data/search_index.json")
+
+OUTPUT_DIR = Path("public/data")
+MANIFEST_NAME = "manifest.json"
+# 사이트에서 요청할 때 쓰는 경로 접두사 (public/ 기준)
+URL_PREFIX = "/data"
+HASH_LENGTH = 12
+
+# 페이지의 카테고리 필터 id와 같은 이름을 쓴다 (app/gunsmith/page.tsx, app/board/page.tsx)
+WEAPON_CATEGORY_SLUGS = {
+    "돌격소총": "assault",
+    "기관단총": "smg",
+    "지정사수소총": "dmr",
+    "저격소총": "sniper",
+    "샷건": "shotgun",
+    # scrape_weapons.py의 번역 (scrape_all_weapons.py는 "샷건")
+    "산탄총": "shotgun",
+    "경기관총": "lmg",
+}
+POST_CATEGORY_SLUGS = {
+    "팁": "tip",
+    "질문": "question",
+    "자유": "free",
+}
+
+
+def slugify(name: str) -> str:
+    """파일 이름용 이름 ("AK-12" -> "ak-12"). 한글은 그대로 둔다."""
+    slug = re.sub(r"[^0-9a-z가-힣]+", "-", name.lower()).strip("-")
+    return slug or hashlib.sha256(name.encode("utf-8")).hexdigest()[:8]
+
+
+def minify(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def read_json(path: Path, default=None):
+    if not path.exists():
+        return default
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def build_shards(
+    weapons: list[dict],
+    attachments: list[dict],
+    mods: list[dict],
+    posts: list[dict],
+    build_stats: dict | None = None,
+    best_builds: dict | None = None,
+    compat: dict | None = None,
+    search_index: dict | None = None,
+) -> dict[str, object]:
+    """조각 이름 -> 데이터."""
+    shards: dict[str, object] = {}
+
+    # 무기: 선택 목록용 가벼운 색인 + 카테고리별 전체 레코드
+    weapon_slugs = {w["name"]: slugify(w["name"]) for w in weapons}
+    shards["weapons/index"] = [
+        {"name": w["name"], "category": w["category"], "slug": weapon_slugs[w["name"]]} for w in weapons
+    ]
+    by_category: dict[str, list[dict]] = {}
+    for weapon in weapons:
+        slug = WEAPON_CATEGORY_SLUGS.get(weapon["category"]) or slugify(weapon["category"] or "unknown")
+        by_category.setdefault(slug, []).append(weapon)
+    for slug, records in by_category.items():
+        shards[f"weapons/category/{slug}"] = records
+
+    # 무기별: 건스미스 상세 화면에 필요한 것만 (무기, 세팅, 호환 부착물, 빌드 스탯)
+    attachments_by_name = {a["name"]: a for a in attachments}
+    compat_names: dict[str, list[str]] = {}
+    if compat is not None:
+        for weapon, ids in zip(compat["weapons"], compat["byWeapon"]):
+            compat_names[weapon] = [compat["attachments"][a] for a in ids]
+    mods_by_weapon: dict[str, list[dict]] = {}
+    for mod in mods:
+        mods_by_weapon.setdefault(mod["weaponName"], []).append(mod)
+
+    for weapon in weapons:
+        name = weapon["name"]
+        shard = {
+            "weapon": weapon,
+            "mods": mods_by_weapon.get(name, []),
+            "attachments": [attachments_by_name[a] for a in compat_names.get(name, []) if a in attachments_by_name],
+        }
+        if build_stats is not None:
+            shard["buildStats"] = build_stats.get("single_attachments", {}).get(name, {})
+        if best_builds is not None:
+            shard["bestBuilds"] = best_builds.get("builds", {}).get(name, {})
+        shards[f"weapons/{weapon_slugs[name]}"] = shard
+
+    # 부착물: 슬롯별
+    if compat is not None:
+        for slot_id, slot in enumerate(compat["slots"]):
+            shards[f"attachments/slot/{slugify(slot)}"] = [
+                attachments_by_name[name]
+                for name, attachment_slot in zip(compat["attachments"], compat["attachmentSlots"])
+                if attachment_slot == slot_id and name in attachments_by_name
+            ]
+    else:
+        shards["attachments/all"] = attachments
+
+    # 세팅: 목록 화면용 전체 (설명 포함, 작다)
+    shards["mods/index"] = mods
+
+    # 게시글: 본문 없는 목록 + 카테고리별 목록 + 글별 본문
+    summaries = [{key: value for key, value in post.items() if key != "content"} for post in posts]
+    shards["posts/index"] = summaries
+    for category, slug in POST_CATEGORY_SLUGS.items():
+        shards[f"posts/category/{slug}"] = [post for post in summaries if post["category"] == category]
+    for post in posts:
+        shards[f"posts/{post['id']}"] = post
+
+    # 검색 색인 (search_index.py): 검색창을 열 때만 불러온다
+    if search_index is not None:
+        shards["search/index"] = search_index
+
+    return shards
+
+
+def write_bundles(shards: dict[str, object], output_dir: Path = OUTPUT_DIR) -> dict:
+    """해시 이름으로 조각을 쓰고 manifest 반환. 내용이 같은 파일은 다시 쓰지 않는다."""
+    previous = read_json(output_dir / MANIFEST_NAME, {}).get("shards", {})
+    manifest = {"shards": {}}
+    written = 0
+    keep = set()
+    for name, data in sorted(shards.items()):
+        body = minify(data)
+        digest = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+        relative = Path(f"{name}.{digest}.json")
+        path = output_dir / relative
+        keep.add(path)
+        if not path.exists():
+            atomic_write(path, body)
+            written += 1
+        manifest["shards"][name] = {
+            "path": f"{URL_PREFIX}/{relative.as_posix()}",
+            "hash": digest,
+            "bytes": len(body),
+            "count": len(data) if isinstance(data, list) else 1,
+        }
+
+    # 새 manifest를 먼저 게시한 뒤, 이전 manifest에만 있던 조각을 정리
+    # 조각이 모두 그대로면 manifest도 그대로 (파일을 건드리지 않는다)
+    publish_json(output_dir / MANIFEST_NAME, manifest, minified=True)
+    removed = 0
+    for entry in previous.values():
+        try:
+            relative = PurePosixPath(entry["path"]).relative_to(URL_PREFIX)
+        except ValueError:
+            continue
+        path = output_dir / relative
+        # manifest가 가리키더라도 출력 폴더 밖의 파일은 지우지 않는다
+        if ".." in relative.parts or path in keep or not path.is_file():
+            continue
+        path.unlink()
+        removed += 1
+        # 비게 된 조각 폴더만 정리 (출력 폴더 자체는 남긴다)
+        for directory in path.parents:
+            if directory == output_dir or any(directory.iterdir()):
+                break
+            directory.rmdir()
+
+    print(f"[INFO] 조각 {len(shards)}개 (새로 씀 {written}개, 삭제 {removed}개)")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사이트용 데이터 번들 생성")
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    shards = build_shards(
+        weapons=read_json(APP_WEAPONS_PATH, []),
+        attachments=read_json(APP_ATTACHMENTS_PATH, []),
+        mods=read_json(MODS_PATH, []),
+        posts=read_json(POSTS_PATH, []),
+        build_stats=read_json(BUILD_STATS_PATH),
+        best_builds=read_json(BEST_BUILDS_PATH),
+        compat=read_json(COMPAT_INDEX_PATH),
+        search_index=read_json(SEARCH_INDEX_PATH),
+    )
+    args.output.mkdir(parents=True, exist_ok=True)
+    manifest = write_bundles(shards, args.output)
+    total = sum(entry["bytes"] for entry in manifest["shards"].values())
+    print(f"[INFO] 총 {total / 1024:.1f}KB를 {args.output.resolve()}에 저장했습니다.")
+
+
+if __name__ == "__main__":
+    main()
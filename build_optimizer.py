@@ -0,0 +1,296 @@
+"""
+최적 빌드 탐색기 (분기 한정 + 지배 관계 가지치기)
+무기 하나와 목표("조작성 >= X 조건에서 제어력 최대")를 주면 슬롯별 부착물 조합을 탐색해 상위 k개 빌드를 찾습니다.
+- 무기별 유효 변화량: 퍼센트 변화는 그 무기의 기본값을 곱해 절대값으로 바꾸므로 슬롯끼리 서로 더하는 문제가 된다
+- 지배 관계: 같은 슬롯에서 목표 / 조건 스탯이 모두 같거나 나쁜 부착물이 k개 이상 있으면 후보에서 제외
+- 한정: 남은 슬롯에서 얻을 수 있는 최대값으로도 현재 k번째 빌드를 넘지 못하거나 조건을 만족할 수 없으면 가지를 자른다
+- 목표 / 조건 스탯의 기본값이 없는 무기는 퍼센트 변화를 계산할 수 없으므로 순위를 매기지 않는다 (unrankable)
+- 슬롯을 알 수 없는 부착물은 각자 다른 슬롯으로 보고 다른 부착물과 함께 장착할 수 있게 한다
+모든 무기 x 기본 목표의 결과를 app/data/best_builds.json으로 저장합니다.
+
+사용법:
+    python build_optimizer.py                                   # 전체 배치
+    python build_optimizer.py --weapon M4A1 --maximize "Recoil Control" --constraint "Handling>=40"
+"""
+
+import argparse
+import heapq
+import re
+import time
+from itertools import count
+from pathlib import Path
+from typing import Iterable, NamedTuple, Sequence
+
+import numpy as np
+
+from build_stats import ATTACHMENT_STATS, OVERRIDE_STATS, STAT_INDEX, UNKNOWN_SLOT, BuildEngine, stats_dict
+from compat_index import CompatIndex
+from publish_data import publish_json
+
+OUTPUT_PATH = Path("app/data/best_builds.json")
+TOP_K = 5
+
+# 배치 작업에서 무기마다 계산할 목표
+PRESETS = [
+    {"id": "max-control", "maximize": "제어력", "constraints": []},
+    {"id": "max-handling", "maximize": "조작성", "constraints": []},
+    {"id": "max-stability", "maximize": "안정성", "constraints": []},
+    {"id": "max-range", "maximize": "사거리", "constraints": []},
+    {"id": "control-keep-handling", "maximize": "제어력", "constraints": ["조작성>=base"]},
+]
+
+CONSTRAINT_PATTERN = re.compile(r"^\s*(.+?)\s*(>=|<=)\s*(base|[+-]?\d+(?:\.\d+)?)\s*$")
+EPSILON = 1e-9
+
+
+class Constraint(NamedTuple):
+    stat: str
+    op: str
+    # None이면 무기 기본값 ("base")
+    value: float | None
+
+
+def stat_key(name: str) -> str:
+    """한국어 스탯 키 또는 부착물 페이지의 영어 이름 -> 한국어 스탯 키."""
+    name = name.strip()
+    if name in STAT_INDEX:
+        return name
+    key = ATTACHMENT_STATS.get(name) or OVERRIDE_STATS.get(name)
+    if key is None:
+        raise ValueError(f"알 수 없는 스탯: {name}")
+    return key
+
+
+def parse_constraint(text: str) -> Constraint:
+    """"Handling>=40", "조작성<=base" 형식."""
+    match = CONSTRAINT_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"조건 형식이 잘못됐습니다: {text} (예: Handling>=40)")
+    stat, op, value = match.groups()
+    return Constraint(stat_key(stat), op, None if value == "base" else float(value))
+
+
+class Option(NamedTuple):
+    gain: float
+    # 조건 스탯 변화량 (모두 ">=" 방향으로 부호를 맞춘 값)
+    margins: tuple[float, ...]
+    attachment: int | None
+
+
+def prune_dominated(options: list[Option], top_k: int) -> list[Option]:
+    """
+    목표와 모든 조건에서 같거나 더 나은 다른 후보가 top_k개 이상이면 제외.
+    그런 후보를 쓰는 빌드는 항상 더 좋은 빌드 top_k개로 바꿀 수 있으므로 상위 k개에 들 수 없다.
+    """
+    kept = []
+    for i, x in enumerate(options):
+        dominators = 0
+        for j, y in enumerate(options):
+            if i == j or y.gain < x.gain or any(ym < xm for ym, xm in zip(y.margins, x.margins)):
+                continue
+            # 완전히 같은 후보끼리는 앞에 있는 것만 지배하는 것으로 본다
+            if y.gain == x.gain and y.margins == x.margins and j > i:
+                continue
+            dominators += 1
+            if dominators >= top_k:
+                break
+        if dominators < top_k:
+            kept.append(x)
+    return kept
+
+
+class BuildOptimizer:
+    """
+    BuildEngine의 스탯 배열 위에서 무기별 상위 k개 빌드 탐색.
+    compat(CompatIndex)을 주면 무기마다 호환 부착물만 후보로 쓴다.
+    """
+
+    def __init__(self, engine: BuildEngine, compat: CompatIndex | None = None):
+        self.engine = engine
+        self.compat = compat
+        self.nodes = 0
+
+    def candidates_for(self, weapon: str) -> list[int] | None:
+        if self.compat is None:
+            return None
+        names = self.compat.for_weapon(weapon)
+        return [self.engine.attachment_ids[name] for name in names if name in self.engine.attachment_ids]
+
+    def missing_stats(self, weapon: str, maximize: str, constraints: Sequence[Constraint] = ()) -> list[str]:
+        """목표 / 조건 스탯 중 이 무기의 기본값이 없는 것 (있으면 순위를 매길 수 없다)."""
+        base = self.engine.base[self.engine.weapon_ids[weapon]]
+        stats = dict.fromkeys([stat_key(maximize), *(c.stat for c in constraints)])
+        return [stat for stat in stats if np.isnan(base[STAT_INDEX[stat]])]
+
+    def effective_deltas(self, weapon_id: int) -> np.ndarray:
+        """(부착물 수 x 스탯 수) 이 무기에 장착했을 때의 절대 변화량. 기본값이 없는 스탯은 NaN."""
+        engine = self.engine
+        base = engine.base[weapon_id]
+        deltas = base * engine.percent / 100.0 + engine.absolute
+        # 덮어쓰는 스탯은 (덮어쓸 값 - 기본값)
+        overridden = ~np.isnan(engine.override)
+        deltas[overridden] = (engine.override - base)[overridden]
+        return deltas
+
+    def slot_options(
+        self,
+        weapon_id: int,
+        maximize: str,
+        constraints: Sequence[Constraint],
+        top_k: int,
+        candidates: Iterable[int] | None = None,
+    ) -> tuple[list[list[Option]], list[float]]:
+        """슬롯별 후보(비어 있는 슬롯 포함)와 ">=" 방향으로 맞춘 조건 기준값. 쓰는 스탯은 기본값이 있어야 한다."""
+        base = self.engine.base[weapon_id]
+        deltas = self.effective_deltas(weapon_id)
+        objective = STAT_INDEX[maximize]
+        columns = [STAT_INDEX[c.stat] for c in constraints]
+        signs = [1.0 if c.op == ">=" else -1.0 for c in constraints]
+        thresholds = [
+            sign * ((base[column] if c.value is None else c.value) - base[column])
+            for c, column, sign in zip(constraints, columns, signs)
+        ]
+
+        ids = range(len(self.engine.attachment_names)) if candidates is None else candidates
+        by_slot: dict[str, list[Option]] = {}
+        for a in ids:
+            margins = tuple(float(sign * deltas[a, column]) for column, sign in zip(columns, signs))
+            slot = self.engine.slots[a]
+            # 슬롯을 모르는 부착물은 하나씩 따로 (한 슬롯으로 묶으면 함께 장착할 수 없게 된다)
+            key = (slot, a) if slot == UNKNOWN_SLOT else (slot, None)
+            by_slot.setdefault(key, []).append(Option(float(deltas[a, objective]), margins, a))
+
+        slots = []
+        for options in by_slot.values():
+            options.append(Option(0.0, (0.0,) * len(columns), None))
+            options = prune_dominated(options, top_k)
+            options.sort(key=lambda option: option.gain, reverse=True)
+            slots.append(options)
+        # 목표값 차이가 큰 슬롯부터 정하면 한정이 빨리 걸린다
+        slots.sort(key=lambda options: options[0].gain - options[-1].gain, reverse=True)
+        return slots, thresholds
+
+    def search(
+        self,
+        weapon: str,
+        maximize: str,
+        constraints: Sequence[Constraint] = (),
+        top_k: int = TOP_K,
+        candidates: Iterable[int] | None = None,
+    ) -> list[dict]:
+        """
+        상위 top_k개 빌드 (목표값 내림차순). 조건을 만족하는 빌드가 없으면 빈 목록.
+        목표 / 조건 스탯의 기본값이 없으면 ValueError (missing_stats로 먼저 확인).
+        """
+        maximize = stat_key(maximize)
+        weapon_id = self.engine.weapon_ids[weapon]
+        missing = self.missing_stats(weapon, maximize, constraints)
+        if missing:
+            raise ValueError(f"{weapon}: 기본값이 없는 스탯은 순위를 매길 수 없습니다: {', '.join(missing)}")
+        if candidates is None:
+            candidates = self.candidates_for(weapon)
+        slots, thresholds = self.slot_options(weapon_id, maximize, constraints, top_k, candidates)
+        n_slots, n_margins = len(slots), len(thresholds)
+
+        # 남은 슬롯에서 얻을 수 있는 최대 목표값 / 조건 여유
+        rest_gain = [0.0] * (n_slots + 1)
+        rest_margin = [(0.0,) * n_margins] * (n_slots + 1)
+        for i in range(n_slots - 1, -1, -1):
+            rest_gain[i] = rest_gain[i + 1] + max(option.gain for option in slots[i])
+            rest_margin[i] = tuple(
+                rest_margin[i + 1][m] + max(option.margins[m] for option in slots[i]) for m in range(n_margins)
+            )
+
+        best: list[tuple[float, int, tuple]] = []
+        tiebreak = count()
+
+        def visit(i: int, gain: float, margins: tuple, chosen: tuple) -> None:
+            self.nodes += 1
+            if any(margins[m] + rest_margin[i][m] < thresholds[m] - EPSILON for m in range(n_margins)):
+                return
+            if len(best) == top_k and gain + rest_gain[i] <= best[0][0] + EPSILON:
+                return
+            if i == n_slots:
+                item = (gain, next(tiebreak), chosen)
+                if len(best) < top_k:
+                    heapq.heappush(best, item)
+                else:
+                    heapq.heapreplace(best, item)
+                return
+            for option in slots[i]:
+                visit(
+                    i + 1,
+                    gain + option.gain,
+                    tuple(a + b for a, b in zip(margins, option.margins)),
+                    chosen if option.attachment is None else chosen + (option.attachment,),
+                )
+
+        visit(0, 0.0, (0.0,) * n_margins, ())
+        ranked = sorted(best, key=lambda item: (-item[0], item[1]))
+        if not ranked:
+            return []
+
+        # 최종 스탯은 BuildEngine으로 한 번에 다시 계산 (덮어쓰기 스탯 포함 정확한 값)
+        finals = self.engine.compute_batch([weapon_id] * len(ranked), [chosen for _, _, chosen in ranked])
+        return [
+            {
+                "attachments": [self.engine.attachment_names[a] for a in chosen],
+                "gain": round(gain, 2),
+                "stats": stats_dict(row),
+            }
+            for (gain, _, chosen), row in zip(ranked, finals)
+        ]
+
+
+def optimize_all(optimizer: BuildOptimizer, presets: Sequence[dict] = PRESETS, top_k: int = TOP_K) -> dict:
+    """모든 무기 x 목표의 상위 빌드. 기본값이 없어 계산할 수 없는 목표는 unrankable에 빠진 스탯과 함께 기록."""
+    output = {"presets": list(presets), "builds": {}, "unrankable": {}}
+    for weapon in optimizer.engine.weapon_names:
+        builds, unrankable = {}, {}
+        for preset in presets:
+            constraints = [parse_constraint(text) for text in preset["constraints"]]
+            missing = optimizer.missing_stats(weapon, preset["maximize"], constraints)
+            if missing:
+                unrankable[preset["id"]] = missing
+            else:
+                builds[preset["id"]] = optimizer.search(weapon, preset["maximize"], constraints, top_k)
+        if builds:
+            output["builds"][weapon] = builds
+        if unrankable:
+            output["unrankable"][weapon] = unrankable
+    if output["unrankable"]:
+        print(f"[WARN] 기본 스탯이 없어 순위를 매기지 못한 무기 {len(output['unrankable'])}개")
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="최적 부착물 조합 탐색")
+    parser.add_argument("--weapon", help="무기 하나만 탐색 (없으면 전체 배치 후 JSON 저장)")
+    parser.add_argument("--maximize", default="제어력", help='최대화할 스탯 (예: "Recoil Control", 제어력)')
+    parser.add_argument("--constraint", action="append", default=[], help='조건 (예: "Handling>=40", "조작성>=base")')
+    parser.add_argument("--top", type=int, default=TOP_K)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    optimizer = BuildOptimizer(BuildEngine.from_files(), CompatIndex.load_or_build())
+    started = time.perf_counter()
+
+    if args.weapon:
+        constraints = [parse_constraint(text) for text in args.constraint]
+        missing = optimizer.missing_stats(args.weapon, args.maximize, constraints)
+        if missing:
+            print(f"[ERROR] {args.weapon}: 기본값이 없는 스탯은 순위를 매길 수 없습니다: {', '.join(missing)}")
+            return
+        for rank, build in enumerate(optimizer.search(args.weapon, args.maximize, constraints, args.top), start=1):
+            print(f"{rank}. (+{build['gain']}) {', '.join(build['attachments']) or '(부착물 없음)'}")
+            print(f"   {build['stats']}")
+    else:
+        result = optimize_all(optimizer, top_k=args.top)
+        publish_json(args.output, result)
+        print(f"[INFO] 무기 {len(result['builds'])}개의 상위 빌드를 {args.output.resolve()}에 저장했습니다.")
+
+    print(f"[INFO] 탐색 노드 {optimizer.nodes}개, {time.perf_counter() - started:.2f}초")
+
+
+if __name__ == "__main__":
+    main()
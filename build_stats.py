@@ -0,0 +1,302 @@
+"""
+총기 빌드 스탯 계산기 (NumPy)
+weapons.json의 무기 기본 스탯과 attachments_data.json의 부착물 스탯 변화("Handling": "-8", "+12%")를
+숫자 배열로 읽어 무기 + 부착물 조합의 최종 스탯을 계산합니다.
+- 빌드는 부착물 인덱스 목록으로 표현하고, 선택한 부착물 행만 모아 빌드별로 더한다 (np.add.reduceat)
+  부착물 하나 장착은 행을 그대로 꺼내 쓰므로 (무기 x 부착물) 쌍이 수십만 개여도 메모리는 쌍 수 x 스탯 수
+- 최종값 = 기본값 * (1 + 퍼센트 변화 합 / 100) + 절대값 변화 합
+- 탄창 용량(Holds)처럼 더하는 값이 아니라 덮어쓰는 스탯은 따로 처리
+빌드 시점에 mods.json의 세팅과 무기별 부착물 하나씩 장착한 결과를 app/data/build_stats.json으로 미리 계산합니다.
+
+사용법:
+    python build_stats.py
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+from itertools import chain
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from catalog_store import APP_ATTACHMENTS_PATH, APP_WEAPONS_PATH
+from publish_data import publish_json
+
+MODS_PATH = Path("app/data/mods.json")
+OUTPUT_PATH = Path("app/data/build_stats.json")
+
+# 계산 대상 무기 스탯 (scrape_weapons.py에서 번역된 키)
+STAT_KEYS = [
+    "데미지",
+    "제어력",
+    "안정성",
+    "사거리",
+    "조작성",
+    "정확도",
+    "방어구 관통력",
+    "탄창 용량",
+    "총구 속도",
+    "발사 속도",
+    "총소리 범위",
+]
+STAT_INDEX = {key: i for i, key in enumerate(STAT_KEYS)}
+
+# 부착물 페이지의 영어 스탯 이름 -> 무기 스탯 키 (변화량을 더하는 스탯)
+ATTACHMENT_STATS = {
+    "Damage": "데미지",
+    "Control": "제어력",
+    "Recoil Control": "제어력",
+    "Stability": "안정성",
+    "Range": "사거리",
+    "Handling": "조작성",
+    "Accuracy": "정확도",
+    "Armor Penetration": "방어구 관통력",
+    "Muzzle Velocity": "총구 속도",
+    "Fire Rate": "발사 속도",
+    "Gunshot Sound": "총소리 범위",
+}
+# 값을 더하지 않고 그대로 덮어쓰는 스탯 (탄창을 바꾸면 장탄수가 그 탄창 값이 된다)
+OVERRIDE_STATS = {
+    "Holds": "탄창 용량",
+}
+
+# 부착물 이름으로 장착 슬롯 추정 (앞쪽 규칙이 우선)
+SLOT_KEYWORDS = [
+    ("magazine", ["mag", "magazine", "belt", "drum"]),
+    ("muzzle", ["suppressor", "silencer", "compensator", "muzzle", "flash hider", "brake"]),
+    ("optic", ["scope", "sight", "optic", "red dot", "holographic", "reflex", "magnifier"]),
+    ("barrel", ["barrel"]),
+    ("handguard", ["handguard", "rail"]),
+    ("foregrip", ["foregrip", "vertical grip", "angled grip"]),
+    ("rear_grip", ["grip"]),
+    ("stock", ["stock", "buttstock"]),
+    ("tactical", ["laser", "flashlight", "light"]),
+]
+
+# 키워드는 단어 단위로 비교한다 ("mag"가 "Magnifier"에, "rail"이 "Trail"에 걸리지 않도록)
+SLOT_PATTERNS = [
+    (slot, re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b", re.I))
+    for slot, keywords in SLOT_KEYWORDS
+]
+
+# 이름으로 슬롯을 알 수 없는 부착물. 서로 다른 슬롯일 수 있으므로 슬롯 중복 검사에서 뺀다
+UNKNOWN_SLOT = "other"
+
+DELTA_PATTERN = re.compile(r"^\s*([+-]?\d+(?:\.\d+)?)\s*(%?)\s*$")
+
+
+def infer_slot(name: str) -> str:
+    """부착물 이름에서 슬롯 추정. 모르면 UNKNOWN_SLOT."""
+    for slot, pattern in SLOT_PATTERNS:
+        if pattern.search(name):
+            return slot
+    return UNKNOWN_SLOT
+
+
+def attachment_slot(record: dict) -> str:
+    """부착물 레코드의 슬롯. 페이지의 Type 값을 먼저 보고, 모르면 이름으로 추정."""
+    slot = infer_slot(record.get("type") or "")
+    return slot if slot != UNKNOWN_SLOT else infer_slot(record["name"])
+
+
+def parse_delta(value) -> tuple[float, bool] | None:
+    """"-8" -> (-8.0, False), "+12%" -> (12.0, True). 숫자가 아니면 None."""
+    if isinstance(value, (int, float)):
+        return float(value), False
+    match = DELTA_PATTERN.match(str(value))
+    if not match:
+        return None
+    return float(match.group(1)), match.group(2) == "%"
+
+
+class BuildEngine:
+    """
+    무기 / 부착물 스탯을 배열로 보관하고 빌드 스탯을 계산.
+
+        engine = BuildEngine.from_files()
+        engine.compute("M14", ["M14 30-Round Mag"])
+    """
+
+    def __init__(self, weapons: Sequence[dict], attachments: Sequence[dict]):
+        self.weapon_names = [w["name"] for w in weapons]
+        self.attachment_names = [a["name"] for a in attachments]
+        self.weapon_ids = {name: i for i, name in enumerate(self.weapon_names)}
+        self.attachment_ids = {name: i for i, name in enumerate(self.attachment_names)}
+        self.slots = np.array([attachment_slot(a) for a in attachments])
+
+        n_stats = len(STAT_KEYS)
+        # 무기 기본 스탯. 값이 없는 스탯은 NaN
+        self.base = np.full((len(weapons), n_stats), np.nan)
+        for i, weapon in enumerate(weapons):
+            for key, attr in weapon.get("attributes", {}).items():
+                value = attr.get("value") if isinstance(attr, dict) else attr
+                if key in STAT_INDEX and isinstance(value, (int, float)):
+                    self.base[i, STAT_INDEX[key]] = value
+
+        # 부착물 변화량: 절대값 / 퍼센트 / 덮어쓰기(NaN이면 없음)
+        self.absolute = np.zeros((len(attachments), n_stats))
+        self.percent = np.zeros((len(attachments), n_stats))
+        self.override = np.full((len(attachments), n_stats), np.nan)
+        for i, attachment in enumerate(attachments):
+            for name, value in attachment.get("stats", {}).items():
+                parsed = parse_delta(value)
+                if parsed is None:
+                    continue
+                amount, is_percent = parsed
+                if name in OVERRIDE_STATS:
+                    self.override[i, STAT_INDEX[OVERRIDE_STATS[name]]] = amount
+                elif name in ATTACHMENT_STATS:
+                    target = self.percent if is_percent else self.absolute
+                    target[i, STAT_INDEX[ATTACHMENT_STATS[name]]] += amount
+        self._override_columns = np.flatnonzero(~np.isnan(self.override).all(axis=0))
+
+    @classmethod
+    def from_files(
+        cls,
+        weapons_path: Path = APP_WEAPONS_PATH,
+        attachments_path: Path = APP_ATTACHMENTS_PATH,
+    ) -> "BuildEngine":
+        weapons = json.loads(Path(weapons_path).read_text(encoding="utf-8"))
+        attachments = json.loads(Path(attachments_path).read_text(encoding="utf-8"))
+        return cls(weapons, attachments)
+
+    # ------------------------------------------------------------------
+    # 입력 변환
+    # ------------------------------------------------------------------
+    def attachment_indices(self, names: Iterable[str]) -> list[int]:
+        """부착물 이름 -> 인덱스. 같은 슬롯에 둘 이상이면 ValueError."""
+        names = list(names)
+        indices = []
+        for name in names:
+            if name not in self.attachment_ids:
+                raise KeyError(f"알 수 없는 부착물: {name}")
+            indices.append(self.attachment_ids[name])
+        slots = [slot for slot in self.slots[indices] if slot != UNKNOWN_SLOT]
+        if len(set(slots)) != len(slots):
+            raise ValueError(f"같은 슬롯에 부착물이 둘 이상입니다: {names}")
+        return indices
+
+    def build_indices(self, builds: Sequence[Iterable[str]]) -> list[list[int]]:
+        """부착물 이름 목록들 -> 빌드별 부착물 인덱스 목록."""
+        return [self.attachment_indices(names) for names in builds]
+
+    # ------------------------------------------------------------------
+    # 계산
+    # ------------------------------------------------------------------
+    def compute_batch(self, weapon_ids: Sequence[int], builds: Sequence[Sequence[int]]) -> np.ndarray:
+        """
+        weapon_ids: (B,) 무기 인덱스, builds: 빌드별 부착물 인덱스 목록 (B개).
+        (B x 스탯 수) 최종 스탯 반환. 기본값이 없는 스탯은 NaN.
+        """
+        base = self.base[np.asarray(weapon_ids, dtype=int)]
+        lengths = np.fromiter((len(build) for build in builds), dtype=int, count=len(builds))
+        flat = np.fromiter(chain.from_iterable(builds), dtype=int, count=int(lengths.sum()))
+        percent = np.zeros_like(base)
+        absolute = np.zeros_like(base)
+        replaced = np.full_like(base, np.nan)
+        if flat.size:
+            # 부착물이 있는 빌드만 reduceat (빈 빌드는 시작 위치가 겹쳐 잘못 더해진다)
+            filled = lengths > 0
+            starts = (np.cumsum(lengths) - lengths)[filled]
+            percent[filled] = np.add.reduceat(self.percent[flat], starts, axis=0)
+            absolute[filled] = np.add.reduceat(self.absolute[flat], starts, axis=0)
+            if self._override_columns.size:
+                # 선택한 부착물 중 덮어쓰기 값이 있으면 그 값 (fmax는 NaN을 건너뛴다)
+                replaced[filled] = np.fmax.reduceat(self.override[flat], starts, axis=0)
+        final = base * (1.0 + percent / 100.0) + absolute
+        return np.where(np.isnan(replaced), final, replaced)
+
+    def compute_single(self, weapon_ids: Sequence[int], attachment_ids: Sequence[int]) -> np.ndarray:
+        """(무기, 부착물 하나) 쌍별 최종 스탯. 부착물 행을 그대로 꺼내 쓴다."""
+        weapon_ids = np.asarray(weapon_ids, dtype=int)
+        attachment_ids = np.asarray(attachment_ids, dtype=int)
+        final = self.base[weapon_ids] * (1.0 + self.percent[attachment_ids] / 100.0) + self.absolute[attachment_ids]
+        override = self.override[attachment_ids]
+        return np.where(np.isnan(override), final, override)
+
+    def compute(self, weapon: str, attachments: Iterable[str] = ()) -> dict[str, float | None]:
+        """무기 하나 + 부착물 조합 하나의 최종 스탯."""
+        builds = self.build_indices([list(attachments)])
+        return stats_dict(self.compute_batch([self.weapon_ids[weapon]], builds)[0])
+
+
+def stats_dict(row: np.ndarray) -> dict[str, float | None]:
+    return {key: None if np.isnan(value) else round(float(value), 2) for key, value in zip(STAT_KEYS, row)}
+
+
+def changed_stats(row: np.ndarray, base: np.ndarray) -> dict[str, float]:
+    """기본값과 달라진 스탯만."""
+    changed = ~np.isnan(row) & ~np.isclose(row, base, equal_nan=True)
+    return {STAT_KEYS[i]: round(float(row[i]), 2) for i in np.flatnonzero(changed)}
+
+
+def precompute(engine: BuildEngine, mods: Sequence[dict], compat=None) -> dict:
+    """
+    mods.json 세팅별 스탯과 무기별 부착물 하나 장착 결과를 한 번에 계산.
+    compat(CompatIndex)을 주면 무기에 맞는 부착물만 계산한다.
+    """
+    output = {"stats": STAT_KEYS, "mods": {}, "single_attachments": {}}
+
+    # 세팅(mods.json): 무기가 데이터에 있는 것만
+    mod_rows, mod_weapons, mod_builds = [], [], []
+    for mod in mods:
+        weapon_id = engine.weapon_ids.get(mod["weaponName"])
+        if weapon_id is None:
+            print(f"[WARN] {mod['id']}: 무기 데이터 없음 ({mod['weaponName']})")
+            continue
+        names = [name for name in mod.get("attachments", []) if name in engine.attachment_ids]
+        if len(names) != len(mod.get("attachments", [])):
+            print(f"[WARN] {mod['id']}: 알 수 없는 부착물은 제외하고 계산합니다.")
+        mod_rows.append(mod)
+        mod_weapons.append(weapon_id)
+        mod_builds.append(names)
+    if mod_rows:
+        final = engine.compute_batch(mod_weapons, engine.build_indices(mod_builds))
+        for mod, weapon_id, names, row in zip(mod_rows, mod_weapons, mod_builds, final):
+            output["mods"][mod["id"]] = {
+                "weapon": mod["weaponName"],
+                "attachments": names,
+                "base": stats_dict(engine.base[weapon_id]),
+                "final": stats_dict(row),
+            }
+
+    # 무기 x 부착물 하나: 모든 (무기, 부착물) 쌍을 한 번의 배치로
+    pairs = []
+    for w, weapon in enumerate(engine.weapon_names):
+        output["single_attachments"][weapon] = {}
+        if compat is None:
+            ids = range(len(engine.attachment_names))
+        else:
+            ids = [engine.attachment_ids[name] for name in compat.for_weapon(weapon) if name in engine.attachment_ids]
+        pairs.extend((w, a) for a in ids)
+    if pairs:
+        weapon_ids, attachment_ids = np.array(pairs).T
+        final = engine.compute_single(weapon_ids, attachment_ids)
+        for (w, a), row in zip(pairs, final):
+            weapon, attachment = engine.weapon_names[w], engine.attachment_names[a]
+            output["single_attachments"][weapon][attachment] = changed_stats(row, engine.base[w])
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="총기 빌드 스탯 사전 계산")
+    parser.add_argument("--mods", type=Path, default=MODS_PATH)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    from compat_index import CompatIndex
+
+    engine = BuildEngine.from_files()
+    mods = json.loads(args.mods.read_text(encoding="utf-8"))
+    result = precompute(engine, mods, CompatIndex.load_or_build())
+    publish_json(args.output, result)
+    print(
+        f"[INFO] 세팅 {len(result['mods'])}개, 무기 {len(result['single_attachments'])}개의 "
+        f"빌드 스탯을 {args.output.resolve()}에 저장했습니다."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+"""
+SQLite 카탈로그 저장소
+스크래핑한 무기 / 부착물 / 스탯 / 탄약을 로컬 SQLite(catalog.db)에 저장합니다.
+- name / category / url 인덱스로 조회
+- 배치 단위 트랜잭션으로 upsert (파일 전체를 다시 쓰지 않음)
+- export 명령으로 Next.js 페이지가 import하는 JSON 파일 생성
+
+사용법:
+    python catalog_store.py import   # 기존 JSON 파일을 DB로 가져오기
+    python catalog_store.py export   # DB에서 JSON 파일 생성
+"""
+
+import argparse
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+from publish_data import publish_json
+
+DB_PATH = Path("catalog.db")
+
+# export 대상 파일
+APP_WEAPONS_PATH = Path("app/data/weapons.json")
+APP_ATTACHMENTS_PATH = Path("app/attachments_data.json")
+WEAPONS_LIST_PATH = Path("weapons_list.json")
+
+# 한 트랜잭션에 넣을 레코드 수
+BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS weapons (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    list_name TEXT,
+    category TEXT,
+    image TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_weapons_name ON weapons(name);
+CREATE INDEX IF NOT EXISTS idx_weapons_category ON weapons(category);
+
+CREATE TABLE IF NOT EXISTS weapon_stats (
+    weapon_id INTEGER NOT NULL REFERENCES weapons(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value_num REAL,
+    value_text TEXT,
+    unit TEXT NOT NULL DEFAULT '',
+    raw TEXT NOT NULL DEFAULT '',
+    position INTEGER NOT NULL,
+    PRIMARY KEY (weapon_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS weapon_ammo (
+    weapon_id INTEGER NOT NULL REFERENCES weapons(id) ON DELETE CASCADE,
+    ammo TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (weapon_id, ammo)
+);
+CREATE INDEX IF NOT EXISTS idx_weapon_ammo_ammo ON weapon_ammo(ammo);
+
+CREATE TABLE IF NOT EXISTS attachments (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    category TEXT,
+    type TEXT,
+    image TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_attachments_name ON attachments(name);
+CREATE INDEX IF NOT EXISTS idx_attachments_category ON attachments(category);
+
+CREATE TABLE IF NOT EXISTS attachment_stats (
+    attachment_id INTEGER NOT NULL REFERENCES attachments(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (attachment_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS attachment_compat (
+    attachment_id INTEGER NOT NULL REFERENCES attachments(id) ON DELETE CASCADE,
+    weapon_name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (attachment_id, weapon_name)
+);
+CREATE INDEX IF NOT EXISTS idx_attachment_compat_weapon ON attachment_compat(weapon_name);
+"""
+
+# 이전 스키마로 만든 DB에 추가할 컬럼 (테이블, 컬럼, 정의)
+MIGRATIONS = [
+    ("attachments", "type", "TEXT"),
+    ("weapons", "image", "TEXT"),
+    ("attachments", "image", "TEXT"),
+    ("weapons", "list_name", "TEXT"),
+]
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def batched(records: Iterable[dict], size: int) -> Iterable[list[dict]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class CatalogStore:
+    """무기 / 부착물 카탈로그 SQLite 저장소."""
+
+    def __init__(self, path: Path = DB_PATH):
+        self.path = Path(path)
+        # 여러 프로세스가 같은 DB를 쓸 수 있도록 WAL + busy timeout
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+
+    def _migrate(self) -> None:
+        """기존 DB에 없는 컬럼 추가 (CREATE TABLE IF NOT EXISTS는 컬럼을 늘리지 않는다)."""
+        for table, column, definition in MIGRATIONS:
+            columns = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            if columns and column not in columns:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def _upsert_row(self, table: str, record: dict, category: str | None, name_column: str = "name") -> int:
+        """
+        name_column: 이미 있는 행에서 이 레코드의 이름으로 바꿀 컬럼.
+        목록 스크래퍼의 이름("M249 45668")은 list_name에만 써서 상세 페이지 이름("M249")을 덮지 않는다.
+        새 행이면 name에도 같은 값을 넣는다.
+        """
+        update_name = "name = excluded.name," if name_column == "name" else ""
+        self.conn.execute(
+            f"""
+            INSERT INTO {table} (url, name, category, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                {update_name}
+                category = COALESCE(excluded.category, {table}.category),
+                updated_at = excluded.updated_at
+            """,
+            (record["url"], record["name"], record.get("category", category), now_iso()),
+        )
+        row_id = self.conn.execute(f"SELECT id FROM {table} WHERE url = ?", (record["url"],)).fetchone()[0]
+        if name_column != "name":
+            self.conn.execute(f"UPDATE {table} SET {name_column} = ? WHERE id = ?", (record["name"], row_id))
+        if record.get("image"):
+            self.conn.execute(f"UPDATE {table} SET image = ? WHERE id = ?", (record["image"], row_id))
+        return row_id
+
+    def upsert_weapons(self, records: Iterable[dict], batch_size: int = BATCH_SIZE) -> int:
+        """
+        무기 레코드 upsert. attributes / ammunition이 있는 레코드만 스탯과 탄약을 교체하므로
+        목록 스크래퍼(weapons_list.json)의 이름 / 카테고리만으로 기존 스탯이 지워지지 않는다.
+        attributes가 없는 목록 레코드의 이름은 list_name에 따로 저장한다.
+        """
+        count = 0
+        for batch in batched(records, batch_size):
+            with self.conn:
+                for record in batch:
+                    name_column = "name" if "attributes" in record else "list_name"
+                    weapon_id = self._upsert_row("weapons", record, None, name_column)
+                    if "attributes" in record:
+                        self.conn.execute("DELETE FROM weapon_stats WHERE weapon_id = ?", (weapon_id,))
+                        self.conn.executemany(
+                            """
+                            INSERT INTO weapon_stats (weapon_id, name, value_num, value_text, unit, raw, position)
+                            VALUES (?, ?, ?, ?, ?, ?, ?)
+                            """,
+                            [
+                                (
+                                    weapon_id,
+                                    name,
+                                    attr["value"] if isinstance(attr["value"], (int, float)) else None,
+                                    None if isinstance(attr["value"], (int, float)) else str(attr["value"]),
+                                    attr.get("unit", ""),
+                                    attr.get("raw", ""),
+                                    position,
+                                )
+                                for position, (name, attr) in enumerate(record["attributes"].items())
+                            ],
+                        )
+                    if "ammunition" in record:
+                        self.conn.execute("DELETE FROM weapon_ammo WHERE weapon_id = ?", (weapon_id,))
+                        self.conn.executemany(
+                            "INSERT OR IGNORE INTO weapon_ammo (weapon_id, ammo, position) VALUES (?, ?, ?)",
+                            [(weapon_id, ammo, position) for position, ammo in enumerate(record["ammunition"])],
+                        )
+                    count += 1
+        return count
+
+    def upsert_attachments(
+        self,
+        records: Iterable[dict],
+        category: str | None = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> int:
+        """
+        부착물 레코드 upsert. category는 레코드에 값이 없을 때 사용 (예: 목록 페이지 'mag').
+        type / compatible은 레코드에 있을 때만 갱신한다.
+        """
+        count = 0
+        for batch in batched(records, batch_size):
+            with self.conn:
+                for record in batch:
+                    attachment_id = self._upsert_row("attachments", record, category)
+                    self.conn.execute("DELETE FROM attachment_stats WHERE attachment_id = ?", (attachment_id,))
+                    self.conn.executemany(
+                        "INSERT INTO attachment_stats (attachment_id, name, value, position) VALUES (?, ?, ?, ?)",
+                        [
+                            (attachment_id, name, str(value), position)
+                            for position, (name, value) in enumerate(record.get("stats", {}).items())
+                        ],
+                    )
+                    if record.get("type") is not None:
+                        self.conn.execute("UPDATE attachments SET type = ? WHERE id = ?", (record["type"], attachment_id))
+                    if "compatible" in record:
+                        self.conn.execute("DELETE FROM attachment_compat WHERE attachment_id = ?", (attachment_id,))
+                        self.conn.executemany(
+                            "INSERT OR IGNORE INTO attachment_compat (attachment_id, weapon_name, position) VALUES (?, ?, ?)",
+                            [(attachment_id, weapon, position) for position, weapon in enumerate(record["compatible"])],
+                        )
+                    count += 1
+        return count
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def _weapon_records(self, where: str = "", params: tuple = ()) -> list[dict]:
+        rows = self.conn.execute(
+            f"SELECT id, name, category, url, image FROM weapons {where} ORDER BY category, name", params
+        ).fetchall()
+        if not rows:
+            return []
+        ids = [row["id"] for row in rows]
+        placeholders = ",".join("?" * len(ids))
+
+        stats: dict[int, dict] = {weapon_id: {} for weapon_id in ids}
+        for row in self.conn.execute(
+            f"SELECT * FROM weapon_stats WHERE weapon_id IN ({placeholders}) ORDER BY weapon_id, position", ids
+        ):
+            value = row["value_num"] if row["value_num"] is not None else row["value_text"]
+            stats[row["weapon_id"]][row["name"]] = {"value": value, "unit": row["unit"], "raw": row["raw"]}
+
+        ammo: dict[int, list[str]] = {weapon_id: [] for weapon_id in ids}
+        for row in self.conn.execute(
+            f"SELECT weapon_id, ammo FROM weapon_ammo WHERE weapon_id IN ({placeholders}) ORDER BY weapon_id, position",
+            ids,
+        ):
+            ammo[row["weapon_id"]].append(row["ammo"])
+
+        records = []
+        for row in rows:
+            record = {
+                "name": row["name"],
+                "category": row["category"],
+                "url": row["url"],
+                "attributes": stats[row["id"]],
+                "ammunition": ammo[row["id"]],
+            }
+            if row["image"] is not None:
+                record["image"] = row["image"]
+            records.append(record)
+        return records
+
+    def weapons(self, name: str | None = None, category: str | None = None) -> list[dict]:
+        """무기 조회 (이름 / 카테고리 필터는 인덱스 사용)."""
+        clauses, params = [], []
+        if name is not None:
+            clauses.append("name = ?")
+            params.append(name)
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._weapon_records(where, tuple(params))
+
+    def weapon_list(self) -> list[dict]:
+        """목록 스크래퍼 형식 (weapons_list.json): 목록에서 본 이름이 있으면 그 이름으로."""
+        rows = self.conn.execute(
+            "SELECT COALESCE(list_name, name) AS name, category, url FROM weapons"
+        ).fetchall()
+        records = [{"name": row["name"], "category": row["category"], "url": row["url"]} for row in rows]
+        return sorted(records, key=lambda r: (r["category"] or "", r["name"]))
+
+    def weapon_by_url(self, url: str) -> dict | None:
+        records = self._weapon_records("WHERE url = ?", (url,))
+        return records[0] if records else None
+
+    def attachments(
+        self, name: str | None = None, category: str | None = None, url: str | None = None
+    ) -> list[dict]:
+        """부착물 조회 (이름 / 카테고리 / URL 필터는 인덱스 사용)."""
+        clauses, params = [], []
+        if url is not None:
+            clauses.append("a.url = ?")
+            params.append(url)
+        if name is not None:
+            clauses.append("a.name = ?")
+            params.append(name)
+        if category is not None:
+            clauses.append("a.category = ?")
+            params.append(category)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            f"""
+            SELECT a.id, a.name, a.url, a.type, a.image, s.name AS stat, s.value
+            FROM attachments a LEFT JOIN attachment_stats s ON s.attachment_id = a.id
+            {where}
+            ORDER BY a.id, s.position
+            """,
+            params,
+        )
+        records: dict[int, dict] = {}
+        for row in rows:
+            record = records.get(row["id"])
+            if record is None:
+                record = records[row["id"]] = {"name": row["name"], "url": row["url"], "stats": {}}
+                if row["type"] is not None:
+                    record["type"] = row["type"]
+                if row["image"] is not None:
+                    record["image"] = row["image"]
+            if row["stat"] is not None:
+                record["stats"][row["stat"]] = row["value"]
+        if not records:
+            return []
+
+        ids = list(records)
+        placeholders = ",".join("?" * len(ids))
+        for row in self.conn.execute(
+            f"""
+            SELECT attachment_id, weapon_name FROM attachment_compat
+            WHERE attachment_id IN ({placeholders}) ORDER BY attachment_id, position
+            """,
+            ids,
+        ):
+            records[row["attachment_id"]].setdefault("compatible", []).append(row["weapon_name"])
+        return list(records.values())
+
+    def attachment_by_url(self, url: str) -> dict | None:
+        records = self.attachments(url=url)
+        return records[0] if records else None
+
+    # ------------------------------------------------------------------
+    # JSON 가져오기 / 내보내기
+    # ------------------------------------------------------------------
+    def import_json(self) -> None:
+        """기존 JSON 파일을 DB로 가져오기 (목록 -> 상세 순서로 넣어 상세 스탯이 남도록)."""
+        for path, upsert in (
+            (WEAPONS_LIST_PATH, self.upsert_weapons),
+            (APP_WEAPONS_PATH, self.upsert_weapons),
+            (APP_ATTACHMENTS_PATH, self.upsert_attachments),
+        ):
+            if path.exists():
+                count = upsert(json.loads(path.read_text(encoding="utf-8")))
+                print(f"[INFO] {path}: {count}개 가져옴")
+
+    def export_json(self) -> None:
+        """Next.js 페이지와 스크립트가 읽는 JSON 파일 생성."""
+        weapons = self.weapons()
+        outputs = {
+            APP_WEAPONS_PATH: weapons,
+            WEAPONS_LIST_PATH: self.weapon_list(),
+            APP_ATTACHMENTS_PATH: self.attachments(),
+        }
+        # 바뀐 파일만 다시 쓴다 (Next.js 재빌드 최소화)
+        for path, data in outputs.items():
+            publish_json(path, data)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카탈로그 SQLite 저장소")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="SQLite 파일 경로")
+    args = parser.parse_args()
+
+    with CatalogStore(args.db) as store:
+        if args.command == "import":
+            store.import_json()
+        else:
+            store.export_json()
+
+
+if __name__ == "__main__":
+    main()
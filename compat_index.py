@@ -0,0 +1,246 @@
+"""
+무기 - 부착물 호환 인덱스
+부착물 레코드에는 어떤 무기에 맞는지가 없으므로 아래 순서로 무기별 호환 부착물 목록(역색인)을 만듭니다.
+1. 상세 페이지의 호환 무기 섹션에서 스크래핑한 목록 (compatible)
+2. 부착물 이름에 들어 있는 무기 이름 ("M14 30-Round Mag" -> M14)
+3. 탄창이면 이름의 구경과 탄약 카탈로그(ammo_catalog.py)의 무기별 구경 ("5.56x45 30-Round Polymer Mag" -> 5.56x45mm 무기)
+위에서 찾지 못한 부착물은 어느 무기에도 넣지 않고 호환 정보 없음(unmatched)으로 따로 표시한다
+(모든 무기에 넣으면 최적화 탐색 범위가 부풀고 장착할 수 없는 빌드를 추천할 수 있다).
+결과는 정수 id 배열로 줄여 app/data/compat_index.json에 저장하고, Python(빌드 계산)과 Next.js에서 같이 씁니다.
+입력 JSON(무기 / 부착물 / 탄약 카탈로그)이 저장된 인덱스보다 새로우면 load_or_build가 다시 만든다.
+
+사용법:
+    python compat_index.py
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Sequence
+
+from ammo_catalog import OUTPUT_PATH as AMMO_CATALOG_PATH, build_catalog, weapon_calibers
+from build_stats import attachment_slot
+from catalog_store import APP_ATTACHMENTS_PATH, APP_WEAPONS_PATH
+from publish_data import publish_json
+
+OUTPUT_PATH = Path("app/data/compat_index.json")
+
+# "5.56x45", "7.62 x 39" 또는 "5.8" / "6.8" 같은 구경 표기
+CALIBER_PATTERN = re.compile(r"(?<![\d.])(\d{1,2}\.\d{1,2}|\d{1,2})\s*[x×]\s*(\d{2,3})|(?<![\d.])(\d\.\d{1,2})(?![\d.x×])")
+
+
+def normalize(name: str) -> str:
+    """비교용 이름: 소문자, 영숫자와 한글만 ("AK-12" -> "ak12")."""
+    return re.sub(r"[^0-9a-z가-힣]", "", name.lower())
+
+
+def calibers_in(text: str) -> set[tuple[str, str | None]]:
+    """문자열 안의 구경 (지름, 탄피 길이). 길이를 모르면 None."""
+    found = set()
+    for diameter, length, short in CALIBER_PATTERN.findall(text):
+        found.add((diameter, length) if length else (short, None))
+    return found
+
+
+def caliber_fits(attachment: set, weapon: set) -> bool:
+    for diameter, length in attachment:
+        for w_diameter, w_length in weapon:
+            if diameter == w_diameter and (length is None or length == w_length):
+                return True
+    return False
+
+
+def is_stale(path: Path, inputs: Sequence[Path]) -> bool:
+    """입력 파일 중 하나라도 path보다 나중에 바뀌었으면 True (없는 입력은 무시)."""
+    built = path.stat().st_mtime
+    return any(p.exists() and p.stat().st_mtime > built for p in inputs)
+
+
+class NameMatcher:
+    """부착물 이름의 단어(와 이웃한 두 단어)를 무기 이름과 비교."""
+
+    def __init__(self, weapon_names: Sequence[str]):
+        self.exact: dict[str, int] = {}
+        # "PSG-1"처럼 끝자리 숫자만 빠진 표기("PSG")도 받아들인다
+        self.family: dict[str, int] = {}
+        for i, name in enumerate(weapon_names):
+            key = normalize(name)
+            self.exact.setdefault(key, i)
+            if len(key) >= 4 and key[-1].isdigit() and not key[-2].isdigit():
+                self.family.setdefault(key[:-1], i)
+
+    def match(self, text: str) -> set[int]:
+        words = [normalize(word) for word in text.split()]
+        candidates = words + [a + b for a, b in zip(words, words[1:])]
+        found = set()
+        for token in candidates:
+            if not token or token.isdigit() or "round" in token:
+                continue
+            if token in self.exact:
+                found.add(self.exact[token])
+            elif token in self.family:
+                found.add(self.family[token])
+        return found
+
+
+class CompatIndex:
+    """무기 id -> 호환 부착물 id 목록 (슬롯 순으로 정렬)."""
+
+    def __init__(
+        self,
+        weapons: list[str],
+        attachments: list[str],
+        slots: list[str],
+        attachment_slots: list[int],
+        by_weapon: list[list[int]],
+        unmatched: list[int] | None = None,
+    ):
+        self.weapons = weapons
+        self.attachments = attachments
+        self.slots = slots
+        self.attachment_slots = attachment_slots
+        self.by_weapon = by_weapon
+        self.unmatched = unmatched or []
+        self.weapon_ids = {name: i for i, name in enumerate(weapons)}
+        self.slot_ids = {name: i for i, name in enumerate(slots)}
+
+    @classmethod
+    def build(
+        cls, weapons: Sequence[dict], attachments: Sequence[dict], ammo: dict | None = None
+    ) -> "CompatIndex":
+        """ammo: 탄약 카탈로그 (ammo_catalog.py). 없으면 무기 목록에서 바로 만든다."""
+        weapon_names = [w["name"] for w in weapons]
+        matcher = NameMatcher(weapon_names)
+        by_caliber = weapon_calibers(ammo if ammo is not None else build_catalog(weapons))
+        calibers_by_weapon = [calibers_in(" ".join(by_caliber.get(name, []))) for name in weapon_names]
+        all_weapons = range(len(weapons))
+
+        slot_names = [attachment_slot(a) for a in attachments]
+        slots = sorted(set(slot_names))
+        slot_ids = {name: i for i, name in enumerate(slots)}
+
+        by_weapon: list[list[int]] = [[] for _ in weapons]
+        unmatched: list[int] = []
+        sources = {"scraped": 0, "name": 0, "caliber": 0, "none": 0}
+        for a, attachment in enumerate(attachments):
+            if attachment.get("compatible"):
+                fits = set().union(*(matcher.match(name) for name in attachment["compatible"]))
+                source = "scraped"
+            else:
+                fits = matcher.match(attachment["name"])
+                source = "name"
+                if not fits and slot_names[a] == "magazine":
+                    calibers = calibers_in(attachment["name"])
+                    fits = {w for w in all_weapons if caliber_fits(calibers, calibers_by_weapon[w])}
+                    source = "caliber"
+            sources[source if fits else "none"] += 1
+            if not fits:
+                unmatched.append(a)
+            for w in fits:
+                by_weapon[w].append(a)
+
+        for ids in by_weapon:
+            ids.sort(key=lambda a: (slot_ids[slot_names[a]], a))
+        print(f"[INFO] 호환 정보 출처별 부착물 수: {sources}")
+        return cls(
+            weapon_names,
+            [a["name"] for a in attachments],
+            slots,
+            [slot_ids[name] for name in slot_names],
+            by_weapon,
+            unmatched,
+        )
+
+    @classmethod
+    def from_files(
+        cls,
+        weapons_path: Path = APP_WEAPONS_PATH,
+        attachments_path: Path = APP_ATTACHMENTS_PATH,
+        ammo_path: Path = AMMO_CATALOG_PATH,
+    ) -> "CompatIndex":
+        weapons = json.loads(Path(weapons_path).read_text(encoding="utf-8"))
+        attachments = json.loads(Path(attachments_path).read_text(encoding="utf-8"))
+        ammo = json.loads(Path(ammo_path).read_text(encoding="utf-8")) if Path(ammo_path).exists() else None
+        return cls.build(weapons, attachments, ammo)
+
+    @classmethod
+    def load(cls, path: Path = OUTPUT_PATH) -> "CompatIndex":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(
+            data["weapons"],
+            data["attachments"],
+            data["slots"],
+            data["attachmentSlots"],
+            data["byWeapon"],
+            data.get("unmatched", []),
+        )
+
+    @classmethod
+    def load_or_build(
+        cls,
+        path: Path = OUTPUT_PATH,
+        weapons_path: Path = APP_WEAPONS_PATH,
+        attachments_path: Path = APP_ATTACHMENTS_PATH,
+        ammo_path: Path = AMMO_CATALOG_PATH,
+    ) -> "CompatIndex":
+        """
+        저장된 인덱스가 입력 파일보다 새로우면 읽고, 없거나 낡았으면 다시 만들어 저장한다.
+        다시 스크래핑한 뒤 예전 인덱스를 읽으면 새 부착물이 조용히 빠지기 때문.
+        """
+        path = Path(path)
+        inputs = [Path(p) for p in (weapons_path, attachments_path, ammo_path)]
+        if path.exists() and not is_stale(path, inputs):
+            return cls.load(path)
+        print(f"[INFO] {path}가 없거나 입력 데이터보다 오래되어 다시 만듭니다.")
+        index = cls.from_files(weapons_path, attachments_path, ammo_path)
+        index.save(path)
+        return index
+
+    def to_json(self) -> dict:
+        return {
+            "weapons": self.weapons,
+            "attachments": self.attachments,
+            "slots": self.slots,
+            "attachmentSlots": self.attachment_slots,
+            "byWeapon": self.by_weapon,
+            "unmatched": self.unmatched,
+        }
+
+    def save(self, path: Path = OUTPUT_PATH) -> None:
+        # Next.js 번들에 그대로 들어가므로 공백 없이 저장
+        publish_json(path, self.to_json(), minified=True)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def attachment_ids(self, weapon: str, slot: str | None = None) -> list[int]:
+        """무기에 맞는 부착물 id. slot을 주면 그 슬롯만. 모르는 무기면 빈 목록."""
+        weapon_id = self.weapon_ids.get(weapon)
+        if weapon_id is None:
+            return []
+        ids = self.by_weapon[weapon_id]
+        if slot is None:
+            return ids
+        slot_id = self.slot_ids.get(slot)
+        return [a for a in ids if self.attachment_slots[a] == slot_id]
+
+    def for_weapon(self, weapon: str, slot: str | None = None) -> list[str]:
+        return [self.attachments[a] for a in self.attachment_ids(weapon, slot)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="무기 - 부착물 호환 인덱스 생성")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    index = CompatIndex.from_files()
+    index.save(args.output)
+    pairs = sum(len(ids) for ids in index.by_weapon)
+    print(f"[INFO] 무기 {len(index.weapons)}개 / 호환 쌍 {pairs}개를 {args.output.resolve()}에 저장했습니다.")
+    if index.unmatched:
+        print(f"[WARN] 호환 무기를 알 수 없는 부착물 {len(index.unmatched)}개는 인덱스에서 뺐습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Selenium 드라이버 수명 관리
+- page load / script 타임아웃 설정
+- 워치독: driver.get 등이 멈추면 브라우저 프로세스를 죽이고 새 드라이버로 교체한 뒤 같은 URL을 다시 연다
+- N 페이지마다 또는 브라우저 프로세스 메모리(RSS)가 임계값을 넘으면 드라이버를 재시작(recycle)
+  (URL로 다시 열 수 없는 클릭 페이지네이션 중에는 pinned()로 재시작을 미룬다)
+- 재시작한 드라이버에는 이전 브라우저의 쿠키(봇 체크 통과 쿠키 포함)를 다시 넣는다
+긴 크롤링에서도 메모리가 일정하게 유지되고, 멈춘 세션 때문에 실행이 끝나지 않는 일이 없게 합니다.
+"""
+
+import os
+import signal
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+try:
+    import psutil
+except ImportError:  # 없으면 RSS 기준 재시작과 프로세스 트리 정리는 건너뛴다
+    psutil = None
+
+PAGE_LOAD_TIMEOUT = 30
+SCRIPT_TIMEOUT = 30
+# 드라이버 명령 하나가 이 시간(초)을 넘기면 멈춘 것으로 본다
+WATCHDOG_TIMEOUT = 60
+# 이 페이지 수마다 드라이버 재시작
+MAX_PAGES_PER_DRIVER = 200
+# 브라우저 프로세스 전체 RSS가 이 값(MB)을 넘으면 재시작
+MAX_BROWSER_RSS_MB = 1500
+# 같은 URL에서 연속으로 멈출 때 재시작을 시도할 횟수
+MAX_RESTARTS = 3
+
+
+class DriverHung(RuntimeError):
+    """워치독이 멈춘 드라이버를 교체했음을 알리는 예외."""
+
+
+def _kill_pid_tree(pid: int) -> None:
+    """chromedriver와 그 자식(Chrome) 프로세스를 강제 종료."""
+    if psutil is not None:
+        try:
+            parent = psutil.Process(pid)
+        except psutil.NoSuchProcess:
+            return
+        for proc in parent.children(recursive=True) + [parent]:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+        return
+    try:
+        os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+    except OSError:
+        pass
+
+
+class ManagedDriver:
+    """
+    드라이버를 감싸 수명 주기를 관리. get / page_source / execute_script 등은
+    그대로 현재 드라이버에 전달되므로 기존 webdriver.Chrome 자리에 그대로 쓸 수 있다.
+    """
+
+    def __init__(
+        self,
+        factory,
+        page_load_timeout: float = PAGE_LOAD_TIMEOUT,
+        script_timeout: float = SCRIPT_TIMEOUT,
+        watchdog_timeout: float = WATCHDOG_TIMEOUT,
+        max_pages: int = MAX_PAGES_PER_DRIVER,
+        max_rss_mb: float = MAX_BROWSER_RSS_MB,
+        max_restarts: int = MAX_RESTARTS,
+    ):
+        self.factory = factory
+        self.page_load_timeout = page_load_timeout
+        self.script_timeout = script_timeout
+        self.watchdog_timeout = watchdog_timeout
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.max_restarts = max_restarts
+
+        self.pages = 0
+        self.stats = {"restarts": 0, "recycles": 0, "hangs": 0}
+        self._driver = None
+        self._last_url: str | None = None
+        # 마지막으로 읽은 브라우저 쿠키 (멈춘 드라이버에서는 읽을 수 없으므로 미리 저장)
+        self._cookies: list[dict] = []
+        self._pinned = 0
+        self._lock = threading.RLock()
+        self._start()
+
+    # ------------------------------------------------------------------
+    # 시작 / 종료
+    # ------------------------------------------------------------------
+    def _start(self) -> None:
+        driver = self.factory()
+        driver.set_page_load_timeout(self.page_load_timeout)
+        driver.set_script_timeout(self.script_timeout)
+        self._driver = driver
+        self.pages = 0
+
+    def _driver_pid(self) -> int | None:
+        service = getattr(self._driver, "service", None)
+        process = getattr(service, "process", None)
+        return getattr(process, "pid", None)
+
+    def _stop(self) -> None:
+        """quit()을 시도하고, 응답이 없으면 프로세스 트리를 강제 종료."""
+        if self._driver is None:
+            return
+        pid = self._driver_pid()
+        quitter = threading.Thread(target=self._quit_quietly, args=(self._driver,), daemon=True)
+        quitter.start()
+        quitter.join(timeout=10)
+        if pid is not None and quitter.is_alive():
+            # quit까지 멈췄으면 프로세스를 직접 정리
+            _kill_pid_tree(pid)
+        self._driver = None
+
+    @staticmethod
+    def _quit_quietly(driver) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def restart(self, reopen: bool = True) -> None:
+        """드라이버를 새로 띄우고 쿠키를 되살린 뒤, 마지막으로 열었던 URL을 다시 연다."""
+        with self._lock:
+            self._stop()
+            self._start()
+            self.stats["restarts"] += 1
+            self._restore_cookies()
+            if reopen and self._last_url:
+                self._guarded(self._driver.get, self._last_url)
+
+    def _save_cookies(self) -> None:
+        try:
+            self._cookies = self._guarded(self._driver.get_cookies) or self._cookies
+        except Exception:
+            pass
+
+    def _restore_cookies(self) -> None:
+        """새 드라이버에 저장해 둔 쿠키 적용. add_cookie는 같은 도메인 페이지에서만 되므로 사이트 루트를 먼저 연다."""
+        if not self._cookies or not self._last_url:
+            return
+        parts = urlparse(self._last_url)
+        try:
+            self._guarded(self._driver.get, f"{parts.scheme}://{parts.netloc}/")
+        except Exception as exc:
+            print(f"  -> [WARN] 쿠키 복원 실패: {exc}")
+            return
+        for cookie in self._cookies:
+            try:
+                self._driver.add_cookie(cookie)
+            except Exception:
+                # 다른 도메인 쿠키 등은 건너뛴다
+                pass
+
+    def quit(self) -> None:
+        with self._lock:
+            self._stop()
+
+    # ------------------------------------------------------------------
+    # 워치독
+    # ------------------------------------------------------------------
+    def _guarded(self, fn, *args):
+        """fn(*args)를 별도 스레드에서 실행하고 watchdog_timeout 안에 끝나지 않으면 DriverHung."""
+        result: dict = {}
+
+        def target():
+            try:
+                result["value"] = fn(*args)
+            except BaseException as exc:  # 호출한 스레드에서 다시 올린다
+                result["error"] = exc
+
+        worker = threading.Thread(target=target, daemon=True)
+        worker.start()
+        worker.join(timeout=self.watchdog_timeout)
+        if worker.is_alive():
+            self.stats["hangs"] += 1
+            raise DriverHung(f"드라이버 응답 없음 ({self.watchdog_timeout}초)")
+        if "error" in result:
+            raise result["error"]
+        return result.get("value")
+
+    def guard(self, fn, *args):
+        """
+        드라이버 명령(클릭 등)을 워치독 아래에서 실행.
+        멈추면 드라이버를 교체하고 마지막 URL을 다시 연 뒤 DriverHung을 올린다 (호출한 쪽에서 재시도).
+        """
+        with self._lock:
+            try:
+                return self._guarded(fn, *args)
+            except DriverHung:
+                print("  -> [WATCHDOG] 멈춘 드라이버를 교체합니다.")
+                self.restart()
+                raise
+
+    def get(self, url: str) -> None:
+        """워치독 아래에서 페이지 이동. 멈추면 드라이버를 교체하고 같은 URL을 다시 시도."""
+        with self._lock:
+            self.maybe_recycle(reopen=False)
+            self._last_url = url
+            for attempt in range(self.max_restarts):
+                try:
+                    self._guarded(self._driver.get, url)
+                    self.pages += 1
+                    self._save_cookies()
+                    return
+                except DriverHung:
+                    print(f"  -> [WATCHDOG] 페이지 로딩 중 멈춤, 드라이버 교체 후 재시도 ({attempt + 1}/{self.max_restarts})")
+                    self.restart(reopen=False)
+            raise DriverHung(f"드라이버를 {self.max_restarts}번 교체했지만 로딩 실패: {url}")
+
+    # ------------------------------------------------------------------
+    # 재시작 정책
+    # ------------------------------------------------------------------
+    def browser_rss_mb(self) -> float | None:
+        """chromedriver + Chrome 프로세스 전체 RSS(MB). psutil이 없으면 None."""
+        pid = self._driver_pid()
+        if psutil is None or pid is None:
+            return None
+        try:
+            parent = psutil.Process(pid)
+            procs = [parent] + parent.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return None
+        total = 0
+        for proc in procs:
+            try:
+                total += proc.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        return total / (1024 * 1024)
+
+    def mark_page(self) -> None:
+        """get()을 거치지 않은 이동(클릭 페이지네이션 등)도 페이지 수에 반영."""
+        self.pages += 1
+        self._last_url = self._driver.current_url
+        self._save_cookies()
+
+    @contextmanager
+    def pinned(self):
+        """
+        이 블록 안에서는 recycle하지 않는다.
+        클릭 페이지네이션(SPA)은 URL이 바뀌지 않아 다시 열면 첫 페이지로 돌아가므로 목록을 다 읽은 뒤로 미룬다.
+        """
+        with self._lock:
+            self._pinned += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._pinned -= 1
+
+    def maybe_recycle(self, reopen: bool = True) -> bool:
+        """페이지 수 / RSS 기준을 넘으면 드라이버를 재시작. 재시작했으면 True. pinned() 안에서는 하지 않는다."""
+        with self._lock:
+            if self._pinned:
+                return False
+            reason = None
+            if self.pages >= self.max_pages:
+                reason = f"{self.pages}페이지 처리"
+            else:
+                rss = self.browser_rss_mb()
+                if rss is not None and rss > self.max_rss_mb:
+                    reason = f"브라우저 메모리 {rss:.0f}MB"
+            if reason is None:
+                return False
+            print(f"  -> [RECYCLE] {reason}, 드라이버를 재시작합니다.")
+            # 정상 동작 중인 드라이버에서 최신 쿠키를 가져간다
+            self._save_cookies()
+            self.restart(reopen=reopen)
+            self.stats["recycles"] += 1
+            return True
+
+    # ------------------------------------------------------------------
+    # 나머지 속성은 현재 드라이버로 전달
+    # ------------------------------------------------------------------
+    @property
+    def driver(self):
+        return self._driver
+
+    def __getattr__(self, name):
+        # _driver가 아직 없을 때 재귀 호출을 막는다
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._driver, name)
@@ -0,0 +1,226 @@
+"""
+단계별(tiered) 페이지 수집기
+1단계: 커넥션 풀을 쓰는 일반 HTTP GET
+2단계: 1단계 결과가 페이지 종류별 완결성 검사를 통과하지 못하면 헤드리스 브라우저로 렌더링
+각 URL을 어느 단계가 처리했는지 기록합니다.
+"""
+
+import threading
+import time
+from collections import Counter
+from urllib.parse import parse_qs, unquote, urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from http_session import POOL_SIZE, create_session
+from hybrid_session import create_managed_driver, export_browser_state, is_challenge_page
+from rate_control import untimed
+
+# 목록(카테고리) 페이지로 취급할 URL 마지막 세그먼트
+LISTING_SEGMENTS = {
+    "all",
+    "mag",
+    "functional",
+    "rear grip",
+    "foregrip",
+    "handguard",
+    "barrel",
+    "muzzle",
+    "optic",
+    "stock",
+    "attachment",
+}
+
+# 상세 페이지에 반드시 있어야 하는 스탯 키워드 (하나 이상)
+WEAPON_STAT_MARKERS = ("Damage", "Fire Rate", "Muzzle Velocity", "Capacity")
+ATTACHMENT_STAT_MARKERS = ("Holds", "Handling", "Recoil Control", "Ergonomics", "Stability", "Accuracy")
+
+# 목록 페이지로 인정할 최소 상세 링크 수
+MIN_LISTING_LINKS = 5
+
+
+def page_type_of(url: str) -> str:
+    """URL로 페이지 종류 추정: listing / weapon / attachment / other"""
+    path = unquote(urlparse(url).path)
+    last_segment = path.rstrip("/").split("/")[-1].lower()
+    if "/wiki/" in path and last_segment in LISTING_SEGMENTS:
+        return "listing"
+    if "/wiki/weapon/" in path:
+        return "weapon"
+    if "/wiki/attachment/" in path:
+        return "attachment"
+    return "other"
+
+
+def visible_soup(html: str) -> BeautifulSoup:
+    """script / style을 뺀 DOM. 인라인 __NEXT_DATA__ JSON 안의 "<h1"이나 스탯 이름에 속지 않도록."""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "template"]):
+        tag.decompose()
+    return soup
+
+
+def has_title(soup: BeautifulSoup) -> bool:
+    h1 = soup.find("h1")
+    return h1 is not None and bool(h1.get_text(strip=True))
+
+
+def has_stat_label(soup: BeautifulSoup, markers: tuple[str, ...]) -> bool:
+    text = (soup.body or soup).get_text(" ")
+    return any(marker in text for marker in markers)
+
+
+def is_complete_weapon(soup: BeautifulSoup) -> bool:
+    return has_title(soup) and has_stat_label(soup, WEAPON_STAT_MARKERS)
+
+
+def is_complete_attachment(soup: BeautifulSoup) -> bool:
+    return has_title(soup) and has_stat_label(soup, ATTACHMENT_STAT_MARKERS)
+
+
+def is_complete_listing(soup: BeautifulSoup) -> bool:
+    links = {a["href"] for a in soup.find_all("a", href=True) if "/wiki/" in a["href"]}
+    return len(links) >= MIN_LISTING_LINKS
+
+
+# 페이지 종류별 완결성 검사 (script / style을 뺀 DOM에서 검사)
+PAGE_CHECKS = {
+    "weapon": is_complete_weapon,
+    "attachment": is_complete_attachment,
+    "listing": is_complete_listing,
+}
+
+
+def is_complete(html: str | None, page_type: str) -> bool:
+    """봇 체크 페이지가 아니고 페이지 종류별 필수 요소가 있으면 True."""
+    if not html or is_challenge_page(html):
+        return False
+    check = PAGE_CHECKS.get(page_type)
+    return check(visible_soup(html)) if check else True
+
+
+def wait_for_page(driver, page_type: str, timeout: float = 15.0, poll: float = 0.25) -> str:
+    """고정 대기 대신, 페이지가 완결성 검사를 통과할 때까지 짧게 폴링. 마지막 HTML 반환."""
+    deadline = time.monotonic() + timeout
+    html = driver.page_source
+    while not is_complete(html, page_type) and time.monotonic() < deadline:
+        time.sleep(poll)
+        html = driver.page_source
+    return html
+
+
+def page_text(soup: BeautifulSoup) -> str:
+    """렌더링된 body.text와 비슷하게 줄 단위 텍스트 추출."""
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    body = soup.body or soup
+    return body.get_text("\n")
+
+
+def page_image(soup: BeautifulSoup, name: str | None, page_url: str) -> str | None:
+    """
+    상세 페이지의 아이템 이미지 원본 URL (alt가 아이템 이름인 <img>, 없으면 og:image).
+    Next.js 이미지 프록시 주소(/_next/image?url=...)는 원본 이미지 주소로 풀어 준다.
+    """
+    img = soup.find("img", alt=name) if name else None
+    src = img.get("src") if img is not None else None
+    if not src:
+        meta = soup.find("meta", property="og:image")
+        src = meta.get("content") if meta is not None else None
+    if not src:
+        return None
+
+    src = urljoin(page_url, src)
+    parsed = urlparse(src)
+    if parsed.path.endswith("/_next/image"):
+        inner = parse_qs(parsed.query).get("url")
+        if inner:
+            src = urljoin(page_url, inner[0])
+    return src
+
+
+class TieredFetcher:
+    """HTTP 우선, 실패 시에만 브라우저로 렌더링하는 수집기."""
+
+    def __init__(
+        self,
+        driver=None,
+        driver_factory=None,
+        timeout: float = 20,
+        render_timeout: float = 15.0,
+        pool_size: int = POOL_SIZE,
+        http2: bool = False,
+    ):
+        self.timeout = timeout
+        self.render_timeout = render_timeout
+        self.session = create_session(pool_size, http2=http2)
+
+        # 외부에서 받은 드라이버는 닫지 않는다
+        self._driver = driver
+        self._owns_driver = driver is None
+        self._driver_factory = driver_factory or (lambda: create_managed_driver(headless=True))
+        self._browser_lock = threading.Lock()
+
+        # URL -> 처리한 단계 ("http" / "browser" / "browser-incomplete")
+        self.tier_log: dict[str, str] = {}
+
+    def sync_cookies(self) -> None:
+        """브라우저 쿠키를 HTTP 세션에 복사 (브라우저로 봇 체크를 통과한 뒤 호출)."""
+        if self._driver is not None:
+            export_browser_state(self._driver, self.session)
+
+    def _fetch_http(self, url: str) -> str | None:
+        """HTTP 단계. 브라우저로 넘길 응답이면 None.
+        429 / 5xx(챌린지 제외)와 연결 오류는 예외로 올려 재시도 계층이 처리하게 한다."""
+        response = self.session.get(url, timeout=self.timeout)
+        status = response.status_code
+        if status == 429 or (status >= 500 and not is_challenge_page(response.text)):
+            response.raise_for_status()
+        if status >= 400:
+            return None
+        return response.text
+
+    def _render(self, url: str, page_type: str) -> str:
+        # 잠금 대기와 렌더링 시간은 AIMD 제어기의 지연 신호에서 뺀다 (HTTP 요청 시간만 잰다)
+        with untimed(), self._browser_lock:
+            if self._driver is None:
+                self._driver = self._driver_factory()
+            self._driver.get(url)
+            html = wait_for_page(self._driver, page_type, self.render_timeout)
+            # 브라우저가 받은 쿠키로 이후 요청은 HTTP 단계에서 통과하도록
+            export_browser_state(self._driver, self.session)
+            return html
+
+    def fetch(self, url: str, page_type: str | None = None) -> str:
+        """페이지 HTML 반환. 완결성 검사를 통과하지 못할 때만 브라우저 사용."""
+        page_type = page_type or page_type_of(url)
+
+        html = self._fetch_http(url)
+        if is_complete(html, page_type):
+            self.tier_log[url] = "http"
+            return html
+
+        html = self._render(url, page_type)
+        self.tier_log[url] = "browser" if is_complete(html, page_type) else "browser-incomplete"
+        return html
+
+    def browser_rss_mb(self) -> float | None:
+        """브라우저 단계 드라이버의 메모리 (프로파일링용). 아직 띄우지 않았으면 None."""
+        rss_fn = getattr(self._driver, "browser_rss_mb", None)
+        return rss_fn() if rss_fn is not None else None
+
+    def summary(self) -> dict[str, int]:
+        """단계별 처리 URL 수."""
+        return dict(Counter(self.tier_log.values()))
+
+    def close(self) -> None:
+        self.session.close()
+        if self._owns_driver and self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,107 @@
+"""
+공용 HTTP 세션
+커넥션 풀(keep-alive), gzip/brotli 압축 전송, 선택적 HTTP/2를 설정한 세션을 만듭니다.
+모든 HTTP 수집 경로는 매 요청마다 requests.get을 부르지 말고 이 세션을 사용합니다.
+"""
+
+import importlib.util
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # HTTP/2는 httpx[http2]가 설치된 경우에만 사용
+    httpx = None
+
+
+def has_brotli() -> bool:
+    """urllib3가 br 응답을 풀 때 쓰는 brotli / brotlicffi 모듈이 설치돼 있는지 (import하지 않고 확인)."""
+    return any(importlib.util.find_spec(name) is not None for name in ("brotli", "brotlicffi"))
+
+
+HAS_BROTLI = has_brotli()
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# 한 호스트에 동시에 유지할 커넥션 수
+POOL_SIZE = 16
+# 유휴 커넥션 유지 시간 (HTTP/2 클라이언트에만 적용, urllib3는 서버 설정을 따름)
+KEEPALIVE_EXPIRY = 30.0
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9,ko;q=0.8",
+    # brotli 모듈이 없으면 br 응답을 풀 수 없으므로 요청하지 않는다
+    "Accept-Encoding": "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+# 세션 종류와 관계없이 "요청 자체가 실패"한 경우에 해당하는 예외들
+TRANSPORT_ERRORS: tuple[type[Exception], ...] = (requests.RequestException,)
+if httpx is not None:
+    TRANSPORT_ERRORS += (httpx.HTTPError,)
+
+
+def _create_http2_client(pool_size: int):
+    """HTTP/2 클라이언트 생성. 사용할 수 없으면 None."""
+    if httpx is None:
+        return None
+    try:
+        return httpx.Client(
+            http2=True,
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+    except ImportError:  # h2 패키지 없음
+        return None
+
+
+def create_session(pool_size: int = POOL_SIZE, http2: bool = False):
+    """
+    keep-alive 커넥션 풀과 압축 전송을 설정한 세션 생성.
+    http2=True이고 httpx[http2]가 설치돼 있으면 httpx.Client를 반환합니다.
+    (get / headers / cookies / close 사용법은 requests.Session과 같음)
+    """
+    if http2:
+        client = _create_http2_client(pool_size)
+        if client is not None:
+            return client
+        print("[WARN] httpx[http2]가 설치되지 않아 HTTP/1.1 세션을 사용합니다.")
+
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    # 재시도는 상위 계층에서 처리하므로 어댑터 재시도는 끈다
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_size,
+        pool_block=True,
+        max_retries=0,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_shared_session = None
+_shared_lock = threading.Lock()
+
+
+def get_session():
+    """프로세스 전체에서 공유하는 기본 세션."""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+        return _shared_session
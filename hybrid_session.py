@@ -0,0 +1,171 @@
+"""
+하이브리드 세션
+브라우저(Selenium)로 사이트의 봇 체크를 한 번 통과한 뒤, 브라우저의 쿠키와 헤더를
+keep-alive 커넥션 풀을 쓰는 HTTP 세션으로 넘겨 상세 페이지는 HTTP로 가져옵니다.
+세션이 만료되면(챌린지 페이지 / 401 / 403) 그때만 브라우저로 다시 통과합니다.
+"""
+
+import threading
+import time
+from functools import partial
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from driver_manager import ManagedDriver
+from http_session import POOL_SIZE, USER_AGENT, create_session
+from rate_control import untimed
+
+BASE_URL = "https://deltaforcetools.gg"
+
+# 봇 체크(챌린지) 페이지에서만 보이는 문구들
+CHALLENGE_MARKERS = (
+    "just a moment...",
+    "checking your browser",
+    "cf-browser-verification",
+    "challenge-platform",
+    "cf_chl_",
+    "attention required! | cloudflare",
+    "verify you are human",
+)
+
+# 이 상태 코드가 오면 쿠키가 만료된 것으로 본다 (503 챌린지는 본문으로 판별)
+EXPIRED_STATUS_CODES = {401, 403}
+
+# 챌린지 통과 대기 시간 (사람 인증이 뜨면 직접 풀 시간 포함)
+CHALLENGE_TIMEOUT = 120
+
+
+def create_driver(headless: bool = False) -> webdriver.Chrome:
+    """Selenium Chrome 드라이버 생성."""
+    options = Options()
+    # 사람 인증을 직접 풀어야 하면 화면이 보여야 하므로 기본값은 창 모드
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument(f"user-agent={USER_AGENT}")
+
+    service = Service(ChromeDriverManager().install())
+    return webdriver.Chrome(service=service, options=options)
+
+
+def create_managed_driver(headless: bool = False) -> ManagedDriver:
+    """타임아웃 / 워치독 / 주기적 재시작이 적용된 드라이버 생성."""
+    return ManagedDriver(partial(create_driver, headless=headless))
+
+
+def is_challenge_page(html: str) -> bool:
+    """HTML이 실제 페이지가 아니라 봇 체크 페이지인지 검사."""
+    if not html:
+        return True
+    head = html[:20000].lower()
+    return any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+def wait_for_challenge(driver: webdriver.Chrome, timeout: float = CHALLENGE_TIMEOUT) -> bool:
+    """챌린지 페이지가 사라질 때까지 대기. 통과하면 True."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if not is_challenge_page(driver.page_source):
+            return True
+        time.sleep(1.0)
+    return False
+
+
+def export_browser_state(driver: webdriver.Chrome, session) -> None:
+    """드라이버의 쿠키와 User-Agent를 HTTP 세션으로 복사."""
+    # 챌린지 쿠키는 User-Agent와 묶여 있으므로 브라우저 값을 그대로 사용
+    session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent")
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", ""),
+            path=cookie.get("path", "/"),
+        )
+
+
+class HybridSession:
+    """브라우저로 얻은 쿠키를 HTTP 커넥션 풀에서 재사용하는 세션."""
+
+    def __init__(
+        self,
+        warmup_url: str = BASE_URL,
+        driver_factory=create_managed_driver,
+        pool_size: int = POOL_SIZE,
+        timeout: float = 20,
+        http2: bool = False,
+    ):
+        self.warmup_url = warmup_url
+        self.driver_factory = driver_factory
+        self.timeout = timeout
+        self.session = create_session(pool_size, http2=http2)
+
+        self.stats = {"http": 0, "browser": 0}
+        # 쿠키를 갱신할 때마다 1씩 증가 (0이면 아직 한 번도 통과하지 않음)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def refresh(self, url: str | None = None, seen: int | None = None) -> str | None:
+        """
+        브라우저로 챌린지를 통과하고 쿠키를 세션에 복사. 렌더링된 HTML을 반환.
+        seen: 호출한 쪽이 요청을 시작할 때 본 쿠키 세대. 잠금을 기다리는 동안
+        다른 스레드가 이미 갱신했다면 브라우저를 열지 않고 None을 반환한다.
+        잠금 대기와 렌더링 시간은 요청 지연(AIMD)에 넣지 않는다.
+        """
+        with untimed(), self._lock:
+            if seen is not None and seen != self._generation:
+                return None
+            target = url or self.warmup_url
+            print(f"[INFO] 브라우저로 세션 갱신 중: {target}")
+            driver = self.driver_factory()
+            try:
+                driver.get(target)
+                if not wait_for_challenge(driver):
+                    raise RuntimeError(f"봇 체크를 통과하지 못했습니다: {target}")
+                html = driver.page_source
+                export_browser_state(driver, self.session)
+            finally:
+                driver.quit()
+
+            self._generation += 1
+            self.stats["browser"] += 1
+            return html
+
+    def _get_http(self, url: str) -> str | None:
+        """HTTP로 페이지 요청. 세션이 만료됐으면 None, 그 외 오류 상태는 예외."""
+        response = self.session.get(url, timeout=self.timeout)
+        if response.status_code in EXPIRED_STATUS_CODES or is_challenge_page(response.text):
+            return None
+        response.raise_for_status()
+        self.stats["http"] += 1
+        return response.text
+
+    def get(self, url: str) -> str:
+        """페이지 HTML 반환. 세션이 만료된 경우에만 브라우저를 사용."""
+        if self._generation == 0:
+            # 첫 요청들이 동시에 들어와도 브라우저는 한 번만 연다
+            self.refresh(seen=0)
+
+        seen = self._generation
+        html = self._get_http(url)
+        if html is None:
+            # 만료된 세션: 해당 페이지를 브라우저로 열면서 쿠키도 갱신
+            html = self.refresh(url, seen=seen)
+        if html is None:
+            # 기다리는 동안 다른 스레드가 쿠키를 갱신했다: 새 쿠키로 HTTP부터 다시
+            html = self._get_http(url) or self.refresh(url)
+        return html
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
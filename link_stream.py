@@ -0,0 +1,92 @@
+"""
+스트리밍 링크 추출기
+목록 페이지에서 <a href>만 필요할 때 BeautifulSoup 트리를 만들지 않고
+HTML을 조각 단위로 읽으면서(html.parser 이벤트) 링크를 찾는 즉시 넘겨줍니다.
+무한 스크롤 목록이 커져도 트리 메모리가 들지 않고, 찾은 링크를 바로 수집기로 넘길 수 있습니다.
+"""
+
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, NamedTuple
+
+# 한 번에 파서에 넣을 문자 수
+CHUNK_SIZE = 64 * 1024
+
+
+class Anchor(NamedTuple):
+    href: str
+    parts: tuple[str, ...]
+
+    @property
+    def text(self) -> str:
+        """BeautifulSoup get_text()와 같은 결과."""
+        return "".join(self.parts)
+
+    @property
+    def stripped_text(self) -> str:
+        """BeautifulSoup get_text(strip=True)와 같은 결과."""
+        return "".join(part.strip() for part in self.parts)
+
+
+class _AnchorParser(HTMLParser):
+    """<a> 시작~끝 사이의 텍스트만 모으고 나머지는 버리는 이벤트 파서."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.found: list[Anchor] = []
+        self._href: str | None = None
+        self._parts: list[str] = []
+
+    def _flush(self) -> None:
+        if self._href is not None:
+            self.found.append(Anchor(self._href, tuple(self._parts)))
+        self._href = None
+        self._parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        # 닫히지 않은 <a> 안에서 새 <a>가 시작되면 앞의 것을 먼저 내보낸다
+        self._flush()
+        href = dict(attrs).get("href")
+        if href is not None:
+            self._href = href
+
+    def handle_endtag(self, tag):
+        if tag == "a":
+            self._flush()
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._parts.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def iter_chunks(html: str, size: int = CHUNK_SIZE) -> Iterator[str]:
+    """문자열을 일정 크기 조각으로 나눠서 반환."""
+    for start in range(0, len(html), size):
+        yield html[start:start + size]
+
+
+def iter_anchors(source: str | Iterable[str], href_contains: str | None = None) -> Iterator[Anchor]:
+    """
+    HTML 문자열 또는 문자열 조각 스트림에서 <a href>를 순서대로 반환.
+    href_contains를 주면 href에 그 문자열이 들어간 링크만 반환한다.
+    """
+    chunks = iter_chunks(source) if isinstance(source, str) else source
+    parser = _AnchorParser()
+
+    def drain() -> Iterator[Anchor]:
+        found, parser.found = parser.found, []
+        for anchor in found:
+            if href_contains is None or href_contains in anchor.href:
+                yield anchor
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
@@ -0,0 +1,299 @@
+"""
+스크래퍼 실행 프로파일링 (선택 기능)
+- CPU: 단계별 cProfile(.prof + 요약 텍스트, 단계 중 시작된 워커 스레드까지 합산) 또는 모든 스레드를 보는 샘플링 프로파일러(flamegraph용 collapsed 스택)
+- 메모리: 단계별 tracemalloc 상위 할당 위치 스냅샷
+- RSS: 파이썬 프로세스와 브라우저(chromedriver + Chrome) 프로세스 메모리를 주기적으로 기록
+결과는 출력 JSON 옆의 <이름>.profile/ 폴더에 저장됩니다. 예: weapons_data.profile/details.prof
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# tracemalloc 스냅샷에 남길 상위 할당 위치 수
+TOP_ALLOCATIONS = 25
+# cProfile 요약에 남길 상위 함수 수
+TOP_FUNCTIONS = 40
+
+
+def add_profiling_args(parser) -> None:
+    """argparse 파서에 프로파일링 옵션 추가."""
+    group = parser.add_argument_group("프로파일링")
+    group.add_argument(
+        "--profile-cpu",
+        choices=["cprofile", "sample"],
+        help="단계별 CPU 프로파일 (cprofile: 메인 + 단계 중 시작된 워커 스레드 정밀 / sample: 모든 스레드 샘플링)",
+    )
+    group.add_argument("--profile-memory", action="store_true", help="단계별 tracemalloc 상위 할당 스냅샷")
+    group.add_argument("--profile-rss", action="store_true", help="파이썬 / 브라우저 프로세스 RSS 주기 기록")
+    group.add_argument("--sample-interval", type=float, default=0.005, help="샘플링 간격(초)")
+
+
+def profile_dir(output_path: Path) -> Path:
+    """출력 파일 경로에 대응하는 프로파일 결과 폴더."""
+    return output_path.with_name(f"{output_path.stem}.profile")
+
+
+def python_rss_mb() -> float | None:
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    if resource is not None:
+        # ru_maxrss는 최대값(리눅스 KB 단위)이지만 추세를 보기에는 충분하다
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return None
+
+
+class StackSampler:
+    """sys._current_frames()로 모든 스레드의 스택을 주기적으로 모으는 샘플링 프로파일러."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.is_set():
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path: Path) -> None:
+        """flamegraph.pl / speedscope에서 읽는 collapsed 스택 형식으로 저장."""
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        path.write_text("\n".join(lines), encoding="utf-8")
+
+
+class ThreadProfiles:
+    """
+    cProfile은 enable()을 부른 스레드만 보므로, 단계 중 새로 시작되는 스레드
+    (AIMDController.map의 ThreadPoolExecutor 워커 등)마다 Profile을 따로 켜고 끝에 합친다.
+    threading.setprofile로 등록한 훅은 새 스레드의 첫 호출에서 한 번 불리고,
+    그 자리에서 켠 Profile이 해당 스레드의 프로파일 함수를 대신한다.
+    """
+
+    def __init__(self):
+        self.main = cProfile.Profile()
+        self._workers: list[tuple[threading.Thread, cProfile.Profile]] = []
+        self._lock = threading.Lock()
+
+    def _hook(self, frame, event, arg) -> None:
+        profile = cProfile.Profile()
+        with self._lock:
+            self._workers.append((threading.current_thread(), profile))
+        profile.enable()
+
+    def start(self) -> None:
+        threading.setprofile(self._hook)
+        self.main.enable()
+
+    def stop(self) -> None:
+        self.main.disable()
+        threading.setprofile(None)
+
+    def stats(self) -> pstats.Stats:
+        """메인 스레드와 끝난 워커 스레드의 통계를 합친다 (아직 도는 스레드는 건너뜀)."""
+        stats = pstats.Stats(self.main)
+        with self._lock:
+            workers = list(self._workers)
+        running = 0
+        for thread, profile in workers:
+            if thread.is_alive():
+                running += 1
+                continue
+            stats.add(profile)
+        if running:
+            print(f"[WARN] 아직 실행 중인 스레드 {running}개의 프로파일은 합치지 않았습니다.")
+        return stats
+
+    @property
+    def thread_count(self) -> int:
+        return 1 + len(self._workers)
+
+
+class RssSampler:
+    """파이썬 프로세스와 브라우저 프로세스 RSS를 주기적으로 기록."""
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.samples: list[dict] = []
+        self.stage = ""
+        self.driver = None
+        self._start = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            browser_rss = None
+            rss_fn = getattr(self.driver, "browser_rss_mb", None)
+            if rss_fn is not None:
+                try:
+                    browser_rss = rss_fn()
+                except Exception:
+                    pass
+            self.samples.append(
+                {
+                    "t": round(time.monotonic() - self._start, 2),
+                    "stage": self.stage,
+                    "python_rss_mb": python_rss_mb(),
+                    "browser_rss_mb": browser_rss,
+                }
+            )
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class Profiler:
+    """
+    단계별 프로파일러. 옵션이 모두 꺼져 있으면 stage()는 아무것도 하지 않는다.
+
+        profiler = Profiler.from_args(args, OUTPUT_PATH)
+        with profiler.stage("listing"):
+            ...
+        profiler.finish()
+    """
+
+    def __init__(
+        self,
+        output_path: Path | None = None,
+        cpu: str | None = None,
+        memory: bool = False,
+        rss: bool = False,
+        sample_interval: float = 0.005,
+    ):
+        self.cpu = cpu
+        self.memory = memory
+        self.sample_interval = sample_interval
+        self.enabled = output_path is not None and bool(cpu or memory or rss)
+        self.out_dir = profile_dir(output_path) if output_path is not None else None
+        self.stages: dict[str, dict] = {}
+        self._rss = RssSampler() if self.enabled and rss else None
+
+        if self.enabled:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            if self._rss is not None:
+                self._rss.start()
+
+    @classmethod
+    def from_args(cls, args, output_path: Path) -> "Profiler":
+        return cls(
+            output_path,
+            cpu=args.profile_cpu,
+            memory=args.profile_memory,
+            rss=args.profile_rss,
+            sample_interval=args.sample_interval,
+        )
+
+    def watch_driver(self, driver) -> None:
+        """RSS 기록 대상 브라우저 지정 (ManagedDriver.browser_rss_mb 사용)."""
+        if self._rss is not None:
+            self._rss.driver = driver
+
+    @contextmanager
+    def stage(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        if self._rss is not None:
+            self._rss.stage = name
+        profile = ThreadProfiles() if self.cpu == "cprofile" else None
+        sampler = StackSampler(self.sample_interval) if self.cpu == "sample" else None
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        if self.memory:
+            tracemalloc.reset_peak()
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        if sampler is not None:
+            sampler.start()
+        if profile is not None:
+            profile.start()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.stop()
+            if sampler is not None:
+                sampler.stop()
+            info = {
+                "wall_sec": round(time.perf_counter() - wall_start, 3),
+                "cpu_sec": round(time.process_time() - cpu_start, 3),
+            }
+            if profile is not None:
+                info["profiled_threads"] = profile.thread_count
+                self._write_cprofile(name, profile.stats())
+            if sampler is not None:
+                sampler.write_collapsed(self.out_dir / f"{name}.collapsed.txt")
+            if self.memory:
+                info["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+                self._write_snapshot(name, tracemalloc.take_snapshot())
+            self.stages[name] = info
+            print(f"[PROFILE] {name}: {info}")
+
+    def _write_cprofile(self, name: str, stats: pstats.Stats) -> None:
+        stats.dump_stats(str(self.out_dir / f"{name}.prof"))
+        buffer = io.StringIO()
+        stats.stream = buffer
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        (self.out_dir / f"{name}.cprofile.txt").write_text(buffer.getvalue(), encoding="utf-8")
+
+    def _write_snapshot(self, name: str, snapshot: tracemalloc.Snapshot) -> None:
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        lines = [str(stat) for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]]
+        (self.out_dir / f"{name}.tracemalloc.txt").write_text("\n".join(lines), encoding="utf-8")
+
+    def finish(self) -> None:
+        """RSS 기록을 멈추고 요약(summary.json) 저장."""
+        if not self.enabled:
+            return
+        summary = {"stages": self.stages}
+        if self._rss is not None:
+            self._rss.stop()
+            summary["rss_samples"] = self._rss.samples
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        (self.out_dir / "summary.json").write_text(
+            json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        print(f"[PROFILE] 결과 저장: {self.out_dir.resolve()}")
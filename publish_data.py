@@ -0,0 +1,195 @@
+"""
+데이터 파일 게시 (바뀐 파일만 다시 쓰기)
+스크래퍼 / 카탈로그 내보내기 / 색인 생성이 매번 출력 JSON을 통째로 다시 쓰면
+내용이 같아도 Next.js가 전체를 다시 빌드하므로, 모든 출력은 이 모듈을 거쳐 씁니다.
+- 레코드 목록이면 레코드별 해시(키: url / id / name)로 지금 게시된 파일과 비교
+  (순서만 바뀐 경우도 변경 없음으로 보고 건너뜀)
+- 내용이 같으면 파일을 건드리지 않는다 (수정 시각도 그대로)
+- 쓸 때는 같은 폴더의 임시 파일에 쓴 뒤 os.replace로 바꿔치기 (읽는 쪽이 반쯤 쓴 파일을 보지 않는다)
+- 바뀐 내용은 publish_changelog.jsonl에 한 줄씩 (추가 / 삭제 / 수정 레코드와 필드별 변화)
+
+사용법:
+    python publish_data.py                # 최근 변경 기록 보기
+    python publish_data.py --limit 50
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+CHANGELOG_PATH = Path("publish_changelog.jsonl")
+RECORD_KEYS = ("url", "id", "name")
+HASH_LENGTH = 16
+# 변경 기록에 남길 값의 최대 길이 (긴 본문은 잘라서)
+MAX_VALUE_LENGTH = 200
+
+
+def serialize(data, minified: bool = False) -> bytes:
+    """저장 형식: 사람이 보는 파일은 indent=2, 사이트에서 내려받는 파일은 공백 없이."""
+    if minified:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def record_hash(record) -> str:
+    """키 순서와 무관한 레코드 해시."""
+    canonical = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+
+def record_key(records: list) -> str | None:
+    """레코드를 구분할 필드. 모든 레코드에 있고 값이 겹치지 않는 첫 필드, 없으면 None."""
+    if not records or not all(isinstance(r, dict) for r in records):
+        return None
+    for key in RECORD_KEYS:
+        values = [r.get(key) for r in records]
+        if None not in values and len(set(map(str, values))) == len(values):
+            return key
+    return None
+
+
+def flatten(record: dict, prefix: str = "") -> dict:
+    """{"attributes": {"제어력": {...}}} -> {"attributes.제어력.value": ...}. 목록은 통째로 비교."""
+    flat = {}
+    for key, value in record.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flat.update(flatten(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
+def _short(value):
+    text = json.dumps(value, ensure_ascii=False)
+    return value if len(text) <= MAX_VALUE_LENGTH else text[:MAX_VALUE_LENGTH] + "…"
+
+
+def field_deltas(old: dict, new: dict) -> dict:
+    """필드 경로 -> [이전 값, 새 값]. 없어진 / 새로 생긴 필드는 null."""
+    old_flat, new_flat = flatten(old), flatten(new)
+    return {
+        path: [_short(old_flat.get(path)), _short(new_flat.get(path))]
+        for path in sorted(old_flat.keys() | new_flat.keys())
+        if old_flat.get(path) != new_flat.get(path)
+    }
+
+
+def diff_records(old: list[dict], new: list[dict], key: str) -> dict:
+    """레코드 해시로 비교해 바뀐 레코드만 필드별로 자세히 본다."""
+    old_by_key = {str(r[key]): r for r in old}
+    new_by_key = {str(r[key]): r for r in new}
+    old_hashes = {k: record_hash(r) for k, r in old_by_key.items()}
+    new_hashes = {k: record_hash(r) for k, r in new_by_key.items()}
+    return {
+        "added": [k for k in new_by_key if k not in old_hashes],
+        "removed": [k for k in old_by_key if k not in new_hashes],
+        "modified": {
+            k: field_deltas(old_by_key[k], new_by_key[k])
+            for k in new_by_key
+            if k in old_hashes and old_hashes[k] != new_hashes[k]
+        },
+    }
+
+
+def atomic_write(path: Path, body: bytes) -> None:
+    """같은 폴더의 임시 파일에 쓰고 os.replace로 교체."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        Path(temp).unlink(missing_ok=True)
+        raise
+
+
+def read_published(path: Path):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def append_changelog(entry: dict, changelog: Path = CHANGELOG_PATH) -> None:
+    with open(changelog, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def publish_json(
+    path: Path,
+    data,
+    minified: bool = False,
+    changelog: Path | None = CHANGELOG_PATH,
+) -> dict | None:
+    """
+    data를 path에 게시. 내용이 바뀌지 않았으면 아무것도 쓰지 않고 None,
+    바뀌었으면 원자적으로 쓰고 변경 요약을 반환한다.
+    """
+    path = Path(path)
+    body = serialize(data, minified)
+    if path.exists() and path.read_bytes() == body:
+        print(f"[INFO] {path}: 변경 없음 (건너뜀)")
+        return None
+
+    published = read_published(path)
+    key = record_key(data) if isinstance(data, list) else None
+    if published is None:
+        change = {"created": True, "count": len(data) if isinstance(data, list) else 1}
+    elif key is not None and isinstance(published, list) and record_key(published) == key:
+        change = diff_records(published, data, key)
+        if not (change["added"] or change["removed"] or change["modified"]):
+            # 레코드는 같고 순서만 다르다: 다시 쓸 필요 없음
+            print(f"[INFO] {path}: 변경 없음 (순서만 다름, 건너뜀)")
+            return None
+    elif published == data:
+        # 형식(들여쓰기)만 다르다
+        print(f"[INFO] {path}: 변경 없음 (건너뜀)")
+        return None
+    else:
+        change = {"hash": [record_hash(published), record_hash(data)]}
+
+    atomic_write(path, body)
+    entry = {"time": datetime.now(timezone.utc).isoformat(timespec="seconds"), "path": path.as_posix(), **change}
+    if changelog is not None:
+        append_changelog(entry, changelog)
+    print(f"[INFO] {path}: {describe(entry)}")
+    return entry
+
+
+def describe(entry: dict) -> str:
+    if entry.get("created"):
+        return f"새로 씀 ({entry['count']}개)"
+    if "modified" in entry:
+        return f"추가 {len(entry['added'])} / 삭제 {len(entry['removed'])} / 수정 {len(entry['modified'])}"
+    return "내용 바뀜"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터 게시 변경 기록 보기")
+    parser.add_argument("--changelog", type=Path, default=CHANGELOG_PATH)
+    parser.add_argument("--limit", type=int, default=20, help="최근 몇 건을 볼지")
+    args = parser.parse_args()
+
+    if not args.changelog.exists():
+        print("[INFO] 변경 기록이 없습니다.")
+        return
+    lines = args.changelog.read_text(encoding="utf-8").splitlines()[-args.limit:]
+    for line in lines:
+        entry = json.loads(line)
+        print(f"{entry['time']}  {entry['path']}: {describe(entry)}")
+        for name, deltas in entry.get("modified", {}).items():
+            for field, (old, new) in deltas.items():
+                print(f"    {name} / {field}: {old} -> {new}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+AIMD 요청 속도 / 동시성 제어기
+고정된 REQUEST_DELAY 대신 서버 응답을 보고 속도를 조절합니다.
+- 응답이 빠르고 오류가 없으면 요청률과 동시성을 조금씩 올린다 (additive increase)
+- 429 / 5xx / 타임아웃 또는 지연 급증이 보이면 절반으로 줄인다 (multiplicative decrease)
+- 상한(max_rate / max_concurrency)을 넘지 않으므로 서버에 예의를 지킨다
+- 브라우저 렌더링처럼 서버 응답과 무관한 대기는 untimed()로 감싸 지연 측정에서 뺀다
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from retry_policy import classify_error
+
+# 스레드별로 slot() 안에서 지연 측정에서 뺄 시간(초)
+_untimed = threading.local()
+
+
+@contextmanager
+def untimed():
+    """
+    이 블록의 시간은 제어기의 응답 지연에 넣지 않는다.
+    브라우저 잠금 대기 / 렌더링은 서버가 느린 것이 아니므로 혼잡 신호가 되면 안 된다.
+    """
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        _untimed.seconds = getattr(_untimed, "seconds", 0.0) + time.monotonic() - start
+
+
+class AIMDController:
+    """요청 시작 간격(rate)과 동시 요청 수(concurrency)를 함께 조절."""
+
+    def __init__(
+        self,
+        initial_rate: float = 1.0,
+        min_rate: float = 0.2,
+        max_rate: float = 4.0,
+        max_concurrency: int = 4,
+        increase: float = 0.2,
+        decrease: float = 0.5,
+        latency_threshold: float = 3.0,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease = decrease
+        # 응답 지연이 이 값(초)을 넘으면 혼잡으로 본다
+        self.latency_threshold = latency_threshold
+
+        self.rate = min(max(initial_rate, min_rate), max_rate)
+        self.concurrency = 1.0
+        self.in_flight = 0
+        self.latency_ewma: float | None = None
+
+        self._next_start = 0.0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._counts = {"requests": 0, "increases": 0, "decreases": 0}
+
+    def acquire(self) -> None:
+        """동시성 한도 안에서 자리를 잡고, 요청률에 맞춰 시작 시각까지 대기."""
+        with self._cond:
+            while self.in_flight >= int(self.concurrency):
+                self._cond.wait()
+            self.in_flight += 1
+            start_at = max(time.monotonic(), self._next_start)
+            self._next_start = start_at + 1.0 / self.rate
+        delay = start_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def release(self, latency: float, ok: bool = True) -> None:
+        """요청 결과를 반영해 속도를 조절하고 자리를 반납."""
+        with self._cond:
+            self.in_flight -= 1
+            self._counts["requests"] += 1
+            self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+
+            now = time.monotonic()
+            if not ok or latency > self.latency_threshold:
+                # 같은 혼잡 구간에서 여러 번 깎지 않도록 한 번 줄인 뒤에는 지연 시간만큼 유예
+                if now - self._last_decrease > (self.latency_ewma or 0.0):
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self.concurrency = max(1.0, self.concurrency * self.decrease)
+                    self._last_decrease = now
+                    self._counts["decreases"] += 1
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+                # 동시성은 한 "윈도"(현재 동시성만큼의 응답)마다 1씩 증가
+                self.concurrency = min(float(self.max_concurrency), self.concurrency + 1.0 / self.concurrency)
+                self._counts["increases"] += 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """with controller.slot(): 블록 하나를 요청 하나로 계측."""
+        self.acquire()
+        _untimed.seconds = 0.0
+        start = time.monotonic()
+        ok = True
+        try:
+            yield
+        except Exception as exc:
+            # 일시적인 오류(429 / 5xx / 타임아웃)만 혼잡 신호로 본다
+            ok = not classify_error(exc)[0]
+            raise
+        finally:
+            self.release(max(0.0, time.monotonic() - start - _untimed.seconds), ok)
+
+    def wrap(self, fetch):
+        """fetch(url) 함수를 제어기를 거치도록 감싼다."""
+        def throttled(*args, **kwargs):
+            with self.slot():
+                return fetch(*args, **kwargs)
+        return throttled
+
+    def map(self, fn, items):
+        """
+        items에 fn을 최대 max_concurrency개 스레드로 적용.
+        입력 순서대로 (item, 결과, 예외) 를 돌려준다. 실제 동시 요청 수는 제어기가 제한한다.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            futures = [(item, pool.submit(fn, item)) for item in items]
+            for item, future in futures:
+                try:
+                    yield item, future.result(), None
+                except Exception as exc:
+                    yield item, None, exc
+
+    def snapshot(self) -> dict:
+        """실행 지표용 현재 상태."""
+        with self._cond:
+            return {
+                "rate_per_sec": round(self.rate, 3),
+                "concurrency": int(self.concurrency),
+                "in_flight": self.in_flight,
+                "latency_ewma_sec": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+                "max_rate_per_sec": self.max_rate,
+                "max_concurrency": self.max_concurrency,
+                **self._counts,
+            }
+
+
+class TokenBucket:
+    """
+    시간당 요청 예산. 초당 per_hour / 3600개씩 토큰이 차고, 최대 burst개까지 모아 둘 수 있다.
+    AIMD 제어기가 순간 속도를 맡고, 이 버킷은 장시간 실행의 총 요청 수를 제한한다.
+    per_hour가 None이면 예산 제한 없음 (토큰을 세기만 한다). 0 이하는 실수로 제한이 꺼지지 않도록 거부한다.
+    """
+
+    def __init__(self, per_hour: float | None, burst: float | None = None):
+        if per_hour is not None and per_hour <= 0:
+            raise ValueError(f"시간당 요청 수는 0보다 커야 합니다 (제한 없음은 None): {per_hour}")
+        self.enabled = per_hour is not None
+        self.rate = (per_hour or 0) / 3600.0
+        self.capacity = burst if burst is not None else max(1.0, (per_hour or 0) / 6)
+        self.tokens = self.capacity
+        self.spent = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self) -> float:
+        if not self.enabled:
+            return float("inf")
+        with self._lock:
+            self._refill()
+            return self.tokens
+
+    def acquire(self) -> None:
+        """토큰 하나를 쓸 수 있을 때까지 대기."""
+        while True:
+            with self._lock:
+                if not self.enabled:
+                    self.spent += 1
+                    return
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.spent += 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def wrap(self, fetch):
+        """fetch 호출마다 토큰 하나를 쓰도록 감싼다."""
+        def budgeted(*args, **kwargs):
+            self.acquire()
+            return fetch(*args, **kwargs)
+        return budgeted
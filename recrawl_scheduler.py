@@ -0,0 +1,303 @@
+"""
+신선도 기반 재크롤링 스케줄러 (상주 실행)
+URL마다 파싱한 스탯의 해시를 저장해 두고, 내용이 실제로 바뀌었는지에 따라 다시 방문할 간격을 조절합니다.
+- 바뀌었으면 간격을 절반으로, 그대로면 1.5배로 (MIN_INTERVAL ~ MAX_INTERVAL 범위)
+- 새로 발견된 URL(새 부착물 등)은 짧은 간격부터 시작
+- 전체 요청 수는 시간당 예산(토큰 버킷)을 넘지 않음
+바뀐 레코드만 카탈로그 DB에 upsert하고, 변경이 있었던 회차가 끝나면 사이트용 JSON을 다시 내보냅니다.
+
+사용법:
+    python recrawl_scheduler.py                 # 계속 실행
+    python recrawl_scheduler.py --once          # 지금 기한이 된 URL만 처리하고 종료
+    python recrawl_scheduler.py --status
+    python recrawl_scheduler.py --budget 120    # 시간당 요청 120개까지 (--no-budget: 예산 제한 끔)
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import time
+from pathlib import Path
+
+from catalog_store import DB_PATH, CatalogStore
+from fetcher import TieredFetcher
+from rate_control import AIMDController, TokenBucket
+from retry_policy import CircuitBreaker, RetryPolicy
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# 재방문 간격 범위와 조절 비율
+MIN_INTERVAL = 1 * HOUR
+MAX_INTERVAL = 14 * DAY
+NEW_URL_INTERVAL = 2 * HOUR
+INITIAL_INTERVAL = 1 * DAY
+CHANGED_FACTOR = 0.5
+UNCHANGED_FACTOR = 1.5
+# 요청이 실패한 URL은 간격을 바꾸지 않고 이 시간 뒤에 다시 시도
+FAILURE_RETRY = 30 * 60
+
+# 시간당 요청 예산 (목록 페이지 요청 포함)
+REQUESTS_PER_HOUR = 300
+# 목록 페이지를 다시 읽어 새 URL을 찾는 주기
+LISTING_INTERVAL = 6 * HOUR
+# 기한이 된 URL이 없을 때 최대 대기 시간
+MAX_IDLE = 5 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS url_freshness (
+    url TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    content_hash TEXT,
+    interval_sec REAL NOT NULL,
+    next_due REAL NOT NULL,
+    last_checked REAL,
+    last_changed REAL,
+    checks INTEGER NOT NULL DEFAULT 0,
+    changes INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_url_freshness_due ON url_freshness(next_due);
+"""
+
+
+def content_hash(record: dict | None) -> str:
+    """파싱 결과의 해시. 키 순서와 공백에 영향받지 않도록 정렬된 JSON으로 계산."""
+    canonical = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def differs_from_catalog(record: dict, stored: dict | None) -> bool:
+    """
+    스크래핑한 레코드가 카탈로그 행과 다른지. 카탈로그에 없으면 True.
+    스크래퍼가 채우지 않은 필드(None)는 비교하지 않고, 빈 목록 / 빈 값은 없는 것과 같게 본다.
+    """
+    if stored is None:
+        return True
+    return any(
+        (stored.get(key) or None) != (value or None) for key, value in record.items() if value is not None
+    )
+
+
+def next_interval(interval: float, changed: bool) -> float:
+    factor = CHANGED_FACTOR if changed else UNCHANGED_FACTOR
+    return min(MAX_INTERVAL, max(MIN_INTERVAL, interval * factor))
+
+
+class FreshnessTracker:
+    """url_freshness 테이블 (카탈로그 DB 안에 함께 저장)."""
+
+    def __init__(self, store: CatalogStore):
+        self.conn = store.conn
+        self.conn.executescript(SCHEMA)
+
+    def register(self, urls, kind: str, interval: float, spread: bool = False) -> int:
+        """처음 보는 URL 추가. spread=True면 첫 방문 시각을 간격 안에서 흩어 한꺼번에 몰리지 않게 한다."""
+        now = time.time()
+        rows = [
+            (url, kind, interval, now + (random.uniform(0, interval) if spread else 0))
+            for url in urls
+        ]
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO url_freshness (url, kind, interval_sec, next_due) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            return self.conn.total_changes - before
+
+    def next_due(self) -> dict | None:
+        """가장 기한이 많이 지난 URL."""
+        row = self.conn.execute(
+            "SELECT * FROM url_freshness ORDER BY next_due LIMIT 1"
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def record_check(self, row: dict, new_hash: str) -> bool:
+        """
+        방문 결과 반영. 내용이 바뀌었으면 True.
+        첫 방문(저장된 해시 없음)은 비교 기준만 기록하고 간격은 그대로 둔다 (변경으로 세지 않는다).
+        """
+        now = time.time()
+        if row["content_hash"] is None:
+            changed = False
+            interval = row["interval_sec"]
+        else:
+            changed = row["content_hash"] != new_hash
+            interval = next_interval(row["interval_sec"], changed)
+        with self.conn:
+            self.conn.execute(
+                """
+                UPDATE url_freshness SET content_hash = ?, interval_sec = ?, next_due = ?,
+                    last_checked = ?, last_changed = CASE WHEN ? THEN ? ELSE last_changed END,
+                    checks = checks + 1, changes = changes + ?
+                WHERE url = ?
+                """,
+                (new_hash, interval, now + interval, now, changed, now, int(changed), row["url"]),
+            )
+        return changed
+
+    def record_failure(self, row: dict) -> None:
+        with self.conn:
+            self.conn.execute(
+                "UPDATE url_freshness SET next_due = ?, last_checked = ? WHERE url = ?",
+                (time.time() + FAILURE_RETRY, time.time(), row["url"]),
+            )
+
+    def status(self) -> dict:
+        now = time.time()
+        row = self.conn.execute(
+            """
+            SELECT COUNT(*) AS urls, SUM(next_due <= ?) AS due,
+                MIN(interval_sec) AS min_interval, AVG(interval_sec) AS avg_interval,
+                MAX(interval_sec) AS max_interval, SUM(checks) AS checks, SUM(changes) AS changes
+            FROM url_freshness
+            """,
+            (now,),
+        ).fetchone()
+        return dict(row)
+
+
+class RecrawlScheduler:
+    """기한이 된 URL부터 하나씩 다시 스크래핑하고, 바뀐 레코드만 저장."""
+
+    def __init__(self, store: CatalogStore, per_hour: float | None = REQUESTS_PER_HOUR, http2: bool = False):
+        from work_queue import make_attachment_handler, make_weapon_handler
+
+        self.store = store
+        self.tracker = FreshnessTracker(store)
+        self.budget = TokenBucket(per_hour)
+        self.controller = AIMDController()
+        self.policy = RetryPolicy()
+        self.breaker = CircuitBreaker()
+        self.fetcher = TieredFetcher(http2=http2)
+        self.fetch = self.budget.wrap(self.controller.wrap(self.fetcher.fetch))
+        self.handlers = {
+            "weapon": make_weapon_handler(self.fetch),
+            "attachment": make_attachment_handler(self.fetch),
+        }
+        self.stats = {"checked": 0, "changed": 0, "failed": 0, "new_urls": 0}
+        self._last_listing = 0.0
+        self._dirty = False
+
+    def seed_from_catalog(self) -> None:
+        """카탈로그에 이미 있는 URL을 첫 방문 시각을 흩어서 등록."""
+        for kind, table in (("weapon", "weapons"), ("attachment", "attachments")):
+            urls = [row["url"] for row in self.store.conn.execute(f"SELECT url FROM {table}")]
+            self.tracker.register(urls, kind, INITIAL_INTERVAL, spread=True)
+
+    def refresh_listings(self) -> None:
+        """목록 페이지에서 새 URL을 찾아 짧은 간격으로 등록."""
+        from scrape_data import LISTING_URL, parse_links_from_html
+        from scrape_weapons import collect_weapon_links
+
+        found = {
+            "weapon": lambda: collect_weapon_links(self.fetch, self.policy),
+            # 부착물 목록은 무한 스크롤이지만 상주 실행에서는 처음 렌더링된 부분만 본다
+            "attachment": lambda: parse_links_from_html(self.fetch(LISTING_URL, "listing")),
+        }
+        for kind, collect in found.items():
+            try:
+                added = self.tracker.register(collect(), kind, NEW_URL_INTERVAL)
+            except Exception as exc:
+                print(f"[WARN] {kind} 목록 갱신 실패: {exc}")
+                continue
+            if added:
+                print(f"[INFO] 새 {kind} URL {added}개 발견")
+                self.stats["new_urls"] += added
+        self._last_listing = time.time()
+
+    def check(self, row: dict) -> None:
+        handle = self.handlers[row["kind"]]
+        url = row["url"]
+        try:
+            record = self.policy.call(lambda: handle(url), url, self.breaker)
+        except Exception as exc:
+            print(f"  -> [FAILED] {url}: {exc}")
+            self.tracker.record_failure(row)
+            self.stats["failed"] += 1
+            return
+
+        self.stats["checked"] += 1
+        baseline = row["content_hash"] is None
+        if self.tracker.record_check(row, content_hash(record)):
+            self.stats["changed"] += 1
+            print(f"  -> [CHANGED] {url}")
+        elif not baseline:
+            return
+        elif record is None or not differs_from_catalog(record, self._stored(row["kind"], url)):
+            # 첫 방문: 해시는 기준으로만 쓰지만, 카탈로그 행이 이미 낡았으면 바로 반영한다
+            return
+        if record is None:
+            return
+        if baseline:
+            print(f"  -> [STALE] {url}: 카탈로그와 다름")
+        if row["kind"] == "weapon":
+            self.store.upsert_weapons([record])
+        else:
+            self.store.upsert_attachments([record])
+        self._dirty = True
+
+    def _stored(self, kind: str, url: str) -> dict | None:
+        """카탈로그에 저장된 레코드 (목록에서 새로 찾은 URL이면 None)."""
+        if kind == "weapon":
+            return self.store.weapon_by_url(url)
+        return self.store.attachment_by_url(url)
+
+    def flush(self) -> None:
+        """변경이 있었으면 사이트용 JSON 다시 내보내기."""
+        if self._dirty:
+            self.store.export_json()
+            self._dirty = False
+
+    def run(self, once: bool = False) -> None:
+        self.seed_from_catalog()
+        try:
+            while True:
+                if time.time() - self._last_listing >= LISTING_INTERVAL:
+                    self.refresh_listings()
+
+                row = self.tracker.next_due()
+                wait = MAX_IDLE if row is None else row["next_due"] - time.time()
+                if wait > 0:
+                    # 기한이 된 URL을 다 처리했으면 결과를 내보내고 대기
+                    self.flush()
+                    if once:
+                        break
+                    time.sleep(min(wait, MAX_IDLE))
+                    continue
+                self.check(row)
+        finally:
+            self.flush()
+            self.fetcher.close()
+            print(f"[INFO] 스케줄러 종료: {self.stats} / 사용한 요청 예산: {self.budget.spent}")
+
+
+def positive_float(text: str) -> float:
+    """--budget 값. 0은 "보내지 않음"으로 읽히기 쉬우므로 받지 않고, 제한을 끄려면 --no-budget을 쓴다."""
+    value = float(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"0보다 커야 합니다: {text} (제한을 끄려면 --no-budget)")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="신선도 기반 재크롤링 스케줄러")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="카탈로그 SQLite 파일 경로")
+    parser.add_argument("--budget", type=positive_float, default=REQUESTS_PER_HOUR, help="시간당 요청 수 상한 (0보다 커야 함)")
+    parser.add_argument("--no-budget", action="store_true", help="시간당 요청 예산을 끈다 (순간 속도는 AIMD가 계속 제한)")
+    parser.add_argument("--once", action="store_true", help="기한이 된 URL만 처리하고 종료")
+    parser.add_argument("--status", action="store_true", help="URL별 신선도 통계만 출력")
+    parser.add_argument("--http2", action="store_true", help="httpx[http2]가 설치돼 있으면 HTTP/2 사용")
+    args = parser.parse_args()
+
+    with CatalogStore(args.db) as store:
+        if args.status:
+            print(FreshnessTracker(store).status())
+            return
+        per_hour = None if args.no_budget else args.budget
+        RecrawlScheduler(store, per_hour=per_hour, http2=args.http2).run(once=args.once)
+
+
+if __name__ == "__main__":
+    main()
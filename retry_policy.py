@@ -0,0 +1,205 @@
+"""
+재시도 정책
+- 일시적인 오류(429 / 5xx / 타임아웃 / 연결 오류)는 지수 백오프 + 지터로 재시도하고,
+  Retry-After 헤더가 있으면 그 값을 따릅니다.
+- 호스트별 서킷 브레이커: 최근 오류율이 치솟으면 잠시 크롤링을 멈춥니다.
+- 끝내 실패한 URL은 dead-letter 목록에 모아 다음 패스에서 다시 시도합니다.
+"""
+
+import json
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException
+from urllib3.exceptions import MaxRetryError, ProtocolError
+
+from http_session import TRANSPORT_ERRORS
+
+# 재시도할 HTTP 상태 코드
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+# 응답 없이 실패한 경우 중 재시도할 예외들.
+# WebDriverException 전체는 넣지 않는다: 잘못된 셀렉터 / 세션 생성 실패 같은 영구 오류까지 재시도하게 된다.
+# 드라이버 쪽은 타임아웃, 브라우저가 죽어 끊긴 세션, chromedriver와의 연결 오류(urllib3)만 재시도.
+RETRYABLE_EXCEPTIONS = TRANSPORT_ERRORS + (
+    TimeoutError,
+    ConnectionError,
+    TimeoutException,
+    InvalidSessionIdException,
+    MaxRetryError,
+    ProtocolError,
+)
+
+# Retry-After가 너무 길면 이 값으로 자른다 (초)
+MAX_RETRY_AFTER = 300.0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def classify_error(exc: Exception) -> tuple[bool, float | None]:
+    """(재시도 여부, Retry-After 초) 반환."""
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        return status in RETRYABLE_STATUS, retry_after
+    return isinstance(exc, RETRYABLE_EXCEPTIONS), None
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+class CircuitBreaker:
+    """
+    호스트별 서킷 브레이커.
+    최근 window개 요청 중 오류 비율이 threshold 이상이면 cooldown 동안 요청을 막고(크롤링 일시 정지),
+    이후 한 번 시험 요청을 보내 성공하면 다시 연다.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        threshold: float = 0.5,
+        min_requests: int = 5,
+        cooldown: float = 60.0,
+    ):
+        self.window = window
+        self.threshold = threshold
+        self.min_requests = min_requests
+        self.cooldown = cooldown
+
+        self._outcomes: dict[str, deque] = {}
+        self._open_until: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.trips = 0
+
+    def before_request(self, url: str) -> None:
+        """서킷이 열려 있으면 닫힐 때까지 대기."""
+        host = host_of(url)
+        with self._lock:
+            wait = self._open_until.get(host, 0.0) - time.time()
+        if wait > 0:
+            print(f"  -> [PAUSE] {host} 오류율 급증, {wait:.0f}초 동안 크롤링 일시 정지")
+            time.sleep(wait)
+
+    def record(self, url: str, ok: bool) -> None:
+        """요청 결과 기록. 오류율이 기준을 넘으면 서킷을 연다."""
+        host = host_of(url)
+        with self._lock:
+            outcomes = self._outcomes.setdefault(host, deque(maxlen=self.window))
+            outcomes.append(ok)
+            if ok or len(outcomes) < self.min_requests:
+                return
+            error_rate = outcomes.count(False) / len(outcomes)
+            if error_rate >= self.threshold and self._open_until.get(host, 0.0) <= time.time():
+                self._open_until[host] = time.time() + self.cooldown
+                self.trips += 1
+                # 재개 후에는 새로 측정한다 (반열림 상태)
+                outcomes.clear()
+
+
+class RetryPolicy:
+    """지수 백오프 + full jitter 재시도."""
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """attempt번째(0부터) 실패 후 대기 시간."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, fn, url: str, breaker: CircuitBreaker | None = None):
+        """fn()을 실행하고, 일시적인 오류면 재시도. 끝내 실패하면 마지막 예외를 그대로 올린다."""
+        for attempt in range(self.max_attempts):
+            if breaker is not None:
+                breaker.before_request(url)
+            try:
+                result = fn()
+            except Exception as exc:
+                retryable, retry_after = classify_error(exc)
+                if breaker is not None and retryable:
+                    breaker.record(url, ok=False)
+                if not retryable or attempt + 1 >= self.max_attempts:
+                    exc.attempts = attempt + 1
+                    raise
+                delay = min(retry_after, MAX_RETRY_AFTER) if retry_after is not None else self.backoff(attempt)
+                print(f"  -> [RETRY] {attempt + 1}/{self.max_attempts} 실패, {delay:.1f}초 후 재시도: {exc}")
+                time.sleep(delay)
+            else:
+                if breaker is not None:
+                    breaker.record(url, ok=True)
+                return result
+
+
+def dead_letter_path(output_path: Path) -> Path:
+    """출력 파일 경로에 대응하는 dead-letter 파일 경로."""
+    return output_path.with_name(f"{output_path.stem}.dead_letters.json")
+
+
+class DeadLetterQueue:
+    """끝내 실패한 URL 목록. JSON 파일로 저장해 다음 패스에서 다시 시도한다."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> "DeadLetterQueue":
+        queue = cls(path)
+        if path.exists():
+            for entry in json.loads(path.read_text(encoding="utf-8")):
+                queue.entries[entry["url"]] = entry
+        return queue
+
+    def add(self, url: str, exc: Exception) -> None:
+        with self._lock:
+            self.entries[url] = {
+                "url": url,
+                "error": f"{type(exc).__name__}: {exc}",
+                "attempts": getattr(exc, "attempts", 1),
+                "failed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+
+    def remove(self, url: str) -> None:
+        with self._lock:
+            self.entries.pop(url, None)
+
+    def urls(self) -> list[str]:
+        return list(self.entries)
+
+    def save(self) -> None:
+        """남은 항목 저장. 비어 있으면 파일을 지운다."""
+        if not self.entries:
+            self.path.unlink(missing_ok=True)
+            return
+        self.path.write_text(
+            json.dumps(list(self.entries.values()), ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,19 @@
+"""
+스크래퍼 실행 결과 지표를 출력 JSON 옆에 저장합니다.
+예: weapons_data.json -> weapons_data.metrics.json
+"""
+
+import json
+from pathlib import Path
+
+
+def metrics_path(output_path: Path) -> Path:
+    """출력 파일 경로에 대응하는 지표 파일 경로."""
+    return output_path.with_name(f"{output_path.stem}.metrics.json")
+
+
+def write_run_metrics(output_path: Path, metrics: dict) -> Path:
+    """지표 딕셔너리를 JSON으로 저장하고 경로를 반환."""
+    path = metrics_path(output_path)
+    path.write_text(json.dumps(metrics, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
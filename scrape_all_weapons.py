@@ -10,10 +10,18 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+import argparse
 import time
-import json
 import re
+from pathlib import Path
+
+from catalog_store import CatalogStore
+from driver_manager import DriverHung, ManagedDriver
+from fetcher import wait_for_page
+from hybrid_session import wait_for_challenge
+from link_stream import iter_anchors
+from profiling import Profiler, add_profiling_args
+from publish_data import publish_json
 
 # 카테고리 매핑 (영어 -> 한국어)
 CATEGORY_MAP = {
@@ -31,15 +39,19 @@ CATEGORY_MAP = {
 
 BASE_URL = "https://deltaforcetools.gg"
 WEAPON_LIST_URL = "https://deltaforcetools.gg/wiki/weapon/all"
+OUTPUT_PATH = Path("weapons_list.json")
 
-def setup_driver():
-    """Selenium 드라이버 설정"""
+def create_chrome():
+    """Selenium Chrome 드라이버 생성"""
     options = Options()
     # options.add_argument("--headless")  # 필요시 주석 해제
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
-    driver = webdriver.Chrome(options=options)
-    return driver
+    return webdriver.Chrome(options=options)
+
+def setup_driver():
+    """Selenium 드라이버 설정 (타임아웃 / 워치독 / 주기적 재시작 적용)"""
+    return ManagedDriver(create_chrome)
 
 def parse_weapon_name_and_category(full_text):
     """총기 이름과 카테고리를 파싱합니다.
@@ -89,17 +101,58 @@ def parse_weapon_name_and_category(full_text):
     
     return weapon_name, found_category_kr
 
+def weapon_hrefs(html):
+    """목록 HTML의 총기 상세 링크 집합 (페이지가 넘어갔는지 비교용)."""
+    return {link.href for link in iter_anchors(html) if "/wiki/weapon/" in link.href}
+
+def wait_for_next_page(driver, before, timeout=15.0, poll=0.25):
+    """
+    클릭 페이지네이션은 URL이 그대로라 이전 페이지도 목록 검사를 통과하므로,
+    총기 링크 목록이 클릭 전(before)과 달라지고 목록 검사를 통과할 때까지 폴링. 마지막 HTML 반환.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        html = wait_for_page(driver, "listing", timeout=max(0.0, deadline - time.monotonic()), poll=poll)
+        if weapon_hrefs(html) != before or time.monotonic() >= deadline:
+            return html
+        time.sleep(poll)
+
+def replay_pages(driver, page):
+    """드라이버가 교체되어 목록 첫 페이지로 돌아갔을 때 Next를 눌러 page까지 다시 이동. 성공하면 True."""
+    wait_for_page(driver, "listing")
+    for current in range(1, page):
+        buttons = driver.find_elements(By.XPATH, "//a[contains(text(), 'Next') or contains(text(), '다음')]")
+        enabled = [
+            b for b in buttons
+            if "disabled" not in (b.get_attribute("class") or "").lower() and b.get_attribute("aria-disabled") != "true"
+        ]
+        if not enabled:
+            print(f"  -> [WARN] {current}페이지에서 다음 버튼이 없어 위치를 복구하지 못했습니다.")
+            return False
+        before = weapon_hrefs(driver.page_source)
+        try:
+            driver.guard(enabled[0].click)
+        except DriverHung:
+            return False
+        wait_for_next_page(driver, before)
+        driver.mark_page()
+    return True
+
 def get_all_weapon_links(driver):
     """모든 페이지에서 총기 링크를 수집합니다."""
     print("총기 목록 페이지 접속 중...")
     driver.get(WEAPON_LIST_URL)
-    print("페이지 로딩 대기 중... (10초)")
-    time.sleep(10)  # 페이지 로딩 대기 (CAPTCHA 해결 시간 포함)
+    print("페이지 로딩 대기 중... (CAPTCHA가 뜨면 직접 해결)")
+    # 고정 10초 대신 봇 체크 통과 후 목록이 채워지는 즉시 진행
+    wait_for_challenge(driver)
+    wait_for_page(driver, "listing")
     
     all_weapons = []
     page = 1
     max_pages = 10  # 최대 페이지 수 (안전장치)
+    hangs = 0
     
+    # 클릭 페이지네이션은 URL이 바뀌지 않으므로 호출한 쪽에서 driver.pinned()로 재시작(recycle)을 막는다
     while page <= max_pages:
         print(f"\n{'='*60}")
         print(f"페이지 {page} 처리 중...")
@@ -114,23 +167,18 @@ def get_all_weapon_links(driver):
             print(f"페이지 로딩 타임아웃: {e}")
             break
         
-        # 현재 페이지 HTML 파싱
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        
         # 디버깅: 페이지 제목 확인
         page_title = driver.title
         print(f"현재 페이지 제목: {page_title}")
         
-        # 모든 링크 찾기
-        all_links = soup.find_all("a", href=True)
-        print(f"발견된 링크 수: {len(all_links)}")
-        
         page_weapons = []
+        link_count = 0
         
-        # 모든 링크 검사
-        for link in all_links:
-            href = link.get("href", "")
-            text = link.get_text(strip=True)
+        # 모든 링크 검사 (트리를 만들지 않고 HTML을 조각 단위로 읽으며 추출)
+        for link in iter_anchors(driver.page_source):
+            link_count += 1
+            href = link.href
+            text = link.stripped_text
             
             # /wiki/weapon/ 패턴 확인
             if "/wiki/weapon/" in href:
@@ -181,6 +229,7 @@ def get_all_weapon_links(driver):
             if weapon not in all_weapons:
                 all_weapons.append(weapon)
         
+        print(f"발견된 링크 수: {link_count}")
         print(f"\n페이지 {page} 요약:")
         print(f"  - 이번 페이지에서 발견: {len(page_weapons)}개")
         print(f"  - 누적 총기 수: {len(all_weapons)}개")
@@ -197,11 +246,21 @@ def get_all_weapon_links(driver):
                 
                 if "disabled" not in class_attr.lower() and aria_disabled != "true":
                     print("\n다음 페이지로 이동 중...")
-                    next_button.click()
-                    time.sleep(5)  # 페이지 로딩 대기
+                    before = weapon_hrefs(driver.page_source)
+                    driver.guard(next_button.click)
+                    wait_for_next_page(driver, before)  # 페이지 로딩 대기
+                    driver.mark_page()
                     next_found = True
                     page += 1
                     break
+        except DriverHung:
+            # 워치독이 드라이버를 교체해 첫 페이지로 돌아갔다 (들고 있던 버튼 요소도 무효)
+            hangs += 1
+            if hangs > 3 or not replay_pages(driver, page):
+                print("\n드라이버 교체 후 목록 위치를 복구하지 못했습니다. 종료합니다.")
+                break
+            print(f"  -> [WATCHDOG] 페이지 {page}까지 다시 이동했습니다.")
+            continue
         except Exception as e:
             print(f"Next 버튼 클릭 실패: {e}")
         
@@ -212,10 +271,19 @@ def get_all_weapon_links(driver):
                 page_links = driver.find_elements(By.XPATH, f"//a[text()='{next_page_num}']")
                 if page_links:
                     print(f"\n페이지 {next_page_num}로 이동 중...")
-                    page_links[0].click()
-                    time.sleep(5)
+                    before = weapon_hrefs(driver.page_source)
+                    driver.guard(page_links[0].click)
+                    wait_for_next_page(driver, before)
+                    driver.mark_page()
                     page += 1
                     next_found = True
+            except DriverHung:
+                hangs += 1
+                if hangs > 3 or not replay_pages(driver, page):
+                    print("\n드라이버 교체 후 목록 위치를 복구하지 못했습니다. 종료합니다.")
+                    break
+                print(f"  -> [WATCHDOG] 페이지 {page}까지 다시 이동했습니다.")
+                continue
             except Exception as e:
                 print(f"페이지 번호 클릭 실패: {e}")
         
@@ -225,9 +293,12 @@ def get_all_weapon_links(driver):
     
     return all_weapons
 
-def scrape_all_weapons():
+def scrape_all_weapons(profiler=None):
     """모든 총기 정보를 수집합니다."""
+    if profiler is None:
+        profiler = Profiler()
     driver = setup_driver()
+    profiler.watch_driver(driver)
     
     try:
         print("=" * 60)
@@ -235,7 +306,9 @@ def scrape_all_weapons():
         print("=" * 60)
         
         # 모든 총기 정보 수집
-        weapons = get_all_weapon_links(driver)
+        # 목록을 클릭으로 넘기는 동안에는 드라이버를 재시작하지 않는다
+        with profiler.stage("listing"), driver.pinned():
+            weapons = get_all_weapon_links(driver)
         
         return weapons
         
@@ -243,17 +316,24 @@ def scrape_all_weapons():
         print("\n브라우저 종료 중...")
         driver.quit()
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="델타포스 모든 총기 정보 스크래퍼")
+    add_profiling_args(parser)
+    args = parser.parse_args()
+    profiler = Profiler.from_args(args, OUTPUT_PATH)
+
     try:
-        weapons = scrape_all_weapons()
+        weapons = scrape_all_weapons(profiler)
         
         # 카테고리별로 정렬
         weapons_sorted = sorted(weapons, key=lambda x: (x["category"], x["name"]))
         
         # JSON 파일로 저장
-        output_file = "weapons_list.json"
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(weapons_sorted, f, ensure_ascii=False, indent=2)
+        output_file = OUTPUT_PATH
+        with profiler.stage("write"):
+            publish_json(output_file, weapons_sorted)
+            with CatalogStore() as store:
+                store.upsert_weapons(weapons_sorted)
         
         print("\n" + "=" * 60)
         print("스크래핑 완료!")
@@ -283,3 +363,9 @@ if __name__ == "__main__":
         print(f"\n❌ 오류 발생: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        profiler.finish()
+
+
+if __name__ == "__main__":
+    main()
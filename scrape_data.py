@@ -1,21 +1,34 @@
-import json
+import argparse
 import re
 import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, List
 
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
 from urllib.parse import unquote
 
+from catalog_store import CatalogStore
+from attachment_parsing import parse_compatible_weapons, parse_type_from_lines
+from driver_manager import ManagedDriver
+from fetcher import TieredFetcher, page_image, page_text, wait_for_page
+from link_stream import iter_anchors
+from profiling import Profiler, add_profiling_args
+from publish_data import publish_json
+from rate_control import AIMDController
+from retry_policy import CircuitBreaker, DeadLetterQueue, RetryPolicy, dead_letter_path
+from run_metrics import write_run_metrics
+from work_queue import WorkQueue, run_worker
+
 
 BASE_URL = "https://deltaforcetools.gg"
 LISTING_URL = f"{BASE_URL}/wiki/attachment/mag"
+LISTING_CATEGORY = LISTING_URL.rstrip("/").split("/")[-1]
 OUTPUT_PATH = Path("attachments_data.json")
+DEAD_LETTER_PATH = dead_letter_path(OUTPUT_PATH)
 
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -23,7 +36,9 @@ USER_AGENT = (
     "Chrome/120.0.0.0 Safari/537.36"
 )
 
-REQUEST_DELAY = 1.0
+# 요청 속도 상한 (AIMD 제어기가 이 범위 안에서 자동 조절)
+MAX_REQUEST_RATE = 4.0  # 초당 요청 수
+MAX_CONCURRENCY = 4
 
 # 1. URL 필터링용 블랙리스트 (마지막 세그먼트 기준)
 BLOCKED_LAST_WORDS = [
@@ -96,12 +111,12 @@ def is_blocked_url(url: str) -> bool:
 
 def parse_links_from_listing(html: str) -> List[str]:
     """목록 페이지 HTML에서 부착물 상세 페이지 URL 수집 (1차 필터 포함)."""
-    soup = BeautifulSoup(html, "html.parser")
     links: List[str] = []
     seen = set()
 
-    for a in soup.select("a[href*='/wiki/attachment/']"):
-        href = a.get("href")
+    # 트리를 만들지 않고 HTML을 조각 단위로 읽으며 링크만 추출
+    for a in iter_anchors(html, "/wiki/attachment/"):
+        href = a.href
         if not href:
             continue
 
@@ -153,93 +168,168 @@ def parse_stats_from_body_text(body_text: str) -> Dict[str, str]:
     return stats
 
 
-def scrape_attachment(driver: webdriver.Chrome, url: str) -> Dict[str, Dict]:
+def scrape_attachment(fetch: Callable[[str, str], str], url: str) -> Dict[str, Dict]:
     """단일 부착물 페이지에서 이름과 스탯 파싱."""
     # URL 블랙리스트 재확인 (방어적 체크)
     if is_blocked_url(url):
         raise ValueError(f"블랙리스트 URL: {url}")
 
-    driver.get(url)
-    time.sleep(REQUEST_DELAY * 2)
+    # HTTP 우선, 스탯이 없는 페이지만 브라우저로 렌더링
+    html = fetch(url, "attachment")
 
     # 이름: h1 텍스트 기준
-    html = driver.page_source
     soup = BeautifulSoup(html, "html.parser")
     title_el = soup.find("h1")
     name = title_el.get_text(strip=True) if title_el else url.split("/")[-1]
 
-    # 전체 텍스트에서 스탯 파싱
-    body_text = driver.find_element(By.TAG_NAME, "body").text
+    # 전체 텍스트에서 스탯 / 종류 파싱
+    body_text = page_text(soup)
     stats = parse_stats_from_body_text(body_text)
 
-    return {"name": name, "url": url, "stats": stats}
+    return {
+        "name": name,
+        "url": url,
+        "stats": stats,
+        "type": parse_type_from_lines(body_text.splitlines()),
+        "compatible": parse_compatible_weapons(soup),
+        "image": page_image(soup, name, url),
+    }
 
 
 def main():
-    driver = create_driver()
+    parser = argparse.ArgumentParser(description="델타포스 부착물 스크래퍼")
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        help="작업 큐 워커로 실행 (SQLite 큐 파일 경로, seed / collect는 work_queue.py 사용)",
+    )
+    add_profiling_args(parser)
+    args = parser.parse_args()
+
+    if args.queue is not None:
+        controller = AIMDController(max_rate=MAX_REQUEST_RATE, max_concurrency=MAX_CONCURRENCY)
+        with WorkQueue(args.queue) as queue:
+            summary = run_worker(queue, "attachment", controller=controller)
+            print(f"[INFO] 워커 종료: {summary} / 큐 상태: {queue.counts('attachment')}")
+        return
+    profiler = Profiler.from_args(args, OUTPUT_PATH)
+
+    # 타임아웃 / 워치독 / 주기적 재시작으로 Chrome 메모리 증가와 멈춤을 막는다
+    driver = ManagedDriver(create_driver)
+    profiler.watch_driver(driver)
+    fetcher = None
     try:
-        print("[INFO] 목록 페이지 접속:", LISTING_URL)
-        driver.get(LISTING_URL)
-        time.sleep(3)
-        scroll_to_bottom(driver, pause=1.0, max_tries=10)
-
-        listing_html = driver.page_source
-        links = parse_links_from_listing(listing_html)
-        print(f"[INFO] 1차 필터링 후 링크 수: {len(links)}")
+        with profiler.stage("listing"):
+            print("[INFO] 목록 페이지 접속:", LISTING_URL)
+            driver.get(LISTING_URL)
+            wait_for_page(driver, "listing")
+            scroll_to_bottom(driver, pause=1.0, max_tries=10)
+
+            listing_html = driver.page_source
+            links = parse_links_from_listing(listing_html)
+            print(f"[INFO] 1차 필터링 후 링크 수: {len(links)}")
+
+        # 목록 페이지를 연 브라우저의 쿠키로 상세 페이지는 HTTP부터 시도
+        fetcher = TieredFetcher(driver=driver)
+        fetcher.sync_cookies()
+
+        # 일시적인 오류는 재시도, 끝내 실패한 URL은 다음 실행에서 다시 시도
+        policy = RetryPolicy()
+        breaker = CircuitBreaker()
+        dead_letters = DeadLetterQueue.load(DEAD_LETTER_PATH)
+        links += [url for url in dead_letters.urls() if url not in links]
+        controller = AIMDController(max_rate=MAX_REQUEST_RATE, max_concurrency=MAX_CONCURRENCY)
+        fetch = controller.wrap(fetcher.fetch)
 
         results: List[Dict] = []
 
-        for idx, url in enumerate(links, start=1):
-            print(f"\n[INFO] ({idx}/{len(links)}) 대상 URL:", url)
+        # 2차 방어적 URL 필터링
+        for url in [url for url in links if is_blocked_url(url)]:
+            print(f"[INFO] [SKIP] 블랙리스트 URL (마지막 단어 필터): {url}")
+        links = [url for url in links if not is_blocked_url(url)]
 
-            # 2차 방어적 URL 필터링
-            if is_blocked_url(url):
-                print("  -> [SKIP] 블랙리스트 URL (마지막 단어 필터)")
-                continue
+        def scrape_one(url: str) -> Dict:
+            return policy.call(lambda: scrape_attachment(fetch, url), url, breaker)
 
-            try:
-                record = scrape_attachment(driver, url)
+        with profiler.stage("details"):
+            for idx, (url, record, error) in enumerate(controller.map(scrape_one, links), start=1):
+                print(f"\n[INFO] ({idx}/{len(links)}) 대상 URL:", url)
+
+                if error is not None:
+                    print(f"  -> [ERROR] 크롤링 실패, dead-letter 목록에 추가: {error}")
+                    dead_letters.add(url, error)
+                    continue
+
+                dead_letters.remove(url)
                 if not record["stats"]:
                     print("  -> [SKIP] 스탯 없음")
                     continue
 
                 print(f"  -> [OK] {record['name']} / 스탯 {len(record['stats'])}개")
                 results.append(record)
-            except Exception as exc:
-                print(f"  -> [ERROR] 크롤링 실패: {exc}")
-
-            time.sleep(REQUEST_DELAY)
 
-        OUTPUT_PATH.write_text(
-            json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8"
+        with profiler.stage("write"):
+            publish_json(OUTPUT_PATH, results)
+            with CatalogStore() as store:
+                store.upsert_attachments(results, category=LISTING_CATEGORY)
+        dead_letters.save()
+        write_run_metrics(
+            OUTPUT_PATH,
+            {
+                "tiers": fetcher.summary(),
+                "tier_log": fetcher.tier_log,
+                "dead_letters": len(dead_letters),
+                "rate": controller.snapshot(),
+                "driver": driver.stats,
+            },
         )
+        print(f"[INFO] 단계별 처리 수: {fetcher.summary()}")
+        if dead_letters:
+            print(f"[WARN] 실패한 URL {len(dead_letters)}개는 다음 실행에서 다시 시도합니다: {DEAD_LETTER_PATH}")
         print(
             f"\n[INFO] 완료: 유효한 부착물 {len(results)}개를 {OUTPUT_PATH.resolve()} 에 저장했습니다."
         )
     finally:
+        # 중간에 실패해도 HTTP 세션의 커넥션 풀은 닫는다
+        if fetcher is not None:
+            fetcher.close()
         driver.quit()
+        profiler.finish()
 
 
 if __name__ == "__main__":
     main()
 
-import json
+import argparse
 import re
 import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, List
 
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+from catalog_store import CatalogStore
+from attachment_parsing import parse_compatible_weapons, parse_type_from_lines
+from driver_manager import ManagedDriver
+from fetcher import TieredFetcher, page_image, page_text, wait_for_page
+from link_stream import iter_anchors
+from profiling import Profiler, add_profiling_args
+from publish_data import publish_json
+from rate_control import AIMDController
+from retry_policy import CircuitBreaker, DeadLetterQueue, RetryPolicy, dead_letter_path
+from run_metrics import write_run_metrics
+from work_queue import WorkQueue, run_worker
+
 
 BASE_URL = "https://deltaforcetools.gg"
 LISTING_URL = f"{BASE_URL}/wiki/attachment/mag"
+LISTING_CATEGORY = LISTING_URL.rstrip("/").split("/")[-1]
 OUTPUT_PATH = Path("attachments_data.json")
+DEAD_LETTER_PATH = dead_letter_path(OUTPUT_PATH)
 
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -247,7 +337,9 @@ USER_AGENT = (
     "Chrome/120.0.0.0 Safari/537.36"
 )
 
-REQUEST_DELAY = 1.0
+# 요청 속도 상한 (AIMD 제어기가 이 범위 안에서 자동 조절)
+MAX_REQUEST_RATE = 4.0  # 초당 요청 수
+MAX_CONCURRENCY = 4
 
 # URL/텍스트 기준으로 제외할 카테고리 이름들
 CATEGORY_NAMES = {
@@ -305,13 +397,12 @@ def scroll_to_bottom(driver: webdriver.Chrome, pause: float = 1.0, max_tries: in
 
 def parse_links_from_html(html: str) -> List[str]:
     """목록 페이지 HTML에서 아이템(탄창) 상세 링크 목록 추출."""
-    soup = BeautifulSoup(html, "html.parser")
     links: List[str] = []
     seen = set()
 
-    # attachment 관련 링크를 폭넓게 수집
-    for a in soup.select("a[href*='/wiki/attachment/']"):
-        href = a.get("href")
+    # attachment 관련 링크를 폭넓게 수집 (트리 없이 스트리밍 파싱)
+    for a in iter_anchors(html, "/wiki/attachment/"):
+        href = a.href
         if not href:
             continue
 
@@ -323,7 +414,7 @@ def parse_links_from_html(html: str) -> List[str]:
             continue
 
         # 텍스트가 카테고리 이름과 동일한 경우도 제외
-        text = (a.get_text() or "").strip().lower()
+        text = a.text.strip().lower()
         if text in CATEGORY_NAMES:
             continue
 
@@ -372,19 +463,17 @@ def parse_stats_from_lines(lines: List[str]) -> Dict[str, str]:
     return stats
 
 
-def scrape_attachment(driver: webdriver.Chrome, url: str) -> Dict:
+def scrape_attachment(fetch: Callable[[str, str], str], url: str) -> Dict:
     """단일 부착물(탄창) 상세 페이지에서 텍스트 기반 스탯 추출."""
-    driver.get(url)
-    time.sleep(REQUEST_DELAY * 2)
+    page_html = fetch(url, "attachment")
 
     # 이름은 h1 텍스트 기준
-    page_html = driver.page_source
     soup = BeautifulSoup(page_html, "html.parser")
     title = soup.find("h1")
     name = title.get_text(strip=True) if title else url.split("/")[-1]
 
     # body 전체 텍스트를 줄 단위로 분리
-    body_text = driver.find_element(By.TAG_NAME, "body").text
+    body_text = page_text(soup)
     lines = body_text.splitlines()
     stats = parse_stats_from_lines(lines)
 
@@ -392,39 +481,99 @@ def scrape_attachment(driver: webdriver.Chrome, url: str) -> Dict:
         "name": name,
         "url": url,
         "stats": stats,
+        "type": parse_type_from_lines(lines),
+        "compatible": parse_compatible_weapons(soup),
+        "image": page_image(soup, name, url),
     }
 
 
 def main():
-    driver = create_driver()
+    parser = argparse.ArgumentParser(description="델타포스 부착물 스크래퍼")
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        help="작업 큐 워커로 실행 (SQLite 큐 파일 경로, seed / collect는 work_queue.py 사용)",
+    )
+    add_profiling_args(parser)
+    args = parser.parse_args()
+
+    if args.queue is not None:
+        controller = AIMDController(max_rate=MAX_REQUEST_RATE, max_concurrency=MAX_CONCURRENCY)
+        with WorkQueue(args.queue) as queue:
+            summary = run_worker(queue, "attachment", controller=controller)
+            print(f"[INFO] 워커 종료: {summary} / 큐 상태: {queue.counts('attachment')}")
+        return
+    profiler = Profiler.from_args(args, OUTPUT_PATH)
+
+    # 타임아웃 / 워치독 / 주기적 재시작으로 Chrome 메모리 증가와 멈춤을 막는다
+    driver = ManagedDriver(create_driver)
+    profiler.watch_driver(driver)
+    fetcher = None
     try:
-        print("목록 페이지 접속 중...")
-        driver.get(LISTING_URL)
-        time.sleep(3)
-
-        # 무한 스크롤 페이지라면 끝까지 스크롤
-        scroll_to_bottom(driver, pause=1.0, max_tries=20)
-
-        listing_html = driver.page_source
-        links = parse_links_from_html(listing_html)
-        print(f"총 {len(links)}개 링크를 찾았습니다.")
-
-        data = []
-        for idx, link in enumerate(links, start=1):
-            print(f"[{idx}/{len(links)}] {link} 크롤링 중...")
-            try:
-                attachment = scrape_attachment(driver, link)
+        with profiler.stage("listing"):
+            print("목록 페이지 접속 중...")
+            driver.get(LISTING_URL)
+            wait_for_page(driver, "listing")
+
+            # 무한 스크롤 페이지라면 끝까지 스크롤
+            scroll_to_bottom(driver, pause=1.0, max_tries=20)
+
+            listing_html = driver.page_source
+            links = parse_links_from_html(listing_html)
+            print(f"총 {len(links)}개 링크를 찾았습니다.")
+
+        # 목록 페이지를 연 브라우저의 쿠키로 상세 페이지는 HTTP부터 시도
+        fetcher = TieredFetcher(driver=driver)
+        fetcher.sync_cookies()
+
+        # 일시적인 오류는 재시도, 끝내 실패한 URL은 다음 실행에서 다시 시도
+        policy = RetryPolicy()
+        breaker = CircuitBreaker()
+        dead_letters = DeadLetterQueue.load(DEAD_LETTER_PATH)
+        links += [url for url in dead_letters.urls() if url not in links]
+        controller = AIMDController(max_rate=MAX_REQUEST_RATE, max_concurrency=MAX_CONCURRENCY)
+        fetch = controller.wrap(fetcher.fetch)
+
+        def scrape_one(link: str) -> Dict:
+            return policy.call(lambda: scrape_attachment(fetch, link), link, breaker)
+
+        with profiler.stage("details"):
+            data = []
+            for idx, (link, attachment, error) in enumerate(controller.map(scrape_one, links), start=1):
+                if error is not None:
+                    print(f"[{idx}/{len(links)}] {link} 크롤링 실패")
+                    print(f"  -> 오류 발생, dead-letter 목록에 추가: {error}")
+                    dead_letters.add(link, error)
+                    continue
+                print(f"[{idx}/{len(links)}] {link} 크롤링 완료")
+                dead_letters.remove(link)
                 data.append(attachment)
-            except Exception as exc:
-                print(f"  -> 오류 발생, 건너뜀: {exc}")
-            time.sleep(REQUEST_DELAY)
 
-        OUTPUT_PATH.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
+        with profiler.stage("write"):
+            publish_json(OUTPUT_PATH, data)
+            with CatalogStore() as store:
+                store.upsert_attachments(data, category=LISTING_CATEGORY)
+        dead_letters.save()
+        write_run_metrics(
+            OUTPUT_PATH,
+            {
+                "tiers": fetcher.summary(),
+                "tier_log": fetcher.tier_log,
+                "dead_letters": len(dead_letters),
+                "rate": controller.snapshot(),
+                "driver": driver.stats,
+            },
         )
+        print(f"단계별 처리 수: {fetcher.summary()}")
+        if dead_letters:
+            print(f"실패한 URL {len(dead_letters)}개는 다음 실행에서 다시 시도합니다: {DEAD_LETTER_PATH}")
         print(f"완료! {OUTPUT_PATH.resolve()} 파일에 {len(data)}개 아이템을 저장했습니다.")
     finally:
+        # 중간에 실패해도 HTTP 세션의 커넥션 풀은 닫는다
+        if fetcher is not None:
+            fetcher.close()
         driver.quit()
+        profiler.finish()
 
 
 if __name__ == "__main__":
@@ -1,25 +1,41 @@
+import argparse
 import json
 import re
-import time
 from pathlib import Path
+from functools import partial
+from typing import Callable
 from urllib.parse import urljoin, urlparse
 
-import requests
 from bs4 import BeautifulSoup
 
+from ammo_catalog import Ammo, find_ammo, write_catalog
+from catalog_store import CatalogStore
+from fetcher import TieredFetcher, page_image
+from http_session import create_session, get_session
+from hybrid_session import HybridSession
+from link_stream import iter_anchors
+from profiling import Profiler, add_profiling_args
+from publish_data import publish_json
+from rate_control import AIMDController
+from retry_policy import CircuitBreaker, DeadLetterQueue, RetryPolicy, dead_letter_path
+from run_metrics import write_run_metrics
+from work_queue import WorkQueue, run_worker
+
 BASE_URL = "https://deltaforcetools.gg"
 WEAPONS_LIST_URL = f"{BASE_URL}/wiki/weapon/all"
 OUTPUT_PATH = Path("weapons_data.json")
+DEAD_LETTER_PATH = dead_letter_path(OUTPUT_PATH)
 
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/120.0.0.0 Safari/537.36"
-    )
-}
+# 요청 속도 상한 (AIMD 제어기가 이 범위 안에서 자동 조절)
+MAX_REQUEST_RATE = 4.0  # 초당 요청 수
+MAX_CONCURRENCY = 4
 
-REQUEST_DELAY = 1.0
+# 탄약 섹션 제목과, 제목에서 섹션 컨테이너까지 올라갈 최대 단계
+AMMO_HEADING = re.compile("Available bullets|탄약", re.I)
+AMMO_SECTION_DEPTH = 4
+# 섹션에서 못 찾으면 제목 뒤에 이어지는 형제 요소를 최대 몇 개까지 볼지 (다음 제목이 나오면 멈춤)
+AMMO_SIBLING_LIMIT = 8
+SECTION_HEADINGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
 
 # 영어 -> 한국어 번역 딕셔너리
 TRANSLATIONS = {
@@ -73,12 +89,46 @@ def extract_unit(value: str) -> str:
     return match.group(2) if match else ""
 
 
-def scrape_weapon_detail(url: str) -> dict | None:
-    """개별 무기 상세 페이지 스크래핑"""
+def fetch_html(url: str, session=None) -> str:
+    """일반 HTTP 요청으로 페이지 HTML 가져오기 (봇 체크를 통과하지 못할 수 있음)"""
+    # 매 요청마다 새 연결을 열지 않도록 공용 세션(커넥션 풀)을 사용
+    response = (session or get_session()).get(url, timeout=20)
+    response.raise_for_status()
+    return response.text
+
+
+def extract_ammunition(soup: BeautifulSoup) -> list[Ammo]:
+    """
+    "Available bullets" 제목이 있는 섹션만 읽어 탄약 목록을 찾는다.
+    제목에서 부모로 올라가며 탄약 표기가 처음 나오는 가장 작은 섹션의 텍스트를 한 번만 읽는다.
+    제목만 깊게 감싸여 있고 목록이 그 뒤의 형제 요소에 있으면 다음 제목 전까지의 형제를 읽는다.
+    """
+    heading = soup.find(
+        lambda tag: tag.name not in ("script", "style") and tag.find(string=AMMO_HEADING, recursive=False)
+    )
+    if heading is None:
+        return []
+    for section in [heading, *heading.parents][:AMMO_SECTION_DEPTH]:
+        ammo = find_ammo(section.get_text("\n", strip=True))
+        if ammo:
+            return ammo
+    for section in [heading, *heading.parents][:AMMO_SECTION_DEPTH]:
+        texts = []
+        for sibling in section.find_next_siblings(limit=AMMO_SIBLING_LIMIT):
+            if sibling.name in SECTION_HEADINGS or sibling.find(SECTION_HEADINGS):
+                break
+            texts.append(sibling.get_text("\n", strip=True))
+        ammo = find_ammo("\n".join(texts))
+        if ammo:
+            return ammo
+    return []
+
+
+def scrape_weapon_detail(url: str, fetch: Callable[[str], str] = fetch_html) -> dict | None:
+    """개별 무기 상세 페이지 스크래핑 (요청 실패는 예외로 올려 재시도 계층이 처리)"""
+    html = fetch(url)
     try:
-        response = requests.get(url, headers=HEADERS, timeout=20)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = BeautifulSoup(html, "html.parser")
 
         # 무기 이름
         title_elem = soup.find("h1") or soup.find("title")
@@ -163,20 +213,7 @@ def scrape_weapon_detail(url: str) -> dict | None:
                     break
 
         # 탄약 정보 찾기 (Available bullets 섹션)
-        ammo_types = []
-        ammo_section = soup.find(string=re.compile("Available bullets|탄약", re.I))
-        if ammo_section:
-            parent = ammo_section.find_parent()
-            if parent:
-                # 부모 요소 주변에서 탄약 정보 찾기
-                for elem in parent.find_all_next(["div", "span", "p"], limit=50):
-                    text = elem.get_text(strip=True)
-                    # 탄약 패턴 찾기 (예: 7.62x39mm AP)
-                    ammo_match = re.search(r"(\d+\.?\d*x\d+\.?\d*mm\s+\w+)", text, re.I)
-                    if ammo_match:
-                        ammo_type = ammo_match.group(1).strip()
-                        if ammo_type not in ammo_types:
-                            ammo_types.append(ammo_type)
+        ammo_types = [ammo.name for ammo in extract_ammunition(soup)]
 
         # 무기 카테고리 찾기
         category = "Unknown"
@@ -202,69 +239,195 @@ def scrape_weapon_detail(url: str) -> dict | None:
             "url": url,
             "attributes": attributes,
             "ammunition": ammo_types,
+            "image": page_image(soup, weapon_name, url),
         }
 
     except Exception as e:
-        print(f"  -> 오류 발생: {e}")
+        print(f"  -> 파싱 오류 발생: {e}")
         return None
 
 
-def scrape_weapons_list() -> list[dict]:
-    """무기 목록 페이지에서 모든 무기 링크 수집 및 스크래핑"""
+def collect_weapon_links(fetch: Callable[[str], str], policy: RetryPolicy) -> list[str]:
+    """무기 목록 페이지에서 상세 페이지 링크 수집 (권총 제외)"""
     print(f"무기 목록 페이지 접속 중: {WEAPONS_LIST_URL}")
-    response = requests.get(WEAPONS_LIST_URL, headers=HEADERS, timeout=20)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
+    listing_html = policy.call(lambda: fetch(WEAPONS_LIST_URL), WEAPONS_LIST_URL)
 
-    # 모든 무기 링크 찾기
+    # 모든 무기 링크 찾기 (트리를 만들지 않고 스트리밍 파싱)
     weapon_links = []
-    for anchor in soup.select("a[href*='/wiki/weapon/']"):
-        href = anchor.get("href")
+    seen = set()
+    for anchor in iter_anchors(listing_html, "/wiki/weapon/"):
+        href = anchor.href
         if not href:
             continue
 
         full_url = href if href.startswith("http") else urljoin(BASE_URL, href)
 
         # 권총 제외: 링크 텍스트나 URL에 'pistol'이 포함된 경우 제외
-        link_text = anchor.get_text(strip=True).lower()
+        link_text = anchor.stripped_text.lower()
         url_lower = full_url.lower()
 
         if "pistol" in link_text or "pistol" in url_lower:
             continue
 
-        if full_url not in weapon_links:
+        if full_url not in seen:
+            seen.add(full_url)
             weapon_links.append(full_url)
 
     print(f"수집된 무기 링크 수: {len(weapon_links)}")
-
-    # 각 무기 상세 정보 스크래핑
+    return weapon_links
+
+
+def scrape_weapons_list(
+    fetch: Callable[[str], str] = fetch_html,
+    links: list[str] | None = None,
+    dead_letters: DeadLetterQueue | None = None,
+    controller: AIMDController | None = None,
+    profiler: Profiler | None = None,
+) -> list[dict]:
+    """무기 목록 페이지에서 모든 무기 링크 수집 및 스크래핑
+    links를 주면 목록 페이지 대신 해당 URL만 스크래핑 (dead-letter 재시도용)"""
+    policy = RetryPolicy()
+    breaker = CircuitBreaker()
+    if dead_letters is None:
+        dead_letters = DeadLetterQueue(DEAD_LETTER_PATH)
+    if controller is None:
+        controller = AIMDController(max_rate=MAX_REQUEST_RATE, max_concurrency=MAX_CONCURRENCY)
+    if profiler is None:
+        profiler = Profiler()
+    throttled_fetch = controller.wrap(fetch)
+
+    with profiler.stage("listing"):
+        weapon_links = links if links is not None else collect_weapon_links(throttled_fetch, policy)
+
+    def scrape_one(link: str) -> dict | None:
+        return policy.call(lambda: scrape_weapon_detail(link, throttled_fetch), link, breaker)
+
+    # 각 무기 상세 정보 스크래핑 (동시 요청 수와 속도는 제어기가 결정)
     weapons_data = []
-    for idx, link in enumerate(weapon_links, start=1):
-        print(f"[{idx}/{len(weapon_links)}] 스크래핑 중: {link}")
-        weapon_data = scrape_weapon_detail(link)
-        if weapon_data:
-            # 권총 카테고리도 한 번 더 체크
-            if weapon_data.get("category") != "권총":
-                weapons_data.append(weapon_data)
-            else:
-                print(f"  -> 권총으로 분류되어 제외됨")
-        time.sleep(REQUEST_DELAY)
+    with profiler.stage("details"):
+        for idx, (link, weapon_data, error) in enumerate(controller.map(scrape_one, weapon_links), start=1):
+            if error is not None:
+                print(f"[{idx}/{len(weapon_links)}] 스크래핑 실패: {link}")
+                print(f"  -> [FAILED] dead-letter 목록에 추가: {error}")
+                dead_letters.add(link, error)
+                continue
+            print(f"[{idx}/{len(weapon_links)}] 스크래핑 완료: {link}")
+            dead_letters.remove(link)
+            if weapon_data:
+                # 권총 카테고리도 한 번 더 체크
+                if weapon_data.get("category") != "권총":
+                    weapons_data.append(weapon_data)
+                else:
+                    print(f"  -> 권총으로 분류되어 제외됨")
 
     return weapons_data
 
 
-def main():
-    print("=" * 60)
-    print("델타포스 무기 정보 스크래퍼 시작")
-    print("=" * 60)
+def merge_by_url(existing: list[dict], updates: list[dict]) -> list[dict]:
+    """기존 결과에 재시도 결과를 URL 기준으로 덮어쓰기"""
+    merged = {item["url"]: item for item in existing}
+    for item in updates:
+        merged[item["url"]] = item
+    return list(merged.values())
 
-    weapons = scrape_weapons_list()
 
-    # JSON 파일로 저장
-    OUTPUT_PATH.write_text(
-        json.dumps(weapons, ensure_ascii=False, indent=2),
-        encoding="utf-8",
+def main():
+    parser = argparse.ArgumentParser(description="델타포스 무기 정보 스크래퍼")
+    parser.add_argument(
+        "--mode",
+        choices=["tiered", "hybrid", "http"],
+        default="tiered",
+        help=(
+            "tiered: HTTP 우선, 불완전한 페이지만 브라우저로 렌더링 / "
+            "hybrid: 브라우저로 봇 체크 통과 후 HTTP로 수집 / "
+            "http: 일반 HTTP 요청만 사용"
+        ),
+    )
+    parser.add_argument("--http2", action="store_true", help="httpx[http2]가 설치돼 있으면 HTTP/2 사용")
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help=f"지난 실행에서 실패한 URL({DEAD_LETTER_PATH.name})만 다시 스크래핑해 기존 결과에 합치기",
     )
+    parser.add_argument("--max-rate", type=float, default=MAX_REQUEST_RATE, help="초당 요청 수 상한")
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENCY, help="동시 요청 수 상한")
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        help="작업 큐 워커로 실행 (SQLite 큐 파일 경로, seed / collect는 work_queue.py 사용)",
+    )
+    add_profiling_args(parser)
+    args = parser.parse_args()
+
+    if args.queue is not None:
+        controller = AIMDController(max_rate=args.max_rate, max_concurrency=args.max_concurrency)
+        with WorkQueue(args.queue) as queue:
+            summary = run_worker(queue, "weapon", controller=controller, http2=args.http2)
+            print(f"[INFO] 워커 종료: {summary} / 큐 상태: {queue.counts('weapon')}")
+        return
+
+    profiler = Profiler.from_args(args, OUTPUT_PATH)
+
+    try:
+        print("=" * 60)
+        print("델타포스 무기 정보 스크래퍼 시작")
+        print("=" * 60)
+
+        if args.retry_failed:
+            dead_letters = DeadLetterQueue.load(DEAD_LETTER_PATH)
+            links = dead_letters.urls()
+            print(f"[INFO] dead-letter 재시도 대상: {len(links)}개")
+        else:
+            dead_letters = DeadLetterQueue(DEAD_LETTER_PATH)
+            links = None
+        controller = AIMDController(max_rate=args.max_rate, max_concurrency=args.max_concurrency)
+        scrape = partial(
+            scrape_weapons_list,
+            links=links,
+            dead_letters=dead_letters,
+            controller=controller,
+            profiler=profiler,
+        )
+
+        metrics = {"mode": args.mode}
+        if args.mode == "tiered":
+            with TieredFetcher(http2=args.http2) as fetcher:
+                profiler.watch_driver(fetcher)
+                weapons = scrape(fetcher.fetch)
+                metrics["tiers"] = fetcher.summary()
+                metrics["tier_log"] = fetcher.tier_log
+                print(f"\n[INFO] 단계별 처리 수: {metrics['tiers']}")
+        elif args.mode == "hybrid":
+            with HybridSession(http2=args.http2) as session:
+                weapons = scrape(session.get)
+                metrics["requests"] = session.stats
+                print(f"\n[INFO] 요청 통계: HTTP {session.stats['http']}회 / 브라우저 {session.stats['browser']}회")
+        else:
+            session = create_session(http2=args.http2)
+            weapons = scrape(partial(fetch_html, session=session))
+            session.close()
+
+        if args.retry_failed and OUTPUT_PATH.exists():
+            weapons = merge_by_url(json.loads(OUTPUT_PATH.read_text(encoding="utf-8")), weapons)
+
+        dead_letters.save()
+        metrics["dead_letters"] = len(dead_letters)
+        metrics["rate"] = controller.snapshot()
+        print(f"\n[INFO] 요청 속도: {metrics['rate']}")
+        if dead_letters:
+            print(f"\n[WARN] 실패한 URL {len(dead_letters)}개를 {DEAD_LETTER_PATH}에 저장했습니다. --retry-failed로 다시 시도하세요.")
+
+        # JSON 파일로 저장
+        with profiler.stage("write"):
+            publish_json(OUTPUT_PATH, weapons)
+            # 탄약 카탈로그는 크롤링이 끝난 뒤 한 번만 만든다
+            write_catalog(weapons)
+        with CatalogStore() as store:
+            store.upsert_weapons(weapons)
+        write_run_metrics(OUTPUT_PATH, metrics)
+    finally:
+        # 실패로 끝나도 그때까지의 프로파일 결과는 남긴다
+        profiler.finish()
 
     print("\n" + "=" * 60)
     print(f"완료! {len(weapons)}개의 무기 정보를 {OUTPUT_PATH.resolve()}에 저장했습니다.")
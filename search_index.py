@@ -0,0 +1,215 @@
+"""
+한국어 / 영어 검색 색인
+weapons.json, attachments_data.json, mods.json, posts.json의 레코드를 토큰으로 나눠 역색인(단어 -> 문서)을 만듭니다.
+- 한글: 2글자 n-gram ("돌격소총" -> 돌격, 격소, 소총) / 한 글자 단어는 그대로
+- 영문 / 숫자: 모델명 정규화 ("AK-12", "ak 12" -> ak12) + 구분자로 나눈 조각 (ak, 12)
+- 단어 목록을 정렬해 두고 bisect로 접두어 범위를 찾으므로 검색 비용이 문서 수에 비례하지 않는다
+결과는 app/data/search_index.json(공백 없는 JSON)으로 저장해 Python과 Next.js에서 같이 씁니다.
+
+사용법:
+    python search_index.py
+    python search_index.py --query "ak12 탄창"
+"""
+
+import argparse
+import json
+import re
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable
+
+from catalog_store import APP_ATTACHMENTS_PATH, APP_WEAPONS_PATH
+from publish_data import publish_json
+
+MODS_PATH = Path("app/data/mods.json")
+POSTS_PATH = Path("app/data/posts.json")
+OUTPUT_PATH = Path("app/data/search_index.json")
+
+DOC_TYPES = ["weapon", "attachment", "mod", "post"]
+
+# 필드별 가중치 (제목에서 찾은 단어가 본문보다 앞에 오도록)
+TITLE_WEIGHT = 3
+TAG_WEIGHT = 2
+BODY_WEIGHT = 1
+
+# 한글 음절 묶음 / 영문·숫자 묶음(모델명 구분자 포함)
+HANGUL_RUN = re.compile(r"[가-힣]+")
+LATIN_RUN = re.compile(r"[0-9a-z]+(?:[-_./][0-9a-z]+)*")
+
+
+def hangul_ngrams(run: str, n: int = 2) -> list[str]:
+    if len(run) <= n:
+        return [run]
+    return [run[i:i + n] for i in range(len(run) - n + 1)]
+
+
+def latin_tokens(run: str) -> list[str]:
+    """"ak-12" -> ["ak12", "ak", "12"], "m4a1" -> ["m4a1"]."""
+    parts = [part for part in re.split(r"[-_./]", run) if part]
+    joined = "".join(parts)
+    return [joined] + [part for part in parts if part != joined]
+
+
+def tokenize(text: str, join_pairs: bool = True) -> list[str]:
+    """
+    색인 / 검색 공용 토크나이저.
+    검색어에서는 join_pairs=False로 붙인 모델명을 빼서 "mag 30"이 "mag30"까지 요구하지 않게 한다.
+    """
+    text = text.lower()
+    tokens = []
+    for run in HANGUL_RUN.findall(text):
+        tokens.extend(hangul_ngrams(run))
+    # 영문 사이의 공백으로 나뉜 모델명("AK 12")도 붙여서 하나 더 넣는다
+    latin = LATIN_RUN.findall(text)
+    for run in latin:
+        tokens.extend(latin_tokens(run))
+    if join_pairs:
+        for a, b in zip(latin, latin[1:]):
+            if a.isalpha() and b.isdigit():
+                tokens.append(a + b)
+    return tokens
+
+
+def documents(weapons: list[dict], attachments: list[dict], mods: list[dict], posts: list[dict]):
+    """(종류, 키, 표시 이름, [(텍스트, 가중치)]) 목록."""
+    for w in weapons:
+        yield "weapon", w["name"], w["name"], [(w["name"], TITLE_WEIGHT), (w.get("category") or "", TAG_WEIGHT)]
+    for a in attachments:
+        fields = [(a["name"], TITLE_WEIGHT), (a.get("type") or "", TAG_WEIGHT)]
+        fields += [(name, TAG_WEIGHT) for name in a.get("compatible", [])]
+        yield "attachment", a["name"], a["name"], fields
+    for m in mods:
+        fields = [
+            (m["title"], TITLE_WEIGHT),
+            (m["weaponName"], TITLE_WEIGHT),
+            (m.get("code", ""), TAG_WEIGHT),
+            (m.get("nickname", ""), TAG_WEIGHT),
+            (" ".join(m.get("tags", [])), TAG_WEIGHT),
+            (m.get("playstyle", ""), BODY_WEIGHT),
+            (m.get("description", ""), BODY_WEIGHT),
+        ]
+        yield "mod", m["id"], m["title"], fields
+    for p in posts:
+        fields = [
+            (p["title"], TITLE_WEIGHT),
+            (p.get("category", ""), TAG_WEIGHT),
+            (p.get("author", ""), TAG_WEIGHT),
+            (p.get("content", ""), BODY_WEIGHT),
+        ]
+        yield "post", p["id"], p["title"], fields
+
+
+class SearchIndex:
+    """정렬된 단어 목록 + 단어별 (문서 id, 점수) 목록."""
+
+    def __init__(self, docs: list[list], terms: list[str], postings: list[list[int]]):
+        # docs[i] = [종류 번호, 키, 표시 이름], postings[t] = [문서, 점수, 문서, 점수, ...]
+        self.docs = docs
+        self.terms = terms
+        self.postings = postings
+
+    @classmethod
+    def build(cls, records: Iterable[tuple]) -> "SearchIndex":
+        docs = []
+        index: dict[str, dict[int, int]] = {}
+        for doc_type, key, label, fields in records:
+            doc_id = len(docs)
+            docs.append([DOC_TYPES.index(doc_type), key, label])
+            for text, weight in fields:
+                for token in tokenize(str(text)):
+                    scores = index.setdefault(token, {})
+                    scores[doc_id] = scores.get(doc_id, 0) + weight
+
+        terms = sorted(index)
+        postings = []
+        for term in terms:
+            flat = []
+            for doc_id, score in sorted(index[term].items()):
+                flat += [doc_id, score]
+            postings.append(flat)
+        return cls(docs, terms, postings)
+
+    @classmethod
+    def from_files(cls) -> "SearchIndex":
+        def read(path: Path) -> list[dict]:
+            return json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+
+        return cls.build(
+            documents(read(APP_WEAPONS_PATH), read(APP_ATTACHMENTS_PATH), read(MODS_PATH), read(POSTS_PATH))
+        )
+
+    @classmethod
+    def load(cls, path: Path = OUTPUT_PATH) -> "SearchIndex":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(data["docs"], data["terms"], data["postings"])
+
+    def to_json(self) -> dict:
+        return {"types": DOC_TYPES, "docs": self.docs, "terms": self.terms, "postings": self.postings}
+
+    def save(self, path: Path = OUTPUT_PATH) -> None:
+        publish_json(path, self.to_json(), minified=True)
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+    def prefix_range(self, prefix: str) -> range:
+        """prefix로 시작하는 단어들의 위치 범위."""
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + "\uffff", lo=start)
+        return range(start, end)
+
+    def _match(self, token: str) -> dict[int, int]:
+        """토큰(접두어)에 맞는 문서별 점수. 정확히 같은 단어는 접두어 일치보다 점수를 더 준다."""
+        scores: dict[int, int] = {}
+        for t in self.prefix_range(token):
+            bonus = 2 if self.terms[t] == token else 1
+            flat = self.postings[t]
+            for i in range(0, len(flat), 2):
+                doc_id, score = flat[i], flat[i + 1]
+                scores[doc_id] = max(scores.get(doc_id, 0), score * bonus)
+        return scores
+
+    def search(self, query: str, doc_type: str | None = None, limit: int = 20) -> list[dict]:
+        """모든 토큰을 포함하는 문서를 점수순으로."""
+        tokens = list(dict.fromkeys(tokenize(query, join_pairs=False)))
+        if not tokens:
+            return []
+        # 결과가 적은 토큰부터 교집합을 만든다
+        matches = sorted((self._match(token) for token in tokens), key=len)
+        combined = dict(matches[0])
+        for scores in matches[1:]:
+            combined = {doc_id: total + scores[doc_id] for doc_id, total in combined.items() if doc_id in scores}
+            if not combined:
+                return []
+
+        type_id = DOC_TYPES.index(doc_type) if doc_type is not None else None
+        ranked = sorted(combined.items(), key=lambda item: (-item[1], item[0]))
+        results = []
+        for doc_id, score in ranked:
+            kind, key, label = self.docs[doc_id]
+            if type_id is not None and kind != type_id:
+                continue
+            results.append({"type": DOC_TYPES[kind], "key": key, "label": label, "score": score})
+            if len(results) >= limit:
+                break
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="한국어 / 영어 검색 색인 생성")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--query", help="색인을 만든 뒤 검색해 보기")
+    parser.add_argument("--type", choices=DOC_TYPES, help="검색 결과 종류 제한")
+    args = parser.parse_args()
+
+    index = SearchIndex.from_files()
+    index.save(args.output)
+    print(f"[INFO] 문서 {len(index.docs)}개 / 단어 {len(index.terms)}개를 {args.output.resolve()}에 저장했습니다.")
+
+    if args.query:
+        for result in index.search(args.query, args.type):
+            print(f"  [{result['type']}] {result['label']} ({result['score']})")
+
+
+if __name__ == "__main__":
+    main()
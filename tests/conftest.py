@@ -0,0 +1,13 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# 스크립트가 저장소 최상위의 평면 모듈이므로 그대로 import 할 수 있게 한다
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    """기본 출력 경로(변경 기록 등)가 저장소에 생기지 않도록 임시 폴더에서 실행."""
+    monkeypatch.chdir(tmp_path)
@@ -0,0 +1,68 @@
+from bs4 import BeautifulSoup
+
+from ammo_catalog import Ammo, build_catalog, find_ammo, parse_ammo, weapon_calibers
+from scrape_weapons import extract_ammunition
+
+
+def test_find_ammo_caliber_patterns():
+    text = "7.62x39mm AP\n9 x 19 mm RIP\n12 Gauge Slug\n12GA Buckshot\n.45 ACP FMJ\n.338 Lapua Magnum AP"
+    assert find_ammo(text) == [
+        Ammo("7.62x39mm", "AP"),
+        Ammo("9x19mm", "RIP"),
+        Ammo("12 Gauge", "Slug"),
+        Ammo("12 Gauge", "Buckshot"),
+        Ammo(".45 ACP", "FMJ"),
+        Ammo(".338 Lapua Magnum", "AP"),
+    ]
+
+
+def test_find_ammo_variant_does_not_cross_lines_and_dedupes():
+    assert find_ammo("5.56x45mm\nM855A1") == [Ammo("5.56x45mm", "")]
+    assert find_ammo("5.56x45mm M855 / 5.56x45mm M855") == [Ammo("5.56x45mm", "M855")]
+
+
+def test_find_ammo_ignores_non_ammo_numbers():
+    assert find_ammo("Fire Rate 800 / Damage 35 / Capacity 30") == []
+    assert parse_ammo("Holds 30 rounds") is None
+
+
+def test_build_catalog_and_reverse_index():
+    catalog = build_catalog(
+        [
+            {"name": "AKM", "ammunition": ["7.62x39mm AP", "7.62x39mm PS"]},
+            {"name": "SKS", "ammunition": ["7.62x39mm PS", "unknown"]},
+        ]
+    )
+    assert catalog["calibers"] == {"7.62x39mm": {"ammo": ["AP", "PS"], "weapons": ["AKM", "SKS"]}}
+    assert catalog["ammo"]["7.62x39mm PS"]["weapons"] == ["AKM", "SKS"]
+    assert weapon_calibers(catalog) == {"AKM": ["7.62x39mm"], "SKS": ["7.62x39mm"]}
+
+
+def _soup(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, "html.parser")
+
+
+def test_extract_ammunition_reads_heading_section():
+    soup = _soup(
+        "<div><p>Damage 7.62x51mm elsewhere</p>"
+        "<section><h3>Available bullets</h3><ul><li>5.56x45mm M855</li></ul></section></div>"
+    )
+    assert extract_ammunition(soup) == [Ammo("5.56x45mm", "M855")]
+
+
+def test_extract_ammunition_falls_back_to_following_siblings():
+    # 제목이 섹션 깊이보다 깊게 감싸여 있고 목록은 감싼 블록의 뒤 형제에 있다
+    soup = _soup(
+        "<main><div><div><div><span><b>Available bullets</b></span></div></div>"
+        "<ul><li>9x19mm RIP</li><li>9x19mm PBP</li></ul></div>"
+        "<h2>Other</h2><p>7.62x39mm AP</p></main>"
+    )
+    assert extract_ammunition(soup) == [Ammo("9x19mm", "RIP"), Ammo("9x19mm", "PBP")]
+
+
+def test_extract_ammunition_stops_at_next_heading():
+    soup = _soup(
+        "<div><div><div><div><h4>Available bullets</h4></div></div></div></div>"
+        "<h2>Recoil</h2><p>7.62x39mm AP</p>"
+    )
+    assert extract_ammunition(soup) == []
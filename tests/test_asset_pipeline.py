@@ -0,0 +1,75 @@
+import io
+import json
+import shutil
+
+import pytest
+from PIL import Image
+
+import asset_pipeline
+from catalog_store import APP_ATTACHMENTS_PATH, APP_WEAPONS_PATH
+
+
+def png(color: str) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (300, 200), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+IMAGES = {"https://cdn.test/m4a1.png": png("red"), "https://cdn.test/akm.png": png("blue")}
+
+
+def write_items(weapons):
+    APP_WEAPONS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    APP_WEAPONS_PATH.write_text(json.dumps(weapons), encoding="utf-8")
+    APP_ATTACHMENTS_PATH.write_text("[]", encoding="utf-8")
+
+
+def serve(cache_url_map):
+    def download(url, cache, refresh=False):
+        return cache.put(url, cache_url_map[url], None, None)
+    return download
+
+
+def fail(url, cache, refresh=False):
+    raise ValueError("CDN down")
+
+
+@pytest.fixture
+def published(monkeypatch):
+    write_items([
+        {"name": "M4A1", "image": "https://cdn.test/m4a1.png"},
+        {"name": "AKM", "image": "https://cdn.test/akm.png"},
+    ])
+    monkeypatch.setattr(asset_pipeline, "download", serve(IMAGES))
+    manifest = asset_pipeline.run()
+    assert set(manifest["weapons"]) == {"M4A1", "AKM"}
+    return manifest
+
+
+def thumbs():
+    return sorted(p.name for p in asset_pipeline.THUMB_DIR.glob("*.webp"))
+
+
+def test_failed_downloads_fall_back_to_cache(published, monkeypatch):
+    before = thumbs()
+    monkeypatch.setattr(asset_pipeline, "download", fail)
+    manifest = asset_pipeline.run()
+    assert manifest["weapons"] == published["weapons"]
+    assert thumbs() == before
+
+
+def test_failed_run_keeps_previous_entries_and_thumbnails(published, monkeypatch):
+    before = thumbs()
+    shutil.rmtree(asset_pipeline.CACHE_DIR)
+    monkeypatch.setattr(asset_pipeline, "download", fail)
+    manifest = asset_pipeline.run()
+    assert manifest["weapons"] == published["weapons"]
+    assert thumbs() == before
+
+
+def test_prunes_thumbnails_no_longer_referenced(published):
+    write_items([{"name": "M4A1", "image": "https://cdn.test/m4a1.png"}])
+    manifest = asset_pipeline.run()
+    assert set(manifest["weapons"]) == {"M4A1"}
+    kept = manifest["weapons"]["M4A1"]["hash"]
+    assert thumbs() and all(name.startswith(kept) for name in thumbs())
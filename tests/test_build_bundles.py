@@ -0,0 +1,57 @@
+import json
+
+from build_bundles import MANIFEST_NAME, build_shards, write_bundles
+
+WEAPONS = [
+    {"name": "M4A1", "category": "돌격소총"},
+    {"name": "M870", "category": "산탄총"},
+]
+
+
+def shard_files(output_dir):
+    return sorted(p.relative_to(output_dir).as_posix() for p in output_dir.rglob("*.json"))
+
+
+def test_shotgun_category_uses_page_filter_slug():
+    shards = build_shards(WEAPONS, [], [], [])
+    assert "weapons/category/shotgun" in shards
+    assert "weapons/category/assault" in shards
+
+
+def test_unchanged_build_writes_nothing(tmp_path):
+    shards = {"weapons/index": [1, 2], "posts/1": {"id": 1}}
+    first = write_bundles(shards, tmp_path)
+    mtimes = {p: p.stat().st_mtime_ns for p in tmp_path.rglob("*.json")}
+    assert write_bundles(shards, tmp_path) == first
+    assert {p: p.stat().st_mtime_ns for p in tmp_path.rglob("*.json")} == mtimes
+
+
+def test_prunes_only_shards_from_previous_manifest(tmp_path):
+    unrelated = tmp_path / "other" / "keep.json"
+    unrelated.parent.mkdir()
+    unrelated.write_text("{}")
+    (tmp_path / "top.json").write_text("[]")
+
+    write_bundles({"weapons/index": [1], "posts/1": {"id": 1}}, tmp_path)
+    old = json.loads((tmp_path / MANIFEST_NAME).read_text())["shards"]
+    write_bundles({"weapons/index": [1, 2]}, tmp_path)
+
+    files = shard_files(tmp_path)
+    assert "other/keep.json" in files and "top.json" in files
+    for entry in old.values():
+        assert entry["path"].removeprefix("/data/") not in files
+    # 비게 된 조각 폴더는 지운다
+    assert not (tmp_path / "posts").exists()
+    new = json.loads((tmp_path / MANIFEST_NAME).read_text())["shards"]
+    assert new["weapons/index"]["path"].removeprefix("/data/") in files
+
+
+def test_manifest_paths_outside_output_are_ignored(tmp_path):
+    outside = tmp_path / "victim.json"
+    outside.write_text("{}")
+    output = tmp_path / "out"
+    output.mkdir()
+    manifest = {"shards": {"x": {"path": "/data/../victim.json"}, "y": {"path": "/elsewhere/a.json"}}}
+    (output / MANIFEST_NAME).write_text(json.dumps(manifest))
+    write_bundles({"weapons/index": []}, output)
+    assert outside.exists()
@@ -0,0 +1,103 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from build_optimizer import BuildOptimizer, Constraint, optimize_all, parse_constraint
+from build_stats import STAT_INDEX, UNKNOWN_SLOT, BuildEngine
+
+SLOT_NAMES = {
+    "muzzle": "Compensator",
+    "stock": "Stock",
+    "optic": "Red Dot Sight",
+    "foregrip": "Vertical Grip",
+    UNKNOWN_SLOT: "Gadget",
+}
+
+
+def random_engine(seed: int) -> BuildEngine:
+    rng = random.Random(seed)
+    weapons = [
+        {"name": "M4A1", "attributes": {"제어력": {"value": 50}, "조작성": {"value": 60}, "안정성": {"value": 40}}},
+        {"name": "AKM", "attributes": {"제어력": {"value": 40}, "조작성": {"value": 45}}},
+    ]
+    attachments = []
+    for slot, label in SLOT_NAMES.items():
+        for i in range(3):
+            stats = {}
+            for stat in ("Recoil Control", "Handling", "Stability"):
+                if rng.random() < 0.7:
+                    value = rng.randint(-10, 10)
+                    stats[stat] = f"{value:+d}%" if rng.random() < 0.5 else f"{value:+d}"
+            attachments.append({"name": f"{label} {slot} {i}", "stats": stats})
+    return BuildEngine(weapons, attachments)
+
+
+def brute_force(engine: BuildEngine, weapon: str, maximize: str, constraints, top_k: int) -> list[float]:
+    """모든 조합을 계산해 조건을 만족하는 상위 top_k개의 목표 증가량."""
+    weapon_id = engine.weapon_ids[weapon]
+    by_slot: dict = {}
+    for a, slot in enumerate(engine.slots):
+        # 슬롯을 모르는 부착물은 각자 따로 장착 여부를 고른다
+        by_slot.setdefault((slot, a) if slot == UNKNOWN_SLOT else slot, [None]).append(a)
+    builds = [[a for a in combo if a is not None] for combo in itertools.product(*by_slot.values())]
+    final = engine.compute_batch([weapon_id] * len(builds), builds)
+    base = engine.base[weapon_id]
+    gains = []
+    for row in final:
+        ok = all(
+            (row[STAT_INDEX[c.stat]] >= (base[STAT_INDEX[c.stat]] if c.value is None else c.value) - 1e-9)
+            if c.op == ">="
+            else (row[STAT_INDEX[c.stat]] <= (base[STAT_INDEX[c.stat]] if c.value is None else c.value) + 1e-9)
+            for c in constraints
+        )
+        if ok:
+            gains.append(row[STAT_INDEX[maximize]] - base[STAT_INDEX[maximize]])
+    return sorted(gains, reverse=True)[:top_k]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize(
+    "maximize, constraints",
+    [
+        ("제어력", []),
+        ("제어력", ["조작성>=base"]),
+        ("안정성", ["조작성>=55", "제어력<=60"]),
+    ],
+)
+def test_search_matches_brute_force(seed, maximize, constraints):
+    engine = random_engine(seed)
+    optimizer = BuildOptimizer(engine)
+    parsed = [parse_constraint(text) for text in constraints]
+    builds = optimizer.search("M4A1", maximize, parsed, top_k=4)
+    expected = brute_force(engine, "M4A1", maximize, parsed, 4)
+    assert [build["gain"] for build in builds] == pytest.approx([round(g, 2) for g in expected], abs=0.011)
+
+
+def test_unknown_slot_attachments_can_be_combined():
+    engine = BuildEngine(
+        [{"name": "M4A1", "attributes": {"제어력": {"value": 50}}}],
+        [
+            {"name": "Gadget A", "stats": {"Recoil Control": "+5"}},
+            {"name": "Gadget B", "stats": {"Recoil Control": "+3"}},
+        ],
+    )
+    best = BuildOptimizer(engine).search("M4A1", "제어력", top_k=1)[0]
+    assert sorted(best["attachments"]) == ["Gadget A", "Gadget B"]
+    assert best["stats"]["제어력"] == 58
+
+
+def test_missing_base_stat_is_unrankable():
+    engine = random_engine(0)
+    optimizer = BuildOptimizer(engine)
+    assert optimizer.missing_stats("AKM", "안정성") == ["안정성"]
+    with pytest.raises(ValueError):
+        optimizer.search("AKM", "안정성")
+    with pytest.raises(ValueError):
+        optimizer.search("AKM", "제어력", [Constraint("안정성", ">=", 10.0)])
+
+    result = optimize_all(optimizer, top_k=2)
+    assert result["unrankable"]["AKM"] == {"max-stability": ["안정성"], "max-range": ["사거리"]}
+    assert "max-control" in result["builds"]["AKM"]
+    assert not np.isnan(result["builds"]["AKM"]["max-control"][0]["gain"])
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from build_stats import UNKNOWN_SLOT, BuildEngine, attachment_slot, infer_slot, precompute
+
+WEAPONS = [
+    {"name": "M4A1", "attributes": {"제어력": {"value": 50}, "조작성": {"value": 60}, "탄창 용량": {"value": 30}}},
+    {"name": "AKM", "attributes": {"제어력": {"value": 40}, "조작성": {"value": 45}}},
+]
+ATTACHMENTS = [
+    {"name": "Compensator", "stats": {"Recoil Control": "+10%", "Handling": "-4"}},
+    {"name": "Heavy Stock", "stats": {"Recoil Control": "+6", "Handling": "-10%"}},
+    {"name": "40-Round Mag", "stats": {"Holds": "40", "Handling": "-2"}},
+    {"name": "Red Dot Sight", "stats": {"Handling": "+1"}},
+]
+
+
+@pytest.fixture
+def engine():
+    return BuildEngine(WEAPONS, ATTACHMENTS)
+
+
+def test_compute_combines_percent_absolute_and_override(engine):
+    stats = engine.compute("M4A1", ["Compensator", "Heavy Stock", "40-Round Mag"])
+    assert stats["제어력"] == pytest.approx(50 * 1.10 + 6)
+    assert stats["조작성"] == pytest.approx(60 * 0.90 - 4 - 2)
+    assert stats["탄창 용량"] == 40
+    # 기본값이 없는 스탯은 계산하지 않는다
+    assert stats["데미지"] is None
+
+
+def test_compute_batch_handles_empty_builds(engine):
+    builds = [[], [0, 1], [], [3]]
+    final = engine.compute_batch([0, 0, 1, 1], builds)
+    np.testing.assert_allclose(final[0], engine.base[0], equal_nan=True)
+    np.testing.assert_allclose(final[2], engine.base[1], equal_nan=True)
+    assert final[1, 1] == pytest.approx(50 * 1.10 + 6)
+    assert final[3, 4] == pytest.approx(45 + 1)
+
+
+def test_compute_single_matches_compute_batch(engine):
+    weapon_ids = np.repeat([0, 1], 4)
+    attachment_ids = np.tile(np.arange(4), 2)
+    single = engine.compute_single(weapon_ids, attachment_ids)
+    batch = engine.compute_batch(weapon_ids, [[a] for a in attachment_ids])
+    np.testing.assert_allclose(single, batch, equal_nan=True)
+
+
+def test_duplicate_slot_is_rejected(engine):
+    with pytest.raises(ValueError):
+        engine.compute("M4A1", ["Compensator", "Compensator"])
+
+
+def test_precompute_lists_only_changed_stats(engine):
+    result = precompute(engine, [{"id": "m1", "weaponName": "AKM", "attachments": ["Red Dot Sight"]}])
+    assert result["mods"]["m1"]["final"]["조작성"] == 46
+    assert result["single_attachments"]["AKM"]["Red Dot Sight"] == {"조작성": 46}
+    assert result["single_attachments"]["M4A1"]["40-Round Mag"] == {"조작성": 58, "탄창 용량": 40}
+
+
+@pytest.mark.parametrize(
+    "name, slot",
+    [
+        ("AKM 40-Round Extended Mag", "magazine"),
+        ("M250 75-Round Belt", "magazine"),
+        ("Extended Magazine", "magazine"),
+        ("3x Magnifier", "optic"),
+        ("Magnum Compensator", "muzzle"),
+        ("Red Dot Sight", "optic"),
+        ("Vertical Grip", "foregrip"),
+        ("Rubber Grip", "rear_grip"),
+        ("Trail Stock", "stock"),
+        ("Railgun Widget", UNKNOWN_SLOT),
+    ],
+)
+def test_infer_slot_matches_whole_words(name, slot):
+    assert infer_slot(name) == slot
+
+
+def test_attachment_slot_prefers_page_type():
+    assert attachment_slot({"name": "Tactical Magnifier Mount", "type": "Optic"}) == "optic"
+    assert attachment_slot({"name": "AKM 30-Round Mag", "type": "Unknown"}) == "magazine"
@@ -0,0 +1,68 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from catalog_store import APP_ATTACHMENTS_PATH, APP_WEAPONS_PATH, WEAPONS_LIST_PATH, CatalogStore
+
+REPO = Path(__file__).resolve().parent.parent
+TRACKED_JSON = [WEAPONS_LIST_PATH, APP_WEAPONS_PATH, APP_ATTACHMENTS_PATH]
+
+
+@pytest.fixture
+def store(tmp_path):
+    with CatalogStore(tmp_path / "catalog.db") as store:
+        yield store
+
+
+def test_import_export_round_trip_is_byte_identical(tmp_path, store):
+    # conftest가 tmp_path로 chdir 하므로 상대 경로 그대로 복사
+    for path in TRACKED_JSON:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(REPO / path, path)
+
+    store.import_json()
+    store.export_json()
+    for path in TRACKED_JSON:
+        assert path.read_bytes() == (REPO / path).read_bytes(), path
+
+
+def test_list_name_does_not_overwrite_detail_name(store):
+    url = "https://a.test/wiki/weapon/M249"
+    listed = {"name": "M249 45668", "category": "기관총", "url": url}
+    detail = {"name": "M249", "url": url, "attributes": {"Damage": {"value": 30, "unit": "", "raw": "30"}}}
+
+    # 순서와 관계없이 상세 이름은 name, 목록 이름은 weapons_list.json에 남는다
+    for order in ([listed, detail], [detail, listed], [listed, detail, listed]):
+        store.conn.execute("DELETE FROM weapons")
+        for record in order:
+            store.upsert_weapons([record])
+        assert store.weapon_by_url(url)["name"] == "M249"
+        assert store.weapon_list() == [listed]
+        assert store.weapon_by_url(url)["category"] == "기관총"
+
+
+def test_list_only_weapon_uses_list_name(store):
+    url = "https://a.test/wiki/weapon/AKM"
+    store.upsert_weapons([{"name": "AKM 1234", "category": "돌격소총", "url": url}])
+    assert store.weapon_by_url(url)["name"] == "AKM 1234"
+    assert store.weapons(name="AKM 1234")[0]["url"] == url
+
+
+def test_attachment_upsert_and_lookup(store):
+    url = "https://a.test/wiki/attachment/mag-1"
+    store.upsert_attachments(
+        [{"name": "AKM 40-Round Mag", "url": url, "stats": {"Holds": "40"}, "type": "Mag", "compatible": ["AKM"]}],
+        category="mag",
+    )
+    # type / compatible이 없는 레코드는 기존 값을 지우지 않는다
+    store.upsert_attachments([{"name": "AKM 40-Round Mag", "url": url, "stats": {"Holds": "40"}, "type": None}])
+    assert store.attachment_by_url(url) == {
+        "name": "AKM 40-Round Mag",
+        "url": url,
+        "stats": {"Holds": "40"},
+        "type": "Mag",
+        "compatible": ["AKM"],
+    }
+    assert store.attachments(category="mag")[0]["url"] == url
+    assert store.attachment_by_url("https://a.test/none") is None
@@ -0,0 +1,91 @@
+import json
+import os
+
+from compat_index import CompatIndex, NameMatcher, caliber_fits, calibers_in, is_stale
+
+WEAPONS = [
+    {"name": "M14", "ammunition": ["7.62x51mm M80"]},
+    {"name": "PSG-1", "ammunition": ["7.62x51mm M62"]},
+    {"name": "AKM", "ammunition": ["7.62x39mm PS"]},
+    {"name": "QBZ95-1", "ammunition": ["5.8x42mm DBP10"]},
+]
+ATTACHMENTS = [
+    {"name": "Tactical Compensator", "compatible": ["AKM", "M14"]},
+    {"name": "M14 Scout Barrel"},
+    {"name": "PSG 20-Round Mag"},
+    {"name": "7.62x39 40-Round Drum Mag"},
+    {"name": "5.8 Extended Mag"},
+    {"name": "Mystery Widget"},
+]
+
+
+def test_calibers_in_and_fit():
+    assert calibers_in("5.56x45 30-Round Mag") == {("5.56", "45")}
+    assert calibers_in("7.62 × 39 Drum") == {("7.62", "39")}
+    assert calibers_in("5.8 Extended Mag") == {("5.8", None)}
+    assert calibers_in("30-Round Mag") == set()
+    assert caliber_fits({("5.8", None)}, {("5.8", "42")})
+    assert not caliber_fits({("7.62", "39")}, {("7.62", "51")})
+
+
+def test_name_matcher_exact_family_and_pairs():
+    matcher = NameMatcher(["M14", "PSG-1", "AK-12"])
+    assert matcher.match("M14 Scout Barrel") == {0}
+    assert matcher.match("PSG 20-Round Mag") == {1}
+    assert matcher.match("AK 12 Long Barrel") == {2}
+    assert matcher.match("30 Round Mag") == set()
+
+
+def build() -> CompatIndex:
+    return CompatIndex.build(WEAPONS, ATTACHMENTS)
+
+
+def test_build_uses_scraped_name_and_caliber_sources():
+    index = build()
+    assert set(index.for_weapon("AKM")) == {"Tactical Compensator", "7.62x39 40-Round Drum Mag"}
+    assert set(index.for_weapon("M14")) == {"Tactical Compensator", "M14 Scout Barrel"}
+    assert index.for_weapon("PSG-1") == ["PSG 20-Round Mag"]
+    assert index.for_weapon("QBZ95-1") == ["5.8 Extended Mag"]
+    assert index.for_weapon("AKM", slot="magazine") == ["7.62x39 40-Round Drum Mag"]
+    assert index.for_weapon("unknown") == []
+
+
+def test_unmatched_attachments_fit_no_weapon():
+    index = build()
+    widget = index.attachments.index("Mystery Widget")
+    assert index.unmatched == [widget]
+    assert all(widget not in ids for ids in index.by_weapon)
+
+
+def test_save_load_round_trip(tmp_path):
+    index = build()
+    path = tmp_path / "compat_index.json"
+    index.save(path)
+    loaded = CompatIndex.load(path)
+    assert loaded.to_json() == index.to_json()
+
+
+def write(path, data, mtime):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_load_or_build_rebuilds_when_inputs_are_newer(tmp_path):
+    weapons, attachments = tmp_path / "weapons.json", tmp_path / "attachments.json"
+    ammo, index_path = tmp_path / "ammo_catalog.json", tmp_path / "compat_index.json"
+    write(weapons, WEAPONS, 1000)
+    write(attachments, ATTACHMENTS[:2], 1000)
+    paths = dict(weapons_path=weapons, attachments_path=attachments, ammo_path=ammo)
+
+    # 없으면 만들어 저장
+    first = CompatIndex.load_or_build(index_path, **paths)
+    assert first.attachments == ["Tactical Compensator", "M14 Scout Barrel"]
+    os.utime(index_path, (2000, 2000))
+    assert not is_stale(index_path, [weapons, attachments, ammo])
+
+    # 다시 스크래핑해서 부착물이 늘었다
+    write(attachments, ATTACHMENTS, 3000)
+    assert is_stale(index_path, [weapons, attachments, ammo])
+    rebuilt = CompatIndex.load_or_build(index_path, **paths)
+    assert rebuilt.attachments == [a["name"] for a in ATTACHMENTS]
+    assert CompatIndex.load(index_path).attachments == rebuilt.attachments
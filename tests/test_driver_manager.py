@@ -0,0 +1,65 @@
+import driver_manager
+from driver_manager import ManagedDriver
+
+
+class FakeDriver:
+    def __init__(self):
+        self.visited = []
+        self.cookies = []
+        self.current_url = None
+        self.quit_called = False
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def get(self, url):
+        self.visited.append(url)
+        self.current_url = url
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def make_manager(**kwargs):
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    return ManagedDriver(factory, **kwargs), drivers
+
+
+def test_restart_restores_cookies_before_reopening(monkeypatch):
+    monkeypatch.setattr(driver_manager, "psutil", None)
+    manager, drivers = make_manager()
+    manager.get("https://site.test/wiki/weapon/all")
+    drivers[0].cookies.append({"name": "cf_clearance", "value": "ok"})
+    manager.mark_page()
+
+    manager.restart()
+    new = drivers[-1]
+    assert new.cookies == [{"name": "cf_clearance", "value": "ok"}]
+    # 사이트 루트에서 쿠키를 넣은 뒤 마지막 페이지를 다시 연다
+    assert new.visited == ["https://site.test/", "https://site.test/wiki/weapon/all"]
+
+
+def test_pinned_defers_recycle(monkeypatch):
+    monkeypatch.setattr(driver_manager, "psutil", None)
+    manager, drivers = make_manager(max_pages=1)
+    manager.get("https://site.test/list")
+    with manager.pinned():
+        manager.mark_page()
+        assert manager.maybe_recycle() is False
+        assert len(drivers) == 1
+    assert manager.maybe_recycle() is True
+    assert len(drivers) == 2
@@ -0,0 +1,42 @@
+from fetcher import is_complete
+
+NEXT_DATA = (
+    '<script id="__NEXT_DATA__" type="application/json">'
+    '{"props":{"html":"<h1>M4A1</h1>","stats":["Damage","Fire Rate","Handling"]}}'
+    "</script>"
+)
+
+
+def test_shell_with_inline_json_is_incomplete():
+    html = f"<html><body><div id='__next'></div>{NEXT_DATA}</body></html>"
+    assert not is_complete(html, "weapon")
+    assert not is_complete(html, "attachment")
+
+
+def test_rendered_weapon_page_is_complete():
+    html = (
+        "<html><body><h1>M4A1</h1><table><tr><td>Damage</td><td>35</td></tr></table>"
+        f"{NEXT_DATA}</body></html>"
+    )
+    assert is_complete(html, "weapon")
+    # 무기 스탯만 있고 부착물 스탯 라벨은 보이지 않는다
+    assert not is_complete(html, "attachment")
+
+
+def test_title_without_visible_stats_is_incomplete():
+    html = "<html><body><h1>M4A1</h1><style>.Damage{}</style><p>Loading...</p></body></html>"
+    assert not is_complete(html, "weapon")
+
+
+def test_listing_counts_distinct_anchor_links():
+    script_links = "".join(f'"/wiki/weapon/w{i}"' for i in range(10))
+    shell = f"<html><body><script>{script_links}</script><a href='/wiki/weapon/a'>a</a></body></html>"
+    assert not is_complete(shell, "listing")
+
+    anchors = "".join(f"<a href='/wiki/weapon/w{i}'>w{i}</a>" for i in range(6))
+    assert is_complete(f"<html><body>{anchors}</body></html>", "listing")
+
+
+def test_other_pages_only_need_html():
+    assert is_complete("<html><body>hi</body></html>", "other")
+    assert not is_complete("", "other")
@@ -0,0 +1,85 @@
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import http_session
+from http_session import DEFAULT_HEADERS, create_session, get_session, has_brotli
+
+BODY = "<html><body>무기 목록</body></html>".encode("utf-8")
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    seen: list[dict] = []
+
+    def do_GET(self):
+        accept = self.headers.get("Accept-Encoding", "")
+        body = gzip.compress(BODY) if "gzip" in accept else BODY
+        Handler.seen.append({"port": self.client_address[1], "headers": dict(self.headers)})
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if "gzip" in accept:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.seen = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def no_httpx(monkeypatch):
+    monkeypatch.setattr(http_session, "httpx", None)
+
+
+def test_session_reuses_connection_and_negotiates_gzip(server, no_httpx):
+    session = create_session()
+    try:
+        texts = [session.get(f"{server}/wiki/{i}", timeout=5).text for i in range(3)]
+    finally:
+        session.close()
+    assert texts == [BODY.decode("utf-8")] * 3
+    # keep-alive: 같은 클라이언트 포트(같은 커넥션)로 세 요청
+    assert len({request["port"] for request in Handler.seen}) == 1
+    headers = Handler.seen[0]["headers"]
+    assert headers["Accept-Encoding"] == DEFAULT_HEADERS["Accept-Encoding"]
+    assert headers["User-Agent"] == http_session.USER_AGENT
+
+
+def test_http2_falls_back_to_requests_without_httpx(no_httpx, capsys):
+    session = create_session(http2=True)
+    assert isinstance(session, requests.Session)
+    assert "HTTP/1.1" in capsys.readouterr().out
+    adapter = session.get_adapter("https://example.test")
+    assert adapter._pool_maxsize == http_session.POOL_SIZE
+    assert adapter.max_retries.total == 0
+
+
+def test_shared_session_is_reused(monkeypatch, no_httpx):
+    monkeypatch.setattr(http_session, "_shared_session", None)
+    assert get_session() is get_session()
+
+
+def test_brotli_only_requested_when_a_decoder_is_installed(monkeypatch):
+    monkeypatch.setattr(http_session.importlib.util, "find_spec", lambda name: None)
+    assert has_brotli() is False
+    monkeypatch.setattr(
+        http_session.importlib.util, "find_spec", lambda name: object() if name == "brotlicffi" else None
+    )
+    assert has_brotli() is True
+    assert ("br" in DEFAULT_HEADERS["Accept-Encoding"]) == http_session.HAS_BROTLI
@@ -0,0 +1,95 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from hybrid_session import HybridSession
+
+
+class FakeSite:
+    """현재 유효한 토큰 쿠키가 있어야 200을 주는 사이트."""
+
+    def __init__(self):
+        self.token = "v1"
+        self.renders = 0
+        self._lock = threading.Lock()
+
+    def driver(self):
+        site = self
+
+        class Driver:
+            page_source = "<html><body>rendered</body></html>"
+
+            def get(self, url):
+                with site._lock:
+                    site.renders += 1
+                time.sleep(0.05)
+
+            def execute_script(self, script):
+                return "test-agent"
+
+            def get_cookies(self):
+                return [{"name": "token", "value": site.token}]
+
+            def quit(self):
+                pass
+
+        return Driver()
+
+
+class FakeHttp:
+    def __init__(self, site):
+        self.site = site
+        self.headers = {}
+        self.jar = {}
+        self.cookies = SimpleNamespace(set=lambda name, value, **kw: self.jar.__setitem__(name, value))
+
+    def get(self, url, timeout=None):
+        time.sleep(0.01)
+        ok = self.jar.get("token") == self.site.token
+        return SimpleNamespace(
+            status_code=200 if ok else 403,
+            text="<html><body>ok</body></html>",
+            raise_for_status=lambda: None,
+        )
+
+    def close(self):
+        pass
+
+
+def make_session():
+    site = FakeSite()
+    session = HybridSession(driver_factory=site.driver)
+    session.session = FakeHttp(site)
+    return site, session
+
+
+def _get_many(session, count):
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        return list(pool.map(session.get, [f"https://example.test/{i}" for i in range(count)]))
+
+
+def test_concurrent_first_requests_open_browser_once():
+    site, session = make_session()
+    results = _get_many(session, 6)
+    assert site.renders == 1
+    assert all("ok" in html for html in results)
+
+
+def test_expired_cookies_refreshed_once_across_threads():
+    site, session = make_session()
+    session.get("https://example.test/warmup")
+    assert site.renders == 1
+
+    site.token = "v2"  # 쿠키 만료
+    results = _get_many(session, 6)
+    assert site.renders == 2
+    assert sum("rendered" in html for html in results) == 1
+    assert sum("ok" in html for html in results) == 5
+
+
+def test_explicit_refresh_always_renders():
+    site, session = make_session()
+    session.refresh()
+    session.refresh()
+    assert site.renders == 2
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from link_stream import iter_anchors, iter_chunks
+
+REPO = Path(__file__).resolve().parent.parent
+FIXTURE_PAGES = ["debug.html", "debug_item.html", "target_page.html"]
+
+
+def pairs(anchors):
+    return [(a.href, a.stripped_text) for a in anchors]
+
+
+def test_anchor_split_across_chunks():
+    html = '<p>x</p><a href="/wiki/weapon/AK-12">AK-12 <b>돌격소총</b></a><a href="/wiki/x">X</a>'
+    # 태그 / 속성 / 텍스트 한가운데서 끊기는 모든 크기
+    for size in range(1, len(html) + 1):
+        assert pairs(iter_anchors(iter_chunks(html, size))) == [
+            ("/wiki/weapon/AK-12", "AK-12돌격소총"),
+            ("/wiki/x", "X"),
+        ]
+
+
+def test_nested_and_unclosed_anchors():
+    # 안쪽 <a>가 시작되면 바깥 것을 먼저 내보내고, 닫히지 않은 마지막 <a>는 close에서 내보낸다
+    html = '<a href="/outer">바깥<a href="/inner">안쪽</a>뒤</a><a href="/open">열린 채'
+    assert pairs(iter_anchors(html)) == [("/outer", "바깥"), ("/inner", "안쪽"), ("/open", "열린 채")]
+
+
+def test_anchor_without_href_is_skipped():
+    html = '<a name="top">위</a><a href="">빈 링크</a>'
+    assert pairs(iter_anchors(html)) == [("", "빈 링크")]
+
+
+def test_entities_are_decoded():
+    html = '<a href="/search?q=a&amp;b=1">Tom &amp; Jerry &#8212; &lt;M4&gt; &nbsp;</a>'
+    (anchor,) = iter_anchors(html)
+    assert anchor.href == "/search?q=a&b=1"
+    assert anchor.text == "Tom & Jerry — <M4> \xa0"
+    assert anchor.stripped_text == "Tom & Jerry — <M4>"
+
+
+def test_href_filter():
+    html = '<a href="/wiki/weapon/a">a</a><a href="/about">about</a>'
+    assert pairs(iter_anchors(html, href_contains="/wiki/")) == [("/wiki/weapon/a", "a")]
+
+
+@pytest.mark.parametrize("name", FIXTURE_PAGES)
+def test_matches_beautifulsoup_on_fixture_pages(name):
+    html = (REPO / name).read_text(encoding="utf-8")
+    soup = BeautifulSoup(html, "html.parser")
+    expected = [(a["href"], a.get_text(strip=True)) for a in soup.find_all("a", href=True)]
+    assert expected, f"{name}에 링크가 없습니다"
+    anchors = list(iter_anchors(iter_chunks(html, 4096)))
+    assert pairs(anchors) == expected
+    assert [a.text for a in anchors] == [a.get_text() for a in soup.find_all("a", href=True)]
@@ -0,0 +1,35 @@
+import pstats
+from concurrent.futures import ThreadPoolExecutor
+
+from profiling import Profiler
+
+
+def _worker_only_function():
+    return sum(i * i for i in range(20000))
+
+
+def test_cprofile_includes_worker_threads(tmp_path):
+    profiler = Profiler(tmp_path / "out.json", cpu="cprofile")
+    with profiler.stage("details"):
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            list(pool.map(lambda _: _worker_only_function(), range(6)))
+    profiler.finish()
+
+    stats = pstats.Stats(str(tmp_path / "out.profile" / "details.prof"))
+    names = {name for _, _, name in stats.stats}
+    assert "_worker_only_function" in names
+    assert profiler.stages["details"]["profiled_threads"] >= 2
+    assert (tmp_path / "out.profile" / "summary.json").exists()
+
+
+def test_stage_output_written_when_body_raises(tmp_path):
+    profiler = Profiler(tmp_path / "out.json", cpu="cprofile")
+    try:
+        with profiler.stage("listing"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    finally:
+        profiler.finish()
+    assert (tmp_path / "out.profile" / "listing.prof").exists()
+    assert "listing" in profiler.stages
@@ -0,0 +1,106 @@
+import json
+import os
+
+import pytest
+
+import publish_data
+from publish_data import atomic_write, diff_records, field_deltas, publish_json, record_key
+
+WEAPONS = [
+    {"url": "/w/ak12", "name": "AK-12", "attributes": {"제어력": {"value": 50}}},
+    {"url": "/w/m4a1", "name": "M4A1", "attributes": {"제어력": {"value": 60}}},
+]
+
+
+def read_changelog(path):
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_first_publish_creates_file_and_logs(tmp_path):
+    path, log = tmp_path / "data" / "weapons.json", tmp_path / "log.jsonl"
+    entry = publish_json(path, WEAPONS, changelog=log)
+    assert entry["created"] and entry["count"] == 2
+    assert json.loads(path.read_text(encoding="utf-8")) == WEAPONS
+    assert read_changelog(log) == [entry]
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    path, log = tmp_path / "weapons.json", tmp_path / "log.jsonl"
+    publish_json(path, WEAPONS, changelog=log)
+    os.utime(path, (1_000_000, 1_000_000))
+
+    assert publish_json(path, WEAPONS, changelog=log) is None
+    # 순서만 바뀐 레코드 목록도 변경 없음
+    assert publish_json(path, list(reversed(WEAPONS)), changelog=log) is None
+    assert path.stat().st_mtime == 1_000_000
+    assert len(read_changelog(log)) == 1
+
+
+def test_formatting_only_difference_is_skipped(tmp_path):
+    path = tmp_path / "index.json"
+    path.write_text(json.dumps({"a": 1}), encoding="utf-8")
+    assert publish_json(path, {"a": 1}, changelog=None) is None
+    assert path.read_text(encoding="utf-8") == '{"a": 1}'
+
+
+def test_record_diff_reports_added_removed_and_field_changes(tmp_path):
+    path, log = tmp_path / "weapons.json", tmp_path / "log.jsonl"
+    publish_json(path, WEAPONS, changelog=log)
+
+    updated = [
+        {"url": "/w/ak12", "name": "AK-12", "attributes": {"제어력": {"value": 55}}},
+        {"url": "/w/m700", "name": "M700", "attributes": {}},
+    ]
+    entry = publish_json(path, updated, changelog=log)
+    assert entry["added"] == ["/w/m700"]
+    assert entry["removed"] == ["/w/m4a1"]
+    assert entry["modified"] == {"/w/ak12": {"attributes.제어력.value": [50, 55]}}
+    assert read_changelog(log)[-1] == entry
+    assert json.loads(path.read_text(encoding="utf-8")) == updated
+
+
+def test_non_record_data_logs_hash_change(tmp_path):
+    path = tmp_path / "catalog.json"
+    publish_json(path, {"calibers": {}}, changelog=None)
+    entry = publish_json(path, {"calibers": {"9x19mm": {}}}, changelog=None)
+    assert set(entry) == {"time", "path", "hash"}
+    assert entry["hash"][0] != entry["hash"][1]
+
+
+def test_minified_output(tmp_path):
+    path = tmp_path / "shard.json"
+    publish_json(path, {"a": [1, 2]}, minified=True, changelog=None)
+    assert path.read_bytes() == b'{"a":[1,2]}'
+
+
+def test_record_key_picks_first_unique_field():
+    assert record_key(WEAPONS) == "url"
+    assert record_key([{"id": 1, "name": "a"}, {"id": 2, "name": "a"}]) == "id"
+    assert record_key([{"name": "a"}, {"name": "a"}]) is None
+    assert record_key([1, 2]) is None
+
+
+def test_diff_and_field_deltas():
+    assert field_deltas({"a": 1, "b": {"c": 2}}, {"a": 1, "b": {"c": 3}, "d": 4}) == {
+        "b.c": [2, 3],
+        "d": [None, 4],
+    }
+    diff = diff_records(WEAPONS, WEAPONS, "url")
+    assert diff == {"added": [], "removed": [], "modified": {}}
+
+
+def test_atomic_write_keeps_old_file_on_failure(tmp_path, monkeypatch):
+    path = tmp_path / "weapons.json"
+    path.write_bytes(b"old")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(publish_data.os, "replace", fail)
+    with pytest.raises(OSError):
+        atomic_write(path, b"new")
+    assert path.read_bytes() == b"old"
+    # 임시 파일을 남기지 않는다
+    assert [p.name for p in tmp_path.iterdir()] == ["weapons.json"]
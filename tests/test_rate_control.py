@@ -0,0 +1,21 @@
+import time
+
+from rate_control import AIMDController, untimed
+
+
+def test_untimed_work_is_not_a_congestion_signal():
+    controller = AIMDController(initial_rate=4.0, max_rate=4.0, latency_threshold=0.05)
+    with controller.slot():
+        # 브라우저 렌더링처럼 서버와 무관한 대기
+        with untimed():
+            time.sleep(0.1)
+    assert controller.snapshot()["decreases"] == 0
+    assert controller.latency_ewma < 0.05
+
+
+def test_slow_requests_still_decrease_rate():
+    controller = AIMDController(initial_rate=4.0, max_rate=4.0, latency_threshold=0.05)
+    with controller.slot():
+        time.sleep(0.1)
+    assert controller.snapshot()["decreases"] == 1
+    assert controller.rate == 2.0
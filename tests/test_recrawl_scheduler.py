@@ -0,0 +1,98 @@
+import argparse
+
+import pytest
+
+from catalog_store import CatalogStore
+from rate_control import TokenBucket
+from recrawl_scheduler import INITIAL_INTERVAL, FreshnessTracker, RecrawlScheduler, positive_float
+
+URL = "https://a.test/weapon/ak12"
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    with CatalogStore(tmp_path / "catalog.db") as store:
+        yield FreshnessTracker(store)
+
+
+def row(tracker):
+    return tracker.next_due()
+
+
+def test_first_check_records_baseline(tracker):
+    tracker.register(["https://a.test/1"], "weapon", INITIAL_INTERVAL)
+    assert tracker.record_check(row(tracker), "h1") is False
+    first = row(tracker)
+    assert first["content_hash"] == "h1"
+    assert first["interval_sec"] == INITIAL_INTERVAL
+    assert first["changes"] == 0 and first["last_changed"] is None
+
+    assert tracker.record_check(first, "h2") is True
+    second = row(tracker)
+    assert second["changes"] == 1
+    assert second["interval_sec"] < INITIAL_INTERVAL
+
+
+def weapon(damage: float) -> dict:
+    return {
+        "name": "AK-12",
+        "url": URL,
+        "attributes": {"Damage": {"value": damage, "unit": "", "raw": str(damage)}},
+        "ammunition": ["5.45x39mm BT"],
+    }
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    with CatalogStore(tmp_path / "catalog.db") as store:
+        scheduler = RecrawlScheduler(store)
+        scheduler.tracker.register([URL], "weapon", INITIAL_INTERVAL)
+        yield scheduler
+        scheduler.fetcher.close()
+
+
+def test_first_visit_updates_stale_catalog_row(scheduler):
+    scheduler.store.upsert_weapons([weapon(30)])
+    scheduler.handlers["weapon"] = lambda url: weapon(35)
+
+    scheduler.check(row(scheduler.tracker))
+    assert scheduler.store.weapon_by_url(URL)["attributes"]["Damage"]["value"] == 35
+    assert scheduler._dirty
+    # 첫 방문은 변경 횟수에 넣지 않는다
+    assert scheduler.stats["changed"] == 0
+
+
+def test_first_visit_matching_catalog_is_not_rewritten(scheduler):
+    scheduler.store.upsert_weapons([weapon(30)])
+    scheduler.handlers["weapon"] = lambda url: weapon(30)
+
+    scheduler.check(row(scheduler.tracker))
+    assert not scheduler._dirty
+
+
+def test_first_visit_of_new_url_is_added(scheduler):
+    scheduler.handlers["weapon"] = lambda url: weapon(30)
+
+    scheduler.check(row(scheduler.tracker))
+    assert scheduler.store.weapon_by_url(URL) is not None
+    assert scheduler._dirty
+
+
+def test_token_bucket_unlimited_only_when_explicit():
+    bucket = TokenBucket(None)
+    for _ in range(100):
+        bucket.acquire()
+    assert bucket.spent == 100
+    assert bucket.available() == float("inf")
+
+
+@pytest.mark.parametrize("per_hour", [0, -1])
+def test_token_bucket_rejects_non_positive_budget(per_hour):
+    with pytest.raises(ValueError):
+        TokenBucket(per_hour)
+
+
+def test_budget_argument_rejects_zero():
+    assert positive_float("120") == 120
+    with pytest.raises(argparse.ArgumentTypeError):
+        positive_float("0")
@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import pytest
+import requests
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    InvalidSessionIdException,
+    SessionNotCreatedException,
+    TimeoutException,
+)
+
+import retry_policy
+from retry_policy import CircuitBreaker, DeadLetterQueue, RetryPolicy, classify_error, parse_retry_after
+
+URL = "https://a.test/wiki/weapon/ak12"
+
+
+class FakeClock:
+    """retry_policy 모듈의 time만 바꿔 실제로 잠들지 않게 한다."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.slept: list[float] = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(retry_policy, "time", clock)
+    return clock
+
+
+def http_error(status: int, retry_after: str | None = None) -> requests.HTTPError:
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    return requests.HTTPError(response=SimpleNamespace(status_code=status, headers=headers))
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(" 5 ") == 5.0
+    when = datetime.now(timezone.utc) + timedelta(seconds=90)
+    assert 80 <= parse_retry_after(format_datetime(when, usegmt=True)) <= 90
+    # 이미 지난 날짜는 0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+@pytest.mark.parametrize(
+    "exc, retryable",
+    [
+        (http_error(503), True),
+        (http_error(429), True),
+        (http_error(404), False),
+        (requests.ConnectionError("reset"), True),
+        (requests.Timeout("slow"), True),
+        (TimeoutError(), True),
+        (TimeoutException("page load"), True),
+        (InvalidSessionIdException("browser died"), True),
+        (InvalidSelectorException("bad xpath"), False),
+        (SessionNotCreatedException("chrome version"), False),
+        (ValueError("parse"), False),
+    ],
+)
+def test_classify_error(exc, retryable):
+    assert classify_error(exc)[0] is retryable
+
+
+def test_classify_error_reads_retry_after():
+    assert classify_error(http_error(429, "7")) == (True, 7.0)
+
+
+def test_retry_policy_retries_transient_then_succeeds(clock):
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise http_error(503, "2")
+        return "ok"
+
+    assert RetryPolicy(max_attempts=4).call(flaky, URL) == "ok"
+    assert clock.slept == [2.0, 2.0]
+
+
+def test_retry_policy_gives_up_on_permanent_error(clock):
+    def broken():
+        raise InvalidSelectorException("bad xpath")
+
+    with pytest.raises(InvalidSelectorException) as info:
+        RetryPolicy(max_attempts=4).call(broken, URL)
+    assert info.value.attempts == 1
+    assert clock.slept == []
+
+
+def test_circuit_breaker_open_half_open_close(clock):
+    breaker = CircuitBreaker(window=10, threshold=0.5, min_requests=4, cooldown=60)
+
+    # 닫힘: 요청이 적으면 실패해도 열리지 않는다
+    for _ in range(3):
+        breaker.record(URL, ok=False)
+    breaker.before_request(URL)
+    assert clock.slept == [] and breaker.trips == 0
+
+    # 열림: 오류율이 기준을 넘으면 cooldown 동안 대기
+    breaker.record(URL, ok=False)
+    assert breaker.trips == 1
+    breaker.before_request(URL)
+    assert clock.slept == [60]
+    # 다른 호스트는 영향 없음
+    breaker.before_request("https://b.test/x")
+    assert clock.slept == [60]
+
+    # 반열림: 측정을 새로 시작하므로 재개 후 첫 실패로 바로 다시 열리지 않는다
+    breaker.record(URL, ok=False)
+    breaker.before_request(URL)
+    assert breaker.trips == 1 and clock.slept == [60]
+
+    # 닫힘: 성공이 이어지면 가끔 실패해도 닫힌 채로 남는다
+    for _ in range(5):
+        breaker.record(URL, ok=True)
+    breaker.record(URL, ok=False)
+    breaker.before_request(URL)
+    assert breaker.trips == 1 and clock.slept == [60]
+
+
+def test_dead_letter_queue_persists_between_runs(tmp_path):
+    path = tmp_path / "weapons_data.dead_letters.json"
+    queue = DeadLetterQueue(path)
+    error = TimeoutException("page load")
+    error.attempts = 4
+    queue.add(URL, error)
+    queue.add("https://a.test/2", ValueError("parse"))
+    queue.save()
+
+    loaded = DeadLetterQueue.load(path)
+    assert loaded.urls() == [URL, "https://a.test/2"]
+    assert loaded.entries[URL]["attempts"] == 4
+    assert loaded.entries[URL]["error"].startswith("TimeoutException")
+
+    # 모두 성공하면 파일을 지운다
+    loaded.remove(URL)
+    loaded.remove("https://a.test/2")
+    loaded.save()
+    assert not path.exists()
+    assert len(DeadLetterQueue.load(path)) == 0
@@ -0,0 +1,35 @@
+import time
+
+from scrape_all_weapons import wait_for_next_page, weapon_hrefs
+
+
+def listing(prefix):
+    links = "".join(f"<a href='/wiki/weapon/{prefix}{i}'>{prefix}{i}</a>" for i in range(6))
+    return f"<html><body>{links}</body></html>"
+
+
+class PagingDriver:
+    """클릭 뒤 몇 번 읽을 때까지는 이전 페이지 HTML을 돌려주는 드라이버."""
+
+    def __init__(self, old, new, stale_reads):
+        self.old, self.new, self.reads, self.stale_reads = old, new, 0, stale_reads
+
+    @property
+    def page_source(self):
+        self.reads += 1
+        return self.old if self.reads <= self.stale_reads else self.new
+
+
+def test_waits_until_listing_links_change():
+    driver = PagingDriver(listing("a"), listing("b"), stale_reads=3)
+    html = wait_for_next_page(driver, weapon_hrefs(listing("a")), timeout=5, poll=0.01)
+    assert html == listing("b")
+    assert driver.reads == 4
+
+
+def test_gives_up_at_timeout_when_page_never_changes():
+    driver = PagingDriver(listing("a"), listing("a"), stale_reads=0)
+    start = time.monotonic()
+    html = wait_for_next_page(driver, weapon_hrefs(listing("a")), timeout=0.2, poll=0.01)
+    assert html == listing("a")
+    assert time.monotonic() - start < 2
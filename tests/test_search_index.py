@@ -0,0 +1,67 @@
+from search_index import SearchIndex, documents, tokenize
+
+
+def test_tokenize_hangul_ngrams_and_model_names():
+    assert tokenize("돌격소총") == ["돌격", "격소", "소총"]
+    assert tokenize("총") == ["총"]
+    assert tokenize("AK-12") == ["ak12", "ak", "12"]
+    assert tokenize("M4A1") == ["m4a1"]
+    # 공백으로 나뉜 모델명도 붙인 토큰을 하나 더 넣는다 (색인할 때만)
+    assert tokenize("AK 12") == ["ak", "12", "ak12"]
+    assert tokenize("AK 12", join_pairs=False) == ["ak", "12"]
+
+
+def make_index() -> SearchIndex:
+    weapons = [
+        {"name": "AK-12", "category": "돌격소총"},
+        {"name": "M4A1", "category": "돌격소총"},
+        {"name": "M700", "category": "저격소총"},
+    ]
+    attachments = [
+        {"name": "AK-12 30발 탄창", "type": "탄창", "compatible": ["AK-12"]},
+        {"name": "M4A1 확장 탄창", "type": "탄창", "compatible": ["M4A1"]},
+    ]
+    return SearchIndex.build(documents(weapons, attachments, [], []))
+
+
+def labels(results: list[dict]) -> list[str]:
+    return [r["label"] for r in results]
+
+
+def test_search_matches_model_name_spellings():
+    index = make_index()
+    for query in ("ak12", "AK-12", "ak 12"):
+        # 이름과 호환 무기 필드에서 모두 맞는 부착물이 점수가 더 높다
+        assert labels(index.search(query)) == ["AK-12 30발 탄창", "AK-12"]
+
+
+def test_search_intersects_all_tokens():
+    index = make_index()
+    assert labels(index.search("ak12 탄창")) == ["AK-12 30발 탄창"]
+    assert labels(index.search("돌격소총")) == ["AK-12", "M4A1"]
+    assert index.search("m700 탄창") == []
+    assert index.search("없는단어") == []
+    assert index.search("   ") == []
+
+
+def test_search_prefix_and_type_filter():
+    index = make_index()
+    assert labels(index.search("m4")) == ["M4A1 확장 탄창", "M4A1"]
+    assert labels(index.search("m4", doc_type="attachment")) == ["M4A1 확장 탄창"]
+    assert labels(index.search("탄창", limit=1)) == ["AK-12 30발 탄창"]
+
+
+def test_exact_term_scores_above_prefix_match():
+    index = make_index()
+    exact = index.search("m4a1", doc_type="weapon")[0]
+    prefix = index.search("m4a", doc_type="weapon")[0]
+    assert exact["label"] == prefix["label"] == "M4A1"
+    assert exact["score"] == 2 * prefix["score"]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = make_index()
+    path = tmp_path / "search_index.json"
+    index.save(path)
+    loaded = SearchIndex.load(path)
+    assert loaded.search("ak12 탄창") == index.search("ak12 탄창")
@@ -0,0 +1,30 @@
+import time
+
+from work_queue import LeaseHeartbeat, WorkQueue
+
+
+def test_heartbeat_keeps_long_batches_leased(tmp_path):
+    path = tmp_path / "queue.db"
+    with WorkQueue(path) as queue, WorkQueue(path) as other:
+        queue.enqueue(["https://a.test/1", "https://a.test/2"], "weapon")
+        tokens = dict(queue.lease("weapon", "w1", lease_seconds=0.3))
+
+        with LeaseHeartbeat(path, tokens, lease_seconds=0.3) as heartbeat:
+            # 임대 시간보다 오래 걸리는 배치
+            time.sleep(0.7)
+            assert other.lease("weapon", "w2", lease_seconds=0.3) == []
+            assert queue.complete("https://a.test/1", tokens["https://a.test/1"], {"ok": 1})
+            heartbeat.finish("https://a.test/1")
+        assert heartbeat.extensions > 0
+        assert queue.complete("https://a.test/2", tokens["https://a.test/2"], {"ok": 2})
+
+
+def test_expired_lease_is_taken_over_without_heartbeat(tmp_path):
+    path = tmp_path / "queue.db"
+    with WorkQueue(path) as queue, WorkQueue(path) as other:
+        queue.enqueue(["https://a.test/1"], "weapon")
+        ((url, token),) = queue.lease("weapon", "w1", lease_seconds=0.1)
+        time.sleep(0.2)
+        ((_, stolen),) = other.lease("weapon", "w2")
+        assert not queue.complete(url, token, {})
+        assert other.complete(url, stolen, {})
@@ -0,0 +1,410 @@
+"""
+SQLite 작업 큐 (여러 크롤러 프로세스가 하나의 크롤링을 나눠서 처리)
+- seed: 목록 페이지에서 상세 URL을 큐에 넣는다
+- work: 큐에서 URL을 임대(lease)해 스크래핑하고 결과를 큐에 기록한다 (여러 프로세스 / 머신 동시 실행 가능)
+- collect: 완료된 결과를 모아 출력 JSON과 카탈로그 DB에 저장한다
+
+임대 시간이 지나도록 완료하지 못한 작업(죽은 워커)은 자동으로 다른 워커에게 다시 임대되고,
+완료는 현재 임대 토큰을 가진 워커만 기록할 수 있어 한 작업이 두 번 완료되지 않습니다.
+살아 있는 워커는 배치를 처리하는 동안 하트비트 스레드가 임대를 계속 연장합니다 (브라우저 단계로 오래 걸려도 뺏기지 않는다).
+
+사용법:
+    python work_queue.py seed weapon
+    python work_queue.py work weapon      # 원하는 만큼 여러 프로세스에서 실행
+    python work_queue.py collect weapon
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable
+
+QUEUE_PATH = Path("crawl_queue.db")
+
+# 한 번에 임대할 작업 수와 임대 시간(초)
+LEASE_BATCH = 8
+LEASE_SECONDS = 300
+# 임대 시간의 이 비율마다 처리 중인 임대를 연장
+HEARTBEAT_FRACTION = 1 / 3
+# 이 횟수만큼 실패하면 더 이상 임대하지 않는다
+MAX_ATTEMPTS = 3
+# 큐가 비었지만 다른 워커의 임대가 남아 있을 때 다시 확인하는 간격(초)
+IDLE_POLL = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    url TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_token TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    enqueued_at REAL NOT NULL,
+    done_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_kind_status ON jobs(kind, status, lease_expires);
+"""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """임대 시간(lease)이 있는 SQLite 작업 큐."""
+
+    def __init__(self, path: Path = QUEUE_PATH, max_attempts: int = MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        # 공유 볼륨(NFS 등)에서는 WAL을 쓸 수 없으므로 기본 롤백 저널 + 긴 busy timeout 사용
+        self.conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def _write(self, fn):
+        """BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡고 fn 실행."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn()
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        return result
+
+    def enqueue(self, urls: Iterable[str], kind: str) -> int:
+        """URL 추가. 이미 있는 URL은 건너뛴다. 추가된 수 반환."""
+        now = time.time()
+        rows = [(url, kind, now) for url in urls]
+
+        def insert():
+            before = self.conn.total_changes
+            self.conn.executemany("INSERT OR IGNORE INTO jobs (url, kind, enqueued_at) VALUES (?, ?, ?)", rows)
+            return self.conn.total_changes - before
+
+        return self._write(insert)
+
+    def lease(self, kind: str, worker_id: str, limit: int = LEASE_BATCH, lease_seconds: float = LEASE_SECONDS) -> list[tuple[str, str]]:
+        """대기 중이거나 임대가 만료된 작업을 임대. [(url, lease_token)] 반환."""
+        def take():
+            now = time.time()
+            rows = self.conn.execute(
+                """
+                SELECT url FROM jobs
+                WHERE kind = ? AND attempts < ?
+                  AND (status = 'pending' OR (status = 'leased' AND lease_expires < ?))
+                ORDER BY enqueued_at
+                LIMIT ?
+                """,
+                (kind, self.max_attempts, now, limit),
+            ).fetchall()
+            leased = []
+            for row in rows:
+                token = uuid.uuid4().hex
+                self.conn.execute(
+                    """
+                    UPDATE jobs SET status = 'leased', lease_owner = ?, lease_token = ?,
+                        lease_expires = ?, attempts = attempts + 1
+                    WHERE url = ?
+                    """,
+                    (worker_id, token, now + lease_seconds, row["url"]),
+                )
+                leased.append((row["url"], token))
+            return leased
+
+        return self._write(take)
+
+    def complete(self, url: str, token: str, result) -> bool:
+        """
+        작업 완료 기록. 현재 임대 토큰이 일치할 때만 성공한다.
+        임대가 만료돼 다른 워커가 다시 가져갔다면 False (결과는 버린다).
+        """
+        cursor = self.conn.execute(
+            """
+            UPDATE jobs SET status = 'done', result = ?, error = NULL, done_at = ?,
+                lease_owner = NULL, lease_token = NULL, lease_expires = NULL
+            WHERE url = ? AND status = 'leased' AND lease_token = ?
+            """,
+            (json.dumps(result, ensure_ascii=False), time.time(), url, token),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, url: str, token: str, error: str) -> None:
+        """작업 실패 기록. 시도 횟수가 남았으면 다시 대기 상태로."""
+        self.conn.execute(
+            """
+            UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END,
+                error = ?, lease_owner = NULL, lease_token = NULL, lease_expires = NULL
+            WHERE url = ? AND status = 'leased' AND lease_token = ?
+            """,
+            (self.max_attempts, error, url, token),
+        )
+
+    def extend(self, url: str, token: str, lease_seconds: float = LEASE_SECONDS) -> bool:
+        """임대 연장 (오래 걸리는 작업용 하트비트)."""
+        cursor = self.conn.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE url = ? AND status = 'leased' AND lease_token = ?",
+            (time.time() + lease_seconds, url, token),
+        )
+        return cursor.rowcount == 1
+
+    def counts(self, kind: str) -> dict[str, int]:
+        rows = self.conn.execute("SELECT status, COUNT(*) AS n FROM jobs WHERE kind = ? GROUP BY status", (kind,))
+        return {row["status"]: row["n"] for row in rows}
+
+    def has_open_work(self, kind: str) -> bool:
+        """아직 끝나지 않은 작업(대기 또는 임대 중)이 있으면 True."""
+        row = self.conn.execute(
+            "SELECT 1 FROM jobs WHERE kind = ? AND status IN ('pending', 'leased') AND attempts < ? LIMIT 1",
+            (kind, self.max_attempts),
+        ).fetchone()
+        if row is not None:
+            return True
+        # 시도 횟수를 다 쓴 채 임대 중에 죽은 작업도 정리
+        self.conn.execute(
+            "UPDATE jobs SET status = 'failed' WHERE kind = ? AND status = 'leased' AND lease_expires < ?",
+            (kind, time.time()),
+        )
+        row = self.conn.execute(
+            "SELECT 1 FROM jobs WHERE kind = ? AND status = 'leased' LIMIT 1", (kind,)
+        ).fetchone()
+        return row is not None
+
+    def results(self, kind: str) -> list[dict]:
+        """완료된 작업 결과 (None 결과는 제외)."""
+        rows = self.conn.execute(
+            "SELECT result FROM jobs WHERE kind = ? AND status = 'done' ORDER BY enqueued_at", (kind,)
+        )
+        return [record for record in (json.loads(row["result"]) for row in rows) if record is not None]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ----------------------------------------------------------------------
+# 작업 종류별 seed / work / collect
+# ----------------------------------------------------------------------
+class LeaseHeartbeat:
+    """
+    배치를 처리하는 동안 별도 스레드에서 아직 끝나지 않은 임대를 주기적으로 연장.
+    sqlite 연결은 스레드 사이에 공유하지 않으므로 하트비트 스레드는 자기 연결을 연다.
+
+        with LeaseHeartbeat(queue.path, tokens, lease_seconds) as heartbeat:
+            ...
+            heartbeat.finish(url)
+    """
+
+    def __init__(self, path: Path, tokens: dict[str, str], lease_seconds: float = LEASE_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.interval = lease_seconds * HEARTBEAT_FRACTION
+        self.extensions = 0
+        self._tokens = dict(tokens)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def finish(self, url: str) -> None:
+        """완료 / 실패를 기록한 작업은 더 이상 연장하지 않는다."""
+        with self._lock:
+            self._tokens.pop(url, None)
+
+    def beat(self, queue: "WorkQueue") -> None:
+        with self._lock:
+            pending = list(self._tokens.items())
+        for url, token in pending:
+            if queue.extend(url, token, self.lease_seconds):
+                self.extensions += 1
+            else:
+                # 이미 다른 워커가 가져간 작업: 완료 기록이 거절되므로 연장도 그만둔다
+                self.finish(url)
+
+    def _run(self) -> None:
+        with WorkQueue(self.path) as queue:
+            while not self._stop.wait(self.interval):
+                try:
+                    self.beat(queue)
+                except sqlite3.Error as exc:
+                    print(f"  -> [WARN] 임대 연장 실패: {exc}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def seed_weapons() -> list[str]:
+    from fetcher import TieredFetcher
+    from retry_policy import RetryPolicy
+    from scrape_weapons import collect_weapon_links
+
+    with TieredFetcher() as fetcher:
+        return collect_weapon_links(fetcher.fetch, RetryPolicy())
+
+
+def seed_attachments() -> list[str]:
+    from driver_manager import ManagedDriver
+    from fetcher import wait_for_page
+    from scrape_data import LISTING_URL, create_driver, parse_links_from_html, scroll_to_bottom
+
+    driver = ManagedDriver(create_driver)
+    try:
+        driver.get(LISTING_URL)
+        wait_for_page(driver, "listing")
+        scroll_to_bottom(driver, pause=1.0, max_tries=20)
+        return parse_links_from_html(driver.page_source)
+    finally:
+        driver.quit()
+
+
+def make_weapon_handler(fetch):
+    from scrape_weapons import scrape_weapon_detail
+
+    def handle(url: str) -> dict | None:
+        record = scrape_weapon_detail(url, fetch)
+        # 권총은 결과에서 제외
+        if record is not None and record.get("category") == "권총":
+            return None
+        return record
+
+    return handle
+
+
+def make_attachment_handler(fetch):
+    from scrape_data import scrape_attachment
+
+    def handle(url: str) -> dict:
+        return scrape_attachment(fetch, url)
+
+    return handle
+
+
+def collect_weapons(records: list[dict]) -> None:
+    from ammo_catalog import write_catalog
+    from catalog_store import CatalogStore
+    from publish_data import publish_json
+    from scrape_weapons import OUTPUT_PATH
+
+    publish_json(OUTPUT_PATH, records)
+    write_catalog(records)
+    with CatalogStore() as store:
+        store.upsert_weapons(records)
+    print(f"[INFO] {len(records)}개를 {OUTPUT_PATH.resolve()}와 카탈로그 DB에 저장했습니다.")
+
+
+def collect_attachments(records: list[dict]) -> None:
+    from catalog_store import CatalogStore
+    from publish_data import publish_json
+    from scrape_data import LISTING_CATEGORY, OUTPUT_PATH
+
+    publish_json(OUTPUT_PATH, records)
+    with CatalogStore() as store:
+        store.upsert_attachments(records, category=LISTING_CATEGORY)
+    print(f"[INFO] {len(records)}개를 {OUTPUT_PATH.resolve()}와 카탈로그 DB에 저장했습니다.")
+
+
+KINDS = {
+    "weapon": (seed_weapons, make_weapon_handler, collect_weapons),
+    "attachment": (seed_attachments, make_attachment_handler, collect_attachments),
+}
+
+
+def run_worker(
+    queue: WorkQueue,
+    kind: str,
+    worker_id: str | None = None,
+    lease_seconds: float = LEASE_SECONDS,
+    controller=None,
+    http2: bool = False,
+) -> dict[str, int]:
+    """큐가 빌 때까지 작업을 임대해 처리. 처리 결과 수 반환."""
+    from fetcher import TieredFetcher
+    from rate_control import AIMDController
+    from retry_policy import CircuitBreaker, RetryPolicy
+
+    _, make_handler, _ = KINDS[kind]
+    worker_id = worker_id or default_worker_id()
+    policy = RetryPolicy()
+    breaker = CircuitBreaker()
+    if controller is None:
+        controller = AIMDController()
+    summary = {"done": 0, "failed": 0, "lost": 0}
+
+    print(f"[INFO] 워커 {worker_id} 시작 ({kind}, 큐: {queue.path})")
+    with TieredFetcher(http2=http2) as fetcher:
+        handle = make_handler(controller.wrap(fetcher.fetch))
+        while True:
+            leased = queue.lease(kind, worker_id, limit=LEASE_BATCH, lease_seconds=lease_seconds)
+            if not leased:
+                if not queue.has_open_work(kind):
+                    break
+                # 다른 워커가 처리 중인 작업이 끝나거나 임대가 만료될 때까지 대기
+                time.sleep(IDLE_POLL)
+                continue
+
+            tokens = dict(leased)
+
+            def work(url: str):
+                return policy.call(lambda: handle(url), url, breaker)
+
+            with LeaseHeartbeat(queue.path, tokens, lease_seconds) as heartbeat:
+                for url, record, error in controller.map(work, list(tokens)):
+                    heartbeat.finish(url)
+                    if error is not None:
+                        print(f"  -> [FAILED] {url}: {error}")
+                        queue.fail(url, tokens[url], f"{type(error).__name__}: {error}")
+                        summary["failed"] += 1
+                    elif queue.complete(url, tokens[url], record):
+                        print(f"  -> [DONE] {url}")
+                        summary["done"] += 1
+                    else:
+                        # 임대가 만료돼 다른 워커가 가져간 작업: 결과를 버린다
+                        print(f"  -> [LOST] 임대 만료, 결과 폐기: {url}")
+                        summary["lost"] += 1
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 작업 큐 기반 분산 크롤링")
+    parser.add_argument("command", choices=["seed", "work", "collect", "status"])
+    parser.add_argument("kind", choices=sorted(KINDS))
+    parser.add_argument("--queue", type=Path, default=QUEUE_PATH, help="큐 SQLite 파일 (공유 볼륨 경로 가능)")
+    parser.add_argument("--worker-id", default=default_worker_id())
+    parser.add_argument("--lease-seconds", type=float, default=LEASE_SECONDS)
+    args = parser.parse_args()
+
+    seed, _, collect = KINDS[args.kind]
+    with WorkQueue(args.queue) as queue:
+        if args.command == "seed":
+            added = queue.enqueue(seed(), args.kind)
+            print(f"[INFO] {added}개 URL을 큐에 추가했습니다. 현재 상태: {queue.counts(args.kind)}")
+        elif args.command == "work":
+            summary = run_worker(queue, args.kind, args.worker_id, args.lease_seconds)
+            print(f"[INFO] 워커 종료: {summary} / 큐 상태: {queue.counts(args.kind)}")
+        elif args.command == "collect":
+            collect(queue.results(args.kind))
+        else:
+            print(queue.counts(args.kind))
+
+
+if __name__ == "__main__":
+    main()